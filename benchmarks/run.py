@@ -0,0 +1,109 @@
+"""
+Run the benchmark suite, write the results as JSON and compare them with a stored baseline.
+
+    python -m benchmarks.run                      # full run, compare with benchmarks/baseline.json
+    python -m benchmarks.run --quick              # smaller grids and fewer ticks
+    python -m benchmarks.run --update-baseline    # store this run as the new baseline
+
+Exits with status 1 when a metric regresses beyond the tolerance or is missing from the baseline.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+import numpy as np
+from src.config import Settings
+from benchmarks.suite import CASES, SEED
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def run_suite(settings: Settings, quick: bool, only: Optional[str] = None) -> dict:
+    results = {}
+    for case in CASES:
+        if only and only not in case.__name__:
+            continue
+        print(f"running {case.__name__} ...", flush=True)
+        results.update(case(settings, quick))
+    return {
+        "meta": {
+            "seed": SEED,
+            "quick": quick,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    Return a description of every metric that got worse than baseline by more than tolerance,
+    or that the baseline does not have (so it could not be checked).
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:55s} {result['value']:14.3f} {result['unit']:8s} MISSING FROM BASELINE")
+            regressions.append(f"{name}: not in the baseline; run with --update-baseline")
+            continue
+        if base["value"] == 0:
+            continue
+        ratio = result["value"] / base["value"]
+        worse = ratio < 1 - tolerance if result["higher_is_better"] else ratio > 1 + tolerance
+        marker = "REGRESSION" if worse else ""
+        print(f"{name:55s} {result['value']:14.3f} {result['unit']:8s} baseline {base['value']:14.3f}  x{ratio:5.2f} {marker}")
+        if worse:
+            regressions.append(f"{name}: {result['value']:.3f} vs {base['value']:.3f} {result['unit']}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--config", default="config/.env", help="path to the .env configuration")
+    parser.add_argument("--quick", action="store_true", help="smaller grids and fewer ticks")
+    parser.add_argument("--only", default=None, help="run only the cases whose name contains this text")
+    parser.add_argument("--output", default="bench_output.json", help="where to write the results")
+    parser.add_argument("--baseline", default=str(BASELINE), help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (0.25 = 25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results to the baseline file")
+    args = parser.parse_args(argv)
+
+    current = run_suite(Settings.load(args.config), args.quick, args.only)
+    Path(args.output).write_text(json.dumps(current, indent=2))
+    print(f"results written to {args.output}")
+
+    if args.update_baseline:
+        Path(args.baseline).write_text(json.dumps(current, indent=2) + "\n")
+        print(f"baseline updated: {args.baseline}")
+        return 0
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --update-baseline to create one")
+        return 0
+    baseline = json.loads(baseline_path.read_text())
+    if baseline["meta"].get("quick") != args.quick:
+        print("warning: baseline and current run use different --quick settings")
+    regressions = compare(current, baseline, args.tolerance)
+    if not args.only:
+        stale = sorted(set(baseline["results"]) - set(current["results"]))
+        if stale:
+            print(f"{len(stale)} baseline metric(s) no longer measured: {', '.join(stale)}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%} or unchecked metric(s):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
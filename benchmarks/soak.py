@@ -0,0 +1,117 @@
+"""
+Restart soak test: reset one Simulation many times, as the GUI's restart does,
+and check that neither memory nor tick time grows with the number of restarts.
+
+    python -m benchmarks.soak                     # 100 restarts of the object engine
+    python -m benchmarks.soak --engine soa --restarts 200
+
+Every restart subscribes listeners to the new world's events, one strongly and
+one weakly, and keeps nothing else; both must be gone once the next restart
+replaces the world. Exits with status 1 when memory or tick time drifts beyond
+the tolerances, or a world outlives its restart.
+"""
+import argparse
+import dataclasses
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+import weakref
+from typing import List, Optional
+from src.config import Settings
+from benchmarks.suite import SEED
+
+
+class _Listener:
+    """
+    Counts the batches a world dispatches.
+    """
+
+    def __init__(self):
+        self.batches = 0
+
+    def on_batch(self, batch: list):
+        self.batches += 1
+
+
+def soak(settings: Settings, restarts: int, ticks: int) -> dict:
+    """
+    :return: per restart, the traced memory after a collection (bytes) and the mean tick time (s)
+    """
+    from src.simulation import Simulation
+    memory: List[int] = []
+    tick_times: List[float] = []
+    leaked = 0
+    simulation = Simulation(settings, seed=SEED)
+    tracemalloc.start()
+    try:
+        for _ in range(restarts):
+            world = simulation.world
+            strong, weak = _Listener(), _Listener()
+            world.events.subscribe("sprouted", strong.on_batch)
+            world.events.subscribe("died", strong.on_batch)
+            world.events.subscribe("died", weak.on_batch, weak=True)
+            start = time.perf_counter()
+            simulation.run(ticks)
+            tick_times.append((time.perf_counter() - start) / ticks)
+            old_world, old_listener = weakref.ref(world), weakref.ref(strong)
+            del world, strong, weak
+            simulation.reset()
+            gc.collect()
+            if old_world() is not None or old_listener() is not None:
+                leaked += 1
+            memory.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+        simulation.close()
+    return {"memory": memory, "tick_times": tick_times, "leaked": leaked}
+
+
+def check(result: dict, memory_tolerance: float, time_tolerance: float) -> List[str]:
+    """
+    Compare the last tenth of the restarts with the first tenth (after the first restart, a warm-up).
+    """
+    memory, tick_times = result["memory"][1:], result["tick_times"][1:]
+    window = max(1, len(memory) // 10)
+    failures = []
+    early, late = statistics.median(memory[:window]), statistics.median(memory[-window:])
+    print(f"memory    {early / 1e6:8.2f} MB -> {late / 1e6:8.2f} MB")
+    # An absolute floor of 1 MB keeps allocator noise on small worlds from failing the check
+    if late > early * (1 + memory_tolerance) + 1e6:
+        failures.append(f"memory grew from {early / 1e6:.2f} MB to {late / 1e6:.2f} MB")
+    early, late = statistics.median(tick_times[:window]), statistics.median(tick_times[-window:])
+    print(f"tick time {early * 1e3:8.3f} ms -> {late * 1e3:8.3f} ms")
+    if late > early * (1 + time_tolerance):
+        failures.append(f"tick time grew from {early * 1e3:.3f} ms to {late * 1e3:.3f} ms")
+    if result["leaked"]:
+        failures.append(f"{result['leaked']} world(s) outlived their restart")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.soak", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--config", default="config/.env", help="path to the .env configuration")
+    parser.add_argument("--engine", default="object", choices=("object", "soa"), help="world engine")
+    parser.add_argument("--size", type=int, default=100, help="grid width and height")
+    parser.add_argument("--restarts", type=int, default=100, help="number of restarts")
+    parser.add_argument("--ticks", type=int, default=20, help="ticks run between restarts")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1, help="allowed relative memory growth")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="allowed relative tick time growth")
+    args = parser.parse_args(argv)
+
+    base = Settings.load(args.config)
+    settings = dataclasses.replace(base, world_engine=args.engine, grid_width=args.size, grid_height=args.size,
+                                   autosave_ticks=0, telemetry_path="", profile=0)
+    result = soak(settings, args.restarts, args.ticks)
+    failures = check(result, args.memory_tolerance, args.time_tolerance)
+    if failures:
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print(f"{args.restarts} restarts: flat")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
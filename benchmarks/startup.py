@@ -0,0 +1,126 @@
+"""
+Start-up benchmark: how long the GUI takes to import and to load its images.
+
+    python -m benchmarks.startup                  # median of 5 cold starts per case
+    python -m benchmarks.startup --repeats 11 --output startup.json
+
+Every case runs in a fresh interpreter with the dummy SDL video driver, so
+module and image caches start cold:
+
+- import_gui: importing src.gui, which leaves matplotlib for the first chart;
+- import_gui_eager: the same plus the matplotlib modules the charts need,
+  i.e. what importing src.gui cost when it loaded them up front;
+- assets_decode: loading a set of images by decoding their PNGs;
+- assets_cached: loading the same images from the pixel cache.
+
+The images are generated in a temporary folder, at the sizes of the game's.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# name -> (width, height) of the images the GUI loads at start-up
+IMAGES = {
+    "copertina.png": (1920, 1080),
+    "tavolo.png": (1920, 1080),
+    "preda.png": (64, 64),
+    "startButton_up.png": (200, 80),
+    "startButton_down.png": (200, 80),
+    "exitButton_up.png": (200, 80),
+    "exitButton_down.png": (200, 80),
+}
+
+_IMPORT = """
+import time
+start = time.perf_counter()
+import src.gui
+{extra}
+print(time.perf_counter() - start)
+"""
+
+_EAGER_MATPLOTLIB = """
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
+"""
+
+_ASSETS = """
+import time
+import pygame
+from src.assetManager import AssetManager
+pygame.display.init()
+pygame.display.set_mode((1920, 1080))
+start = time.perf_counter()
+assets = AssetManager(base_path={folder!r}, cache_path={cache!r})
+for name in {names!r}:
+    assets.load_image(name)
+print(time.perf_counter() - start)
+assets.flush_cache()
+"""
+
+
+def _time(code: str) -> float:
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _make_images(folder: Path):
+    import numpy as np
+    import pygame
+    rng = np.random.default_rng(1234)
+    for name, (width, height) in IMAGES.items():
+        # Noise, so the PNGs do not compress to nothing
+        pixels = rng.integers(0, 256, (width, height, 3), dtype=np.uint8)
+        pygame.image.save(pygame.surfarray.make_surface(pixels), str(folder / name))
+
+
+def run(repeats: int) -> Dict[str, float]:
+    """
+    :return: median seconds per case
+    """
+    results = {
+        "import_gui": statistics.median(_time(_IMPORT.format(extra="")) for _ in range(repeats)),
+        "import_gui_eager": statistics.median(_time(_IMPORT.format(extra=_EAGER_MATPLOTLIB))
+                                              for _ in range(repeats)),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        _make_images(folder)
+        names = list(IMAGES)
+        results["assets_decode"] = statistics.median(
+            _time(_ASSETS.format(folder=str(folder), cache=None, names=names)) for _ in range(repeats))
+        cache = str(folder / "assets.bin")
+        _time(_ASSETS.format(folder=str(folder), cache=cache, names=names))  # fills the cache
+        results["assets_cached"] = statistics.median(
+            _time(_ASSETS.format(folder=str(folder), cache=cache, names=names)) for _ in range(repeats))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=5, help="cold starts per case")
+    parser.add_argument("--output", default=None, help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeats)
+    for name, seconds in results.items():
+        print(f"{name:20s} {seconds * 1000:9.1f} ms")
+    print(f"import speed-up  x{results['import_gui_eager'] / results['import_gui']:.2f}")
+    print(f"asset speed-up   x{results['assets_decode'] / results['assets_cached']:.2f}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+Benchmark cases. Every case is seeded and headless (no pygame import) and
+returns a dict of metric name -> {"value", "unit", "higher_is_better"}.
+"""
+import dataclasses
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+import numpy as np
+from src.config import Settings
+from src.neural_net import GenomeArena, NeuralNet, batch_actions, mutate_batch
+from src.simulation import Simulation
+
+SEED = 1234
+ENGINES = ("object", "soa")
+GRID_SIZES = (100, 500, 1000)
+# Fraction of the cells occupied at start, split 60% plants / 30% prey / 10% predators
+DENSITIES = {"sparse": 0.01, "dense": 0.05}
+
+
+def metric(value: float, unit: str, higher_is_better: bool) -> dict:
+    return {"value": float(value), "unit": unit, "higher_is_better": higher_is_better}
+
+
+def make_settings(base: Settings, engine: str, size: int, density: float) -> Settings:
+    entities = int(size * size * density)
+    return dataclasses.replace(
+        base,
+        world_engine=engine,
+        grid_width=size,
+        grid_height=size,
+        initial_plants=int(entities * 0.6),
+        initial_preys=int(entities * 0.3),
+        initial_predators=int(entities * 0.1),
+    )
+
+
+def bench_tick_throughput(base: Settings, quick: bool) -> Dict[str, dict]:
+    results = {}
+    ticks = 5 if quick else 20
+    sizes = GRID_SIZES[:2] if quick else GRID_SIZES
+    for engine in ENGINES:
+        for size in sizes:
+            for density_name, density in DENSITIES.items():
+                simulation = Simulation(make_settings(base, engine, size, density), seed=SEED)
+                simulation.step()  # warm-up
+                start = time.perf_counter()
+                simulation.run(ticks)
+                elapsed = time.perf_counter() - start
+                results[f"tick_throughput[{engine}-{size}-{density_name}]"] = metric(ticks / elapsed, "ticks/s", True)
+    return results
+
+
+def bench_tile_scaling(base: Settings, quick: bool) -> Dict[str, dict]:
+    """
+    Throughput of the tiled engine by worker count, and its speed-up over a single worker.
+    """
+    results = {}
+    ticks = 5 if quick else 20
+    size = 500 if quick else 1000
+    single = None
+    for workers in (1, 2, 4):
+        settings = dataclasses.replace(make_settings(base, "tiled", size, DENSITIES["dense"]), tile_workers=workers)
+        simulation = Simulation(settings, seed=SEED)
+        simulation.step()  # warm-up
+        start = time.perf_counter()
+        simulation.run(ticks)
+        rate = ticks / (time.perf_counter() - start)
+        simulation.close()
+        single = single or rate
+        results[f"tile_throughput[{size}-dense-{workers}w]"] = metric(rate, "ticks/s", True)
+        results[f"tile_speedup[{size}-dense-{workers}w]"] = metric(rate / single, "x", True)
+    return results
+
+
+def bench_phases(base: Settings, quick: bool) -> Dict[str, dict]:
+    """
+    Mean cost of each phase of World.update (shuffle, entity updates, cleanup, spawn, ...).
+    """
+    results = {}
+    ticks = 5 if quick else 20
+    for engine in ENGINES:
+        simulation = Simulation(make_settings(base, engine, 500, DENSITIES["dense"]), seed=SEED)
+        world = simulation.world
+        totals: Dict[str, float] = {}
+        for _ in range(ticks):
+            world.tick += 1
+            for name, phase in world.phases():
+                start = time.perf_counter()
+                phase()
+                totals[name] = totals.get(name, 0.0) + time.perf_counter() - start
+        for name, total in totals.items():
+            results[f"phase_ms[{engine}-500-dense-{name}]"] = metric(total / ticks * 1000, "ms", False)
+    return results
+
+
+def bench_neural_net(base: Settings, quick: bool) -> Dict[str, dict]:
+    results = {}
+    rng = np.random.default_rng(SEED)
+    n = 2000 if quick else 10000
+    arena = GenomeArena(8, 10, 4, capacity=n)
+    nets = [NeuralNet(8, 10, 4, rng=rng, arena=arena) for _ in range(n)]
+    inputs = rng.random((n, 8), dtype=np.float32)
+
+    start = time.perf_counter()
+    for net, row in zip(nets, inputs):
+        net.forward(row)
+    results["nn_forward"] = metric(n / (time.perf_counter() - start), "calls/s", True)
+
+    start = time.perf_counter()
+    batch_actions(nets, inputs)
+    results["nn_forward_batch"] = metric(n / (time.perf_counter() - start), "nets/s", True)
+
+    start = time.perf_counter()
+    for net in nets:
+        net.mutate(base.mutation_rate, base.mutation_stddev, rng)
+    results["nn_mutate"] = metric(n / (time.perf_counter() - start), "nets/s", True)
+
+    start = time.perf_counter()
+    mutate_batch(nets, base.mutation_rate, base.mutation_stddev, rng)
+    results["nn_mutate_batch"] = metric(n / (time.perf_counter() - start), "nets/s", True)
+
+    start = time.perf_counter()
+    children = [net.clone() for net in nets]
+    results["nn_clone"] = metric(n / (time.perf_counter() - start), "nets/s", True)
+    for child in children:
+        child.release()
+    return results
+
+
+def bench_populate(base: Settings, quick: bool) -> Dict[str, dict]:
+    results = {}
+    size = 500 if quick else 1000
+    for engine in ENGINES:
+        settings = make_settings(base, engine, size, DENSITIES["dense"])
+        start = time.perf_counter()
+        Simulation(settings, seed=SEED)
+        results[f"populate_ms[{engine}-{size}-dense]"] = metric((time.perf_counter() - start) * 1000, "ms", False)
+    return results
+
+
+def _peak_bytes(settings: Settings, ticks: int) -> int:
+    tracemalloc.start()
+    simulation = Simulation(settings, seed=SEED)
+    simulation.run(ticks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def bench_memory(base: Settings, quick: bool) -> Dict[str, dict]:
+    """
+    Peak traced memory per 10k entities, net of the cost of an empty world of the same size.
+    """
+    results = {}
+    size, density = 500, 0.08  # 20k entities
+    entities = int(size * size * density)
+    for engine in ENGINES:
+        empty = _peak_bytes(make_settings(base, engine, size, 0.0), 1)
+        full = _peak_bytes(make_settings(base, engine, size, density), 1)
+        results[f"peak_memory_per_10k[{engine}]"] = metric((full - empty) / (entities / 10000) / 2**20, "MiB", False)
+    return results
+
+
+CASES: List[Callable[[Settings, bool], Dict[str, dict]]] = [
+    bench_tick_throughput,
+    bench_tile_scaling,
+    bench_phases,
+    bench_neural_net,
+    bench_populate,
+    bench_memory,
+]
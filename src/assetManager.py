@@ -1,7 +1,13 @@
+import json
 import os
+import struct
 
 import pygame
 from pathlib import Path
+from typing import Dict, Optional
+
+# Older pygame versions only have the *string name
+_to_bytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
 
 
 def singleton(cls):
@@ -15,40 +21,148 @@ def singleton(cls):
     return get_instance
 
 
+class PixelCache:
+    """
+    Decoded RGBA pixels of many images in one file, so a start-up costs one read
+    instead of a PNG decode per image. The file is a 4-byte header length, a JSON
+    header mapping each name to [mtime_ns, width, height, offset], then the pixels.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._entries: Optional[Dict[str, list]] = None
+        self._pixels = b""
+        self._added: Dict[str, tuple] = {}
+
+    def _read(self):
+        self._entries = {}
+        try:
+            data = self.path.read_bytes()
+            (header_size,) = struct.unpack_from("<I", data)
+            self._entries = json.loads(data[4:4 + header_size])
+            self._pixels = memoryview(data)[4 + header_size:]
+        except (OSError, ValueError, struct.error):
+            # Missing or unreadable: start over
+            self._entries = {}
+
+    def get(self, name: str, mtime_ns: int) -> Optional[pygame.Surface]:
+        """
+        The cached image, or None if it is not cached or its file changed since.
+        """
+        if self._entries is None:
+            self._read()
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != mtime_ns:
+            return None
+        _, width, height, offset = entry
+        # Shares the pixels read from the file: converting to the display format is the only copy
+        return pygame.image.frombuffer(self._pixels[offset:offset + width * height * 4], (width, height), "RGBA")
+
+    def put(self, name: str, mtime_ns: int, image: pygame.Surface):
+        """
+        Add an image; it is written by the next flush().
+        """
+        self._added[name] = (mtime_ns, image.get_size(), _to_bytes(image, "RGBA"))
+
+    def flush(self):
+        """
+        Rewrite the file with the images added since the last flush, if any.
+        """
+        if not self._added:
+            return
+        if self._entries is None:
+            self._read()
+        blobs = {name: self._pixels[offset:offset + width * height * 4]
+                 for name, (_, width, height, offset) in self._entries.items() if name not in self._added}
+        entries = {name: self._entries[name][:3] for name in blobs}
+        for name, (mtime_ns, (width, height), pixels) in self._added.items():
+            entries[name] = [mtime_ns, width, height]
+            blobs[name] = pixels
+        offset = 0
+        for name, entry in entries.items():
+            entry.append(offset)
+            offset += len(blobs[name])
+        header = json.dumps(entries).encode()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as file:
+            file.write(struct.pack("<I", len(header)))
+            file.write(header)
+            for name in entries:
+                file.write(blobs[name])
+        os.replace(tmp, self.path)
+        self._added.clear()
+        self._entries = None  # re-read on the next get()
+
+
 @singleton
 class AssetManager:
-    def __init__(self, base_path="assett/"):
+    def __init__(self, base_path="assett/", cache_path: Optional[str] = None):
+        """
+        :param base_path: image folder, relative to this file
+        :param cache_path: file of the decoded-pixel cache (None = no cache)
+        """
         # Ottieni la directory dello script
         script_directory = Path(__file__).resolve().parent
 
         # Costruisci il percorso completo della cartella self.base_path
         self.base_path = script_directory / base_path
 
-        self.images = {}  # Dictionary to store loaded images
+        # Loaded images, converted to the display's format once a display exists
+        self.images = {}
+        self._converted = set()
+        self.cache = PixelCache(cache_path) if cache_path else None
         self.lista_immagini = self.elenca_png()
 
     def load_all_images(self):
-        for i in range(len(self.lista_immagini)):
-            self.load_image(self.lista_immagini[i]).convert_alpha()
+        """
+        Load every image up front (images are otherwise loaded when first asked for).
+        """
+        for filename in self.lista_immagini:
+            self.load_image(filename)
+        self.flush_cache()
 
     def load_image(self, filename):
         """Load an image and return the image object."""
-        if filename in self.images:
-            return self.images[filename]
-
-        try:
-            image = pygame.image.load(self.base_path.as_posix() + os.sep + filename)
+        image = self.images.get(filename)
+        if image is None:
+            image = self._decode(filename)
+            if image is None:
+                return None
             self.images[filename] = image
+        if filename not in self._converted and pygame.display.get_surface() is not None:
+            # Blits from a surface in the display's pixel format skip a per-pixel conversion
+            image = self.images[filename] = image.convert_alpha()
+            self._converted.add(filename)
+        return image
+
+    def _decode(self, filename) -> Optional[pygame.Surface]:
+        path = self.base_path.as_posix() + os.sep + filename
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            image = self.cache.get(filename, mtime_ns) if self.cache is not None else None
+            if image is None:
+                image = pygame.image.load(path)
+                if self.cache is not None:
+                    self.cache.put(filename, mtime_ns, image)
             return image
         except Exception as e:
             print(f"Error loading image {filename}: {e}")
             return None
 
+    def flush_cache(self):
+        """
+        Write the images decoded since the last call to the pixel cache, if there is one.
+        """
+        if self.cache is not None:
+            try:
+                self.cache.flush()
+            except OSError as e:
+                print(f"[WARNING] Asset cache write to {self.cache.path} failed: {e}")
+
     def get_image(self, filename):
         """Retrieve a loaded image, or load it if not yet loaded."""
-        if filename not in self.images:
-            return self.load_image(filename)
-        return self.images[filename]
+        return self.load_image(filename)
 
     def elenca_png(self):
         """
@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+from src.entities import PLANT, PREY, PREDATOR, FOOD
+
+DEATH_CAUSES = ("starved", "eaten", "decayed")
+
+
+@dataclass(frozen=True)
+class Census:
+    """
+    Immutable population snapshot published by a world at the end of every tick.
+    Births and deaths are cumulative since the initial population was placed
+    (births include spontaneous plant spawns).
+    """
+
+    tick: int = 0
+    plants: int = 0
+    prey: int = 0
+    predators: int = 0
+    food: int = 0
+    plant_births: int = 0
+    prey_births: int = 0
+    predator_births: int = 0
+    deaths_starved: int = 0
+    deaths_eaten: int = 0
+    deaths_decayed: int = 0
+    prey_energy_total: float = 0.0
+    prey_energy_mean: float = 0.0
+    predator_energy_total: float = 0.0
+    predator_energy_mean: float = 0.0
+    food_mass: float = 0.0
+
+
+class CensusCounter:
+    """
+    Live counters a world keeps up to date as entities are added, die and are removed.
+    Energy totals and food mass are set by the world once per tick, from data it
+    already has at hand, so publishing a Census never needs an extra pass.
+    """
+
+    def __init__(self):
+        self.counts = [0] * 5           # indexed by type code
+        self.births = [0] * 5
+        self.deaths: Dict[str, int] = dict.fromkeys(DEATH_CAUSES, 0)
+        self.energy_total = [0.0] * 5   # indexed by type code
+        self.food_mass = 0.0
+
+    def added(self, type_code: int, n: int = 1):
+        self.counts[type_code] += n
+        self.births[type_code] += n
+
+    def removed(self, type_code: int, n: int = 1):
+        self.counts[type_code] -= n
+
+    def died(self, cause: Optional[str], n: int = 1):
+        if cause is not None:
+            self.deaths[cause] = self.deaths.get(cause, 0) + n
+
+    def reset_flows(self):
+        """
+        Zero the cumulative births/deaths, e.g. once the initial population is placed.
+        """
+        self.births = [0] * 5
+        self.deaths = dict.fromkeys(DEATH_CAUSES, 0)
+
+    def snapshot(self, tick: int) -> Census:
+        prey, predators = self.counts[PREY], self.counts[PREDATOR]
+        prey_energy, predator_energy = self.energy_total[PREY], self.energy_total[PREDATOR]
+        return Census(
+            tick=tick,
+            plants=self.counts[PLANT],
+            prey=prey,
+            predators=predators,
+            food=self.counts[FOOD],
+            plant_births=self.births[PLANT],
+            prey_births=self.births[PREY],
+            predator_births=self.births[PREDATOR],
+            deaths_starved=self.deaths["starved"],
+            deaths_eaten=self.deaths["eaten"],
+            deaths_decayed=self.deaths["decayed"],
+            prey_energy_total=prey_energy,
+            prey_energy_mean=prey_energy / prey if prey else 0.0,
+            predator_energy_total=predator_energy,
+            predator_energy_mean=predator_energy / predators if predators else 0.0,
+            food_mass=self.food_mass,
+        )
@@ -0,0 +1,360 @@
+"""
+Binary checkpoints of a whole world.
+
+A checkpoint is a directory holding one raw .npy file per array (grid, entity
+columns, food field, stacked neural net weights, census history) and a
+manifest.json with the scalars, the random stream states and the settings the
+run used. Arrays are loaded memory-mapped, so even large worlds come back in a
+fraction of a second.
+
+Everything a tick depends on is saved, including the state of every random
+stream of the world and, for the object engine, the registry's iteration
+orders, so a resumed run continues bit-for-bit like the uninterrupted one.
+"""
+import dataclasses
+import json
+import os
+import queue
+import shutil
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+from src.config import Settings
+from src.entities import Entity, Plant, Prey, Predator, PLANT, PREY, PREDATOR, FOOD
+from src.neural_net import GenomeArena, stack_parameters
+from src.registry import EntityRegistry
+from src.soa_world import SoAWorld
+from src.world import World
+
+FORMAT_VERSION = 3
+MANIFEST = "manifest.json"
+
+
+@dataclass
+class Checkpoint:
+    """
+    A private copy of a world's state, ready to be written. Capturing copies
+    the arrays, so writing can happen on another thread while the world ticks on.
+    """
+
+    manifest: dict
+    arrays: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def write(self, path):
+        """
+        Write to path atomically: a crash mid-write leaves the previous checkpoint intact.
+        """
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        old = path.with_name(path.name + ".old")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for name, array in self.arrays.items():
+            np.save(tmp / f"{name}.npy", array, allow_pickle=False)
+        (tmp / MANIFEST).write_text(json.dumps(self.manifest, indent=2, default=_json_scalar))
+        shutil.rmtree(old, ignore_errors=True)
+        if path.exists():
+            os.replace(path, old)
+        os.replace(tmp, path)
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _json_scalar(value):
+    # NumPy scalars that found their way into counters or settings
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+# ----------------------------------------------------------------------
+# Capture
+# ----------------------------------------------------------------------
+
+def _settings_to_json(settings: Settings) -> dict:
+    return dataclasses.asdict(settings)
+
+
+def _settings_from_json(values: dict) -> Settings:
+    return Settings(**{key: tuple(value) if isinstance(value, list) else value for key, value in values.items()})
+
+
+def _capture_nets(nets) -> Dict[str, np.ndarray]:
+    if not nets:
+        return {}
+    W1, b1, W2, b2 = stack_parameters(nets)
+    return {"net_W1": W1, "net_b1": b1, "net_W2": W2, "net_b2": b2}
+
+
+def _entity_row(entity: Entity) -> tuple:
+    """
+    (energy, max_energy, direction, cooldown, cooldown_max, repro_threshold),
+    laid out like the SoAWorld columns.
+    """
+    if isinstance(entity, Prey):
+        return (entity.energy, entity.max_energy, entity.direction, entity.reproduction_cooldown,
+                entity.reproduction_cooldown_max, entity.reproduction_energy_threshold)
+    if isinstance(entity, Predator):
+        return entity.energy, entity.max_energy, entity.direction, entity.reproduction_cooldown, 0, 0.0
+    return entity.nutrition_value, 0.0, 0, entity.ticks_to_mature, 0, 0.0
+
+
+def _capture_object_world(world: World) -> Dict[str, np.ndarray]:
+    dense, handles, type_indices, free_handles = world.entities.state()
+    rows = [_entity_row(entity) for entity in dense]
+    columns = np.array(rows, dtype=np.float64).reshape(len(rows), 6)
+    nets = [entity.net for entity in dense if getattr(entity, "net", None) is not None]
+    net_index = np.full(len(dense), -1, dtype=np.int32)
+    next_net = 0
+    for i, entity in enumerate(dense):
+        if getattr(entity, "net", None) is not None:
+            net_index[i] = next_net
+            next_net += 1
+    arrays = {
+        "kind": np.array([entity.type_code for entity in dense], dtype=np.int8),
+        "x": np.array([entity.x for entity in dense], dtype=np.int32),
+        "y": np.array([entity.y for entity in dense], dtype=np.int32),
+        "energy": columns[:, 0].copy(),
+        "max_energy": columns[:, 1].copy(),
+        "direction": columns[:, 2].astype(np.int8),
+        "cooldown": columns[:, 3].astype(np.int32),
+        "cooldown_max": columns[:, 4].astype(np.int32),
+        "repro_threshold": columns[:, 5].copy(),
+        "handle": np.array(handles, dtype=np.int32),
+        "type_index": np.array(type_indices, dtype=np.int32),
+        "free_handles": np.array(free_handles, dtype=np.int32),
+        "net_index": net_index,
+    }
+    # Spawn cells are drawn by position in the free-cell set, so its order is part of the state
+    arrays["free_cells"] = world.free_cells.state()
+    # Plant maturity lives in the world's grid, not on the Plant objects
+    plants = arrays["kind"] == PLANT
+    arrays["cooldown"][plants] = world.plant_maturity[arrays["y"][plants], arrays["x"][plants]]
+    arrays.update(_capture_nets(nets))
+    return arrays
+
+
+def _capture_soa_world(world: SoAWorld) -> Dict[str, np.ndarray]:
+    size = world.size
+    # Arena rows are not kept: the nets are stored by entity slot and get fresh rows on restore
+    arrays = {name: getattr(world, name)[:size].copy() for name, _, _ in SoAWorld._COLUMNS if name != "genome"}
+    arrays["grid_type"] = world.grid_type.copy()
+    arrays["grid_slot"] = world.grid_slot.copy()
+    arrays["free_slots"] = np.array(world._free_slots, dtype=np.int64)
+    arrays["free_cells"] = world.free_cells.state()
+    net_slots = np.flatnonzero(world.genome[:size] >= 0)
+    arrays["net_slots"] = net_slots.astype(np.int64)
+    if len(net_slots):
+        W1, b1, W2, b2 = world.genomes.parameters(world.genome[net_slots])
+        arrays.update({"net_W1": W1, "net_b1": b1, "net_W2": W2, "net_b2": b2})
+    return arrays
+
+
+def capture(world, seed: Optional[int] = None, history: Optional[Dict[str, np.ndarray]] = None) -> Checkpoint:
+    """
+    Copy the state of a World or SoAWorld (between ticks) and of the random generators.
+    :param seed: the seed of the run, recorded so a resumed Simulation keeps it
+    :param history: optional census history series to store alongside, e.g. population counts
+    """
+    if isinstance(world, SoAWorld):
+        engine, arrays = "soa", _capture_soa_world(world)
+    elif isinstance(world, World):
+        engine, arrays = "object", _capture_object_world(world)
+    else:
+        raise ValueError(f"Checkpoints are not supported for {type(world).__name__}")
+    arrays["food_amount"] = world.food.amount.copy()
+    arrays["food_cells"] = world.food.cells.copy()
+    history = history or {}
+    for name, series in history.items():
+        arrays[f"history_{name}"] = np.array(series)
+    counter = world.census_counter
+    manifest = {
+        "format": FORMAT_VERSION,
+        "engine": engine,
+        "width": world.width,
+        "height": world.height,
+        "tick": world.tick,
+        "seed": seed,
+        "capacity": getattr(world, "capacity", 0),
+        "census_counter": {
+            "counts": counter.counts,
+            "births": counter.births,
+            "deaths": counter.deaths,
+            "energy_total": counter.energy_total,
+            "food_mass": counter.food_mass,
+        },
+        "rng": world.rng.get_state(),
+        "history": sorted(history),
+        "settings": _settings_to_json(world.settings),
+    }
+    return Checkpoint(manifest, arrays)
+
+
+def save_checkpoint(world, path, seed: Optional[int] = None, history: Optional[Dict[str, np.ndarray]] = None):
+    capture(world, seed, history).write(path)
+
+
+# ----------------------------------------------------------------------
+# Restore
+# ----------------------------------------------------------------------
+
+def _restore_nets(arrays, arena: GenomeArena) -> list:
+    if "net_W1" not in arrays:
+        return []
+    # Written to the world's arena in one go; each net is a view of its row
+    return arena.add_many(*(np.asarray(arrays[name]) for name in ("net_W1", "net_b1", "net_W2", "net_b2")))
+
+
+def _restore_object_world(manifest: dict, arrays, settings: Settings) -> World:
+    world = World(manifest["width"], manifest["height"], settings)
+    nets = _restore_nets(arrays, world.genomes)
+    columns = {name: np.asarray(arrays[name]).tolist() for name in (
+        "kind", "x", "y", "energy", "max_energy", "direction", "cooldown", "cooldown_max", "repro_threshold",
+        "net_index")}
+    dense = []
+    for i, kind in enumerate(columns["kind"]):
+        x, y = columns["x"][i], columns["y"][i]
+        energy = columns["energy"][i]
+        if kind == PREY:
+            net_index = columns["net_index"][i]
+            entity = Prey(x, y, energy=energy, max_energy=columns["max_energy"][i],
+                          net=nets[net_index] if net_index >= 0 else None,
+                          reproduction_cooldown_max=columns["cooldown_max"][i],
+                          reproduction_energy_threshold=columns["repro_threshold"][i], settings=settings)
+            entity.reproduction_cooldown = columns["cooldown"][i]
+            entity.direction = columns["direction"][i]
+        elif kind == PREDATOR:
+            net_index = columns["net_index"][i]
+            entity = Predator(x, y, energy=energy, max_energy=columns["max_energy"][i],
+                              net=nets[net_index] if net_index >= 0 else None, settings=settings)
+            entity.reproduction_cooldown = columns["cooldown"][i]
+            entity.direction = columns["direction"][i]
+        else:
+            entity = Plant(x, y, nutrition_value=int(energy), settings=settings)
+            entity.ticks_to_mature = columns["cooldown"][i]
+        world.grid[y][x] = entity
+        dense.append(entity)
+    world.entities = EntityRegistry.restore(dense, np.asarray(arrays["handle"]).tolist(),
+                                            np.asarray(arrays["type_index"]).tolist(),
+                                            np.asarray(arrays["free_handles"]).tolist())
+    world.food.restore(arrays["food_amount"], arrays["food_cells"])
+    world.occupancy[world.food.amount > 0] = FOOD
+    kinds = np.asarray(arrays["kind"])
+    ys, xs = np.asarray(arrays["y"]), np.asarray(arrays["x"])
+    world.occupancy[ys, xs] = kinds
+    world.free_neighbours.rebuild(world.occupancy)
+    if "free_cells" in arrays:
+        world.free_cells.restore(np.asarray(arrays["free_cells"]))
+    else:
+        world.free_cells.rebuild(world.occupancy)
+    plants = kinds == PLANT
+    world.plant_maturity[ys[plants], xs[plants]] = np.asarray(arrays["cooldown"])[plants]
+    return world
+
+
+def _restore_soa_world(manifest: dict, arrays, settings: Settings) -> SoAWorld:
+    world = SoAWorld(manifest["width"], manifest["height"], settings, capacity=manifest["capacity"])
+    size = len(arrays["kind"])
+    for name, _, _ in SoAWorld._COLUMNS:
+        if name != "genome":
+            getattr(world, name)[:size] = arrays[name]
+    world.size = size
+    world.grid_type[:] = arrays["grid_type"]
+    world.grid_slot[:] = arrays["grid_slot"]
+    world.free_neighbours.rebuild(world.grid_type)
+    if "free_cells" in arrays:
+        world.free_cells.restore(np.asarray(arrays["free_cells"]))
+    else:
+        world.free_cells.rebuild(world.grid_type)
+    world._free_slots = np.asarray(arrays["free_slots"]).tolist()
+    world.food.restore(arrays["food_amount"], arrays["food_cells"])
+    for slot, net in zip(np.asarray(arrays["net_slots"]).tolist(), _restore_nets(arrays, world.genomes)):
+        world.genome[slot] = net.slot
+    return world
+
+
+def load_checkpoint(path, settings: Optional[Settings] = None) -> Tuple[object, dict, Dict[str, np.ndarray]]:
+    """
+    Rebuild a world from a checkpoint directory and restore its random streams.
+    :param settings: override the settings stored in the checkpoint (the resumed run
+                     only matches the original if they are equal)
+    :return: (world, manifest, census history series)
+    """
+    path = Path(path)
+    manifest = json.loads((path / MANIFEST).read_text())
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format {manifest.get('format')} in {path}")
+    arrays = {file.stem: np.load(file, mmap_mode="r") for file in path.glob("*.npy")}
+    settings = settings or _settings_from_json(manifest["settings"])
+
+    if manifest["engine"] == "soa":
+        world = _restore_soa_world(manifest, arrays, settings)
+    else:
+        world = _restore_object_world(manifest, arrays, settings)
+    world.tick = manifest["tick"]
+    counter = world.census_counter
+    for key, value in manifest["census_counter"].items():
+        setattr(counter, key, value)
+    world.census = counter.snapshot(world.tick)
+    world.rng.set_state(manifest["rng"])
+    history = {name: np.array(arrays[f"history_{name}"]) for name in manifest["history"]}
+    return world, manifest, history
+
+
+# ----------------------------------------------------------------------
+# Background autosave
+# ----------------------------------------------------------------------
+
+class Autosaver:
+    """
+    Saves a simulation every `every` ticks without blocking it: the tick thread
+    only copies the state, a background thread writes it. If a copy is still
+    waiting for the writer, the new one is skipped rather than queued.
+    """
+
+    def __init__(self, simulation, path, every: int,
+                 history: Optional[Callable[[], Dict[str, np.ndarray]]] = None):
+        """
+        :param simulation: the Simulation to watch (its ticked Event is used)
+        :param path: checkpoint directory, overwritten by every save
+        :param history: returns the census history series to store with each save
+        """
+        self.simulation = simulation
+        self.path = Path(path)
+        self.every = every
+        self.history = history
+        self.skipped = 0
+        self._pending: "queue.Queue[Optional[Checkpoint]]" = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._write_loop, name="life-of-py-autosave", daemon=True)
+        self._thread.start()
+        simulation.ticked += self.on_ticked
+
+    def on_ticked(self, simulation):
+        if simulation.tick == 0 or simulation.tick % self.every:
+            return
+        if self._pending.full():
+            self.skipped += 1
+            return
+        history = self.history() if self.history else None
+        self._pending.put(capture(simulation.world, simulation.seed, history))
+
+    def _write_loop(self):
+        while True:
+            checkpoint = self._pending.get()
+            try:
+                if checkpoint is None:
+                    return
+                checkpoint.write(self.path)
+            except OSError as error:
+                print(f"[WARNING] Autosave to {self.path} failed: {error}")
+            finally:
+                self._pending.task_done()
+
+    def close(self):
+        """
+        Stop watching the simulation and wait for the save in progress.
+        """
+        self.simulation.ticked -= self.on_ticked
+        self._pending.put(None)
+        self._thread.join()
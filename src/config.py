@@ -1,6 +1,8 @@
 import os
-from typing import Optional, List
-from dotenv import load_dotenv
+from dataclasses import dataclass, fields
+from typing import Dict, Mapping, Optional, List, Tuple
+from dotenv import load_dotenv, dotenv_values
+from src.event import Event
 
 
 class EnvConfig:
@@ -121,4 +123,194 @@ class EnvConfig:
             raise ValueError(f"Cannot convert environment variable '{key}' to color tuple.")
 
     def __repr__(self) -> str:
-        return f"<EnvConfig env_file='{self.env_file}' loaded={self._loaded}>"
\ No newline at end of file
+        return f"<EnvConfig env_file='{self.env_file}' loaded={self._loaded}>"
+
+
+Color = Tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Immutable, typed snapshot of the .env configuration.
+    The file is parsed once and the same instance is shared by World,
+    entities and Gui, so reading a parameter is a plain attribute access.
+    Each field is filled from the upper-cased key of the same name.
+    """
+
+    # World settings
+    grid_width: int = 1000
+    grid_height: int = 1000
+    world_engine: str = "object"
+    tile_workers: int = 4
+    simulation_mode: str = "process"
+    # Seed of the world's random streams (-1 = different every run)
+    seed: int = -1
+
+    # Population counts
+    initial_plants: int = 1000
+    initial_preys: int = 500
+    initial_predators: int = 100
+
+    # Plant settings
+    plant_tick_to_mature: int = 10
+    plant_perc_new: float = 0.001
+    random_plant_perc: float = 0.05
+
+    # Food settings: left by a starved creature, share of an eaten one's energy, decay per tick
+    food_starved: float = 1.0
+    food_eaten_perc: float = 0.5
+    food_decay: float = 0.01
+
+    # Energy settings
+    prey_initial: float = 10.0
+    prey_max: float = 20.0
+    predator_initial: float = 12.0
+    predator_max: float = 25.0
+    cost_move: float = 1.0
+    cost_turn: float = 1.0
+
+    # Checkpoints: autosave every N ticks (0 = off) to this directory
+    autosave_ticks: int = 0
+    autosave_path: str = "saves/autosave"
+    # Telemetry: stream every census row to this directory ("" = off)
+    telemetry_path: str = ""
+    # Profiler: per-phase timings and counters (0 = off, 1 = on), optional cProfile
+    # window of profile_capture_ticks ticks every profile_capture_every ticks (0 = never)
+    profile: int = 0
+    profile_capture_every: int = 0
+    profile_capture_ticks: int = 10
+    profile_path: str = "profiles"
+
+    # Vision settings
+    view_range: int = 10
+
+    # Mutation settings
+    mutation_rate: float = 0.05
+    mutation_stddev: float = 0.1
+
+    # Screen settings
+    screen_width: int = 1920
+    screen_height: int = 1080
+    frame_rate: int = 60
+    graph_x: int = 1200
+    graph_refresh_ms: int = 250
+    # Decoded asset pixels cached on disk in one file, keyed by file mtime ("" = off)
+    asset_cache_path: str = ""
+    counter_x: int = 1200
+    counter_y: int = 870
+    counter_text_x: int = 1210
+    counter_text_y: int = 880
+    exit_pos_x: int = 1820
+    exit_pos_y: int = 1010
+    start_pos_x: int = 1820
+    start_pos_y: int = 1010
+    restart_pos_x: int = 1820
+    restart_pos_y: int = 1010
+    titolo_pos_x: int = 960
+    titolo_pos_y: int = 540
+    world_pos_x: int = 40
+    world_pos_y: int = 40
+    world_size_x: int = 1000
+    world_size_y: int = 1000
+    scale_factor: int = 1
+    margin: int = 20
+
+    fase_inizio: str = "F1"
+    fase_gioco: str = "F2"
+    fase_vita: str = "F3"
+
+    # Colors
+    black: Color = (0, 0, 0)
+    white: Color = (255, 255, 255)
+    gray: Color = (200, 200, 200)
+    green: Color = (0, 255, 0)
+    blue: Color = (0, 0, 255)
+    red: Color = (255, 0, 0)
+    yellow: Color = (255, 255, 0)
+
+    # Source of the snapshot, used for mtime-checked reloads
+    env_file: str = ""
+    mtime: float = 0.0
+
+    @classmethod
+    def from_values(cls, values: Mapping[str, Optional[str]], env_file: str = "", mtime: float = 0.0) -> "Settings":
+        """
+        Build a snapshot from raw key/value strings. Missing keys keep their defaults.
+        """
+        parsed = {}
+        for field in fields(cls):
+            if field.name in ("env_file", "mtime"):
+                continue
+            key = field.name.upper()
+            val = values.get(key)
+            if val is None:
+                continue
+            parsed[field.name] = _parse_value(key, val, type(field.default))
+        return cls(env_file=env_file, mtime=mtime, **parsed)
+
+    @classmethod
+    def load(cls, env_file: str = "config/.env") -> "Settings":
+        """
+        Parse the .env file once, without touching os.environ.
+        """
+        try:
+            mtime = os.path.getmtime(env_file)
+        except OSError:
+            raise ValueError(f"Failed to load .env file. Check the file path and contents. File: {env_file}")
+        return cls.from_values(dotenv_values(env_file), env_file=env_file, mtime=mtime)
+
+
+def _parse_value(key: str, val: str, kind: type):
+    try:
+        if kind is tuple:
+            return tuple(map(int, val.split(',')))
+        return kind(val)
+    except ValueError:
+        raise ValueError(f"Cannot convert environment variable '{key}' to {kind.__name__}.")
+
+
+class SettingsStore:
+    """
+    Holds the current Settings snapshot for one .env file.
+    reload_if_changed() re-parses the file only when its mtime moved and
+    notifies the subscribers of the changed Event with the new snapshot.
+    """
+
+    def __init__(self, env_file: str = "config/.env"):
+        self.env_file = env_file
+        self.settings = Settings.load(env_file)
+        self.changed = Event()
+
+    def reload_if_changed(self) -> bool:
+        """
+        Returns True if the file changed on disk and a new snapshot was published.
+        """
+        try:
+            mtime = os.path.getmtime(self.env_file)
+        except OSError:
+            return False
+        if mtime == self.settings.mtime:
+            return False
+        self.settings = Settings.load(self.env_file)
+        self.changed(self.settings)
+        return True
+
+
+_stores: Dict[str, SettingsStore] = {}
+
+
+def get_store(env_file: str = "config/.env") -> SettingsStore:
+    """
+    Process-wide SettingsStore for env_file, created on first use.
+    """
+    if env_file not in _stores:
+        _stores[env_file] = SettingsStore(env_file)
+    return _stores[env_file]
+
+
+def get_settings(env_file: str = "config/.env") -> Settings:
+    """
+    Current shared Settings snapshot for env_file.
+    """
+    return get_store(env_file).settings
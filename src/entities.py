@@ -1,27 +1,39 @@
 # src/entities.py
 from typing import Optional, Tuple
 from src.neural_net import NeuralNet
-from src.config import EnvConfig
-from src.event import Event
-import numpy as np
-import random  # Importazione mancante
+from src.config import Settings, get_settings
+
+# Cell type codes shared by the array-based engine, the renderer and the
+# neural net "view" inputs (0=empty, 1=plant, 2=prey, 3=predator, 4=food).
+EMPTY = 0
+PLANT = 1
+PREY = 2
+PREDATOR = 3
+FOOD = 4
+
+# Energy a prey spends every tick just by being alive
+PREY_IDLE_COST = 0.1
 
 class Entity:
     """
-    Base class for all in-world entities (Plant, Prey, Predator, Food).
+    Base class for all in-world entities (Plant, Prey, Predator).
+    Leftover food is not an entity: see src.food.FoodField.
     """
 
-    def __init__(self, x: int, y: int):
-        self.config = EnvConfig("config/.env")
-        if not self.config.load():
-            raise ValueError("Failed to load .env file. Check the file path and contents.")
+    type_code = EMPTY
+
+    def __init__(self, x: int, y: int, settings: Optional[Settings] = None):
         """
         :param x: X position on the grid
         :param y: Y position on the grid
+        :param settings: shared configuration snapshot (defaults to the process-wide one)
         """
+        self.settings = settings or get_settings()
         self.x = x
         self.y = y
         self.alive = True  # or active status
+        self.handle = -1  # registry handle, assigned when added to a World
+        self.death_cause: Optional[str] = None
 
     def update(self, world: "World"):
         """
@@ -36,11 +48,13 @@ class Entity:
         """
         return self.x, self.y
 
-    def die(self):
+    def die(self, cause: Optional[str] = None):
         """
         Mark the entity as dead (to be removed from the simulation).
+        :param cause: "starved", "eaten" or "decayed", recorded by the world's census
         """
         self.alive = False
+        self.death_cause = cause
 
 
 class Plant(Entity):
@@ -49,54 +63,17 @@ class Plant(Entity):
     In the future, we might add growth timers or reproduction logic.
     """
 
-    plant_reproduce = Event()
+    type_code = PLANT
 
-    def __init__(self, x: int, y: int, nutrition_value: int = 1):
-        super().__init__(x, y)
+    def __init__(self, x: int, y: int, nutrition_value: int = 1, settings: Optional[Settings] = None):
+        super().__init__(x, y, settings)
         self.nutrition_value = nutrition_value
-        self.ticks_to_mature = 0  # placeholder for future growth logic
-
-    def update(self, world: "World"):
-        """
-        For now, plants do nothing unless we implement growth or reproduction logic.
-        """
-        # e.g., if self.ticks_to_mature > 0: self.ticks_to_mature -= 1
-        if self.ticks_to_mature < self.config.get_int("PLANT_TICK_TO_MATURE"):
-            self.ticks_to_mature += 1
-        # Check if the plant reproduces
-        if self.ticks_to_mature >= self.config.get_int("PLANT_TICK_TO_MATURE"):
-            check = random.random()  # Random float between 0 and 1
-            if check <= self.config.get_float("PLANT_PERC_NEW"):
-                # Generate a reproduction event
-                # Trigger the plant reproduction event
-                Plant.plant_reproduce(self)
-                
-
-
-class Food(Entity):
-    """
-    Represents leftover food from dead creatures or excess from a predator's meal.
-    """
-
-    def __init__(self, x: int, y: int, amount: float = 1.0):
-        super().__init__(x, y)
-        self.amount = amount  # how much nutritional value is left
-        self.decay_rate = 0.1  # just an example for slow decay
-        self.decay_timer = 0
+        self.ticks_to_mature = 0  # maturity when placed; the world's plant_maturity grid tracks it from then on
 
     def update(self, world: "World"):
         """
-        Decay the food over time. When it reaches 0, it's effectively gone.
+        Growth and reproduction are computed for all plants at once by the world's plants phase.
         """
-        self.decay_timer += 1  # or some time logic
-        # for a simple approach: reduce 'amount' every few ticks
-        if self.decay_timer >= 10:
-            # lose some fraction
-            self.amount -= self.decay_rate
-            self.decay_timer = 0
-
-        if self.amount <= 0:
-            self.die()
 
 
 class Prey(Entity):
@@ -108,6 +85,8 @@ class Prey(Entity):
     - Eventually reproduce if conditions are met.
     """
 
+    type_code = PREY
+
     def __init__(
         self,
         x: int,
@@ -116,7 +95,8 @@ class Prey(Entity):
         max_energy: float = 20.0,
         net: Optional[NeuralNet] = None,
         reproduction_cooldown_max: int = 100,
-        reproduction_energy_threshold: float = 15.0
+        reproduction_energy_threshold: float = 15.0,
+        settings: Optional[Settings] = None
     ):
         """
         :param x: Initial X-coordinate
@@ -126,8 +106,9 @@ class Prey(Entity):
         :param net: A NeuralNet instance (optional)
         :param reproduction_cooldown_max: Ticks required between reproductions
         :param reproduction_energy_threshold: Minimum energy required to reproduce
+        :param settings: shared configuration snapshot
         """
-        super().__init__(x, y)
+        super().__init__(x, y, settings)
         self.energy = energy
         self.max_energy = max_energy
         self.net = net  # If None, the Prey won't do NN-driven actions.
@@ -143,24 +124,18 @@ class Prey(Entity):
         Called every tick to update the Prey's state.
         1) Consume idle energy.
         2) Check for starvation.
-        3) If there's a neural net, run it to decide an action.
-        4) Handle movement/eating plants if the chosen action is 'move forward'.
-        5) Count down reproduction cooldown; reproduce if possible.
+        3) Count down reproduction cooldown; reproduce if possible.
+        Turning and moving happen in the world's move phase, for all creatures at once.
         """
         # (1) Idle energy consumption
-        self._consume_energy(0.1)  # Example idle cost
+        self._consume_energy(PREY_IDLE_COST)
 
         # (2) Check for starvation
         if self.energy <= 0:
-            self.die()
+            self.die("starved")
             return
 
-        # (3) Neural net logic: decide an action if we have a net
-        if self.net:
-            action_idx = self._decide_action(world)
-            self._execute_action(action_idx, world)
-
-        # (4) Reproduction logic
+        # (3) Reproduction logic
         if self.reproduction_cooldown > 0:
             self.reproduction_cooldown -= 1
         elif self.energy >= self.reproduction_energy_threshold:
@@ -178,97 +153,16 @@ class Prey(Entity):
         """
         self.energy -= amount
 
-    def _decide_action(self, world: "World") -> int:
+    def input_vector(self, energy: float, view: Tuple[float, ...] = (0.0,) * 6) -> list:
         """
-        Build the input vector for the neural net, run forward pass, return argmax action index.
-        The typical mapping might be:
-        0 -> Stay still
-        1 -> Turn left
-        2 -> Turn right
-        3 -> Move forward
+        The 8 neural net inputs for the given energy level.
+        The world's move phase builds them for every creature and runs the nets in one batch.
+        :param view: left/front/right (type, distance) pairs from the world's vision sensors
         """
-        # Example 8 inputs (you can expand these with real "vision" logic)
-        energy_norm = self.energy / self.max_energy
+        energy_norm = energy / self.max_energy
         repro_norm = self.reproduction_cooldown / self.reproduction_cooldown_max \
                      if self.reproduction_cooldown_max > 0 else 0.0
-
-        # Dummy placeholders for "view" (left, front, right) type/distance
-        # In a real simulation, you'd check the cells around the Prey and encode them properly.
-        left_type = 0.0
-        left_dist = 0.0
-        front_type = 0.0
-        front_dist = 0.0
-        right_type = 0.0
-        right_dist = 0.0
-
-        input_vec = np.array([
-            energy_norm,
-            repro_norm,
-            left_type,
-            left_dist,
-            front_type,
-            front_dist,
-            right_type,
-            right_dist
-        ], dtype=np.float32)
-
-        output = self.net.forward(input_vec)
-        action_idx = np.argmax(output)  # Choose the action with highest score
-        return action_idx
-
-    def _execute_action(self, action_idx: int, world: "World"):
-        """
-        Perform the action chosen by the neural net.
-        0 -> Stay still
-        1 -> Turn left  (direction -= 1)
-        2 -> Turn right (direction += 1)
-        3 -> Move forward in the current direction
-        """
-        if action_idx == 0:
-            # Stay still
-            pass
-        elif action_idx == 1:
-            # Turn left
-            self.direction = (self.direction - 1) % 4
-        elif action_idx == 2:
-            # Turn right
-            self.direction = (self.direction + 1) % 4
-        elif action_idx == 3:
-            # Move forward
-            dx, dy = self._dir_to_vector(self.direction)
-            new_x = self.x + dx
-            new_y = self.y + dy
-
-            # Check bounds
-            if not world.in_bounds(new_x, new_y):
-                return  # Can't move out of bounds
-
-            occupant = world.get_entity(new_x, new_y)
-            if occupant is None:
-                # Move if cell is free
-                world.move_entity(self, new_x, new_y)
-            elif isinstance(occupant, Plant):
-                # Eat the plant, then move into its cell
-                self.eat_plant(occupant.nutrition_value)
-                occupant.die()
-                world.move_entity(self, new_x, new_y)
-            # If occupant is another Prey, Predator, or Food, handle accordingly
-            # (e.g., Prey won't eat Food, Predator might eat Prey, etc.)
-
-    def _dir_to_vector(self, direction: int) -> Tuple[int, int]:
-        """
-        Converts a direction index (0=Up, 1=Right, 2=Down, 3=Left)
-        into an (dx, dy) movement vector.
-        """
-        if direction == 0:  # Up
-            return 0, -1
-        elif direction == 1:  # Right
-            return 1, 0
-        elif direction == 2:  # Down
-            return 0, 1
-        elif direction == 3:  # Left
-            return -1, 0
-        return 0, 0
+        return [energy_norm, repro_norm, *view]
 
     def _attempt_reproduction(self, world: "World"):
         """
@@ -276,41 +170,19 @@ class Prey(Entity):
         Resets reproduction cooldown and deducts some energy if needed.
         Also demonstrates how to mutate the neural net for offspring.
         """
-        # For example, check the 8 surrounding cells for a free spot
-        offsets = [
-            (-1, -1), (0, -1), (1, -1),
-            (-1, 0),           (1, 0),
-            (-1, 1),  (0, 1),  (1, 1)
-        ]
-        possible_positions = []
-        for dx, dy in offsets:
-            nx, ny = self.x + dx, self.y + dy
-            if world.in_bounds(nx, ny) and world.get_entity(nx, ny) is None:
-                possible_positions.append((nx, ny))
-
-        if not possible_positions:
+        # A random free cell among the 8 around us, from the world's free-neighbour masks
+        cell = world.free_neighbours.pick(self.x, self.y, world.rng.reproduction)
+        if cell is None:
             return  # No space to reproduce
-
-        # Choose a random adjacent cell
-        child_x, child_y = random.choice(possible_positions)
+        child_x, child_y = cell
 
         # Create a "child" neural net by copying and mutating the parent's net
         child_net = None
         if self.net:
-            child_net = NeuralNet(
-                input_size=self.net.input_size,
-                hidden_size=self.net.hidden_size,
-                output_size=self.net.output_size
-            )
-            # Copy weights from parent
-            child_net.W1 = self.net.W1.copy()
-            child_net.b1 = self.net.b1.copy()
-            child_net.W2 = self.net.W2.copy()
-            child_net.b2 = self.net.b2.copy()
+            # One row copy within the parent's genome arena
+            child_net = self.net.clone()
             # Mutate them
-            mutation_rate = 0.05   # or from config
-            mutation_stddev = 0.1
-            child_net.mutate(mutation_rate, mutation_stddev)
+            child_net.mutate(self.settings.mutation_rate, self.settings.mutation_stddev, world.rng.mutation)
 
         # Create the child Prey
         child = Prey(
@@ -320,7 +192,8 @@ class Prey(Entity):
             max_energy=self.max_energy,
             net=child_net,
             reproduction_cooldown_max=self.reproduction_cooldown_max,
-            reproduction_energy_threshold=self.reproduction_energy_threshold
+            reproduction_energy_threshold=self.reproduction_energy_threshold,
+            settings=self.settings
         )
         # Deduct parent's energy (example: half goes to child)
         self.energy *= 0.5
@@ -337,38 +210,49 @@ class Predator(Entity):
     Predators eat prey (and sometimes leftover food).
     """
 
-    def __init__(self, x: int, y: int, energy: float = 12.0, max_energy: float = 25.0):
-        super().__init__(x, y)
+    type_code = PREDATOR
+
+    def __init__(self, x: int, y: int, energy: float = 12.0, max_energy: float = 25.0,
+                 net: Optional[NeuralNet] = None, settings: Optional[Settings] = None):
+        super().__init__(x, y, settings)
         self.energy = energy
         self.max_energy = max_energy
+        self.net = net  # If None, the Predator stays where it is
         self.reproduction_cooldown = 120  # example
         self.direction = 0
 
     def update(self, world: "World"):
         """
         - Decrease energy from movement
-        - Possibly chase prey or random movement
-        - Reproduce if conditions are met
+        - Count down the reproduction cooldown
+        Hunting happens in the world's move phase: walking into prey eats it.
         """
         self._consume_energy(0.2)  # example idle cost
 
         if self.energy <= 0:
-            self.die()
+            self.die("starved")
             return
 
         if self.reproduction_cooldown > 0:
             self.reproduction_cooldown -= 1
 
-    def eat_prey(self, prey_energy: float):
+    def input_vector(self, energy: float, view: Tuple[float, ...] = (0.0,) * 6) -> list:
+        """
+        The 8 neural net inputs, laid out like Prey.input_vector (predators never reproduce,
+        so the reproduction input (index 1) is 0).
+        """
+        return [energy / self.max_energy, 0.0, *view]
+
+    def eat_prey(self, prey_energy: float, world: "World"):
         """
         Increase energy by some or all of the prey's energy.
-        If it exceeds max, leftover becomes Food in the simulation (handled in World).
+        If it exceeds max, the excess is left as food in the predator's cell.
         """
         self.energy += prey_energy
         if self.energy > self.max_energy:
             excess = self.energy - self.max_energy
             self.energy = self.max_energy
-            # We’ll need the world logic to create leftover Food with 'excess'
+            world.food.drop(self.x, self.y, excess)
 
     def _consume_energy(self, amount: float):
         """
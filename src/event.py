@@ -1,15 +1,151 @@
+"""
+Events: a list of handlers called in subscription order.
+
+`event += handler` keeps the handler alive for as long as the event lives.
+`event.subscribe(handler, weak=True)` keeps only a weak reference, so a handler
+whose object was collected drops out by itself; every subscribe() returns a
+Subscription that can be cancelled, or used as a context manager to scope it.
+
+EventBus is the per-world variant: the world publishes payloads under a topic
+while a phase runs, and flush() (called at the end of every phase) hands each
+topic's subscribers the whole batch at once. Closing the bus when the world is
+replaced drops every subscription made on it.
+"""
+import inspect
+import weakref
+from typing import Callable, Dict, List
+
+
+class _Strong(object):
+    # Same interface as a weakref: calling it returns the handler
+    __slots__ = ("handler",)
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def __call__(self):
+        return self.handler
+
+
+def _reference(handler: Callable, weak: bool):
+    if not weak:
+        return _Strong(handler)
+    if inspect.ismethod(handler):
+        return weakref.WeakMethod(handler)
+    return weakref.ref(handler)
+
+
+class Subscription(object):
+    """
+    Handle of one subscription; cancel() (or leaving its `with` block) unsubscribes.
+    """
+
+    def __init__(self, event: "Event", reference):
+        self._event = event
+        self._reference = reference
+
+    def cancel(self):
+        if self._event is not None:
+            self._event._discard(self._reference)
+            self._event = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cancel()
+
+
 class Event(object):
+
     def __init__(self):
         self.__eventhandlers = []
-        
+
+    def subscribe(self, handler: Callable, weak: bool = False) -> Subscription:
+        """
+        :param weak: hold the handler (or, for a bound method, its object) weakly
+        """
+        reference = _reference(handler, weak)
+        self.__eventhandlers.append(reference)
+        return Subscription(self, reference)
+
     def __iadd__(self, handler):
-        self.__eventhandlers.append(handler)
+        self.subscribe(handler)
         return self
 
     def __isub__(self, handler):
-        self.__eventhandlers.remove(handler)
+        for reference in self.__eventhandlers:
+            if reference() == handler:
+                self._discard(reference)
+                break
+        else:
+            raise ValueError(f"{handler!r} is not subscribed")
         return self
 
+    def _discard(self, reference):
+        # Copy on write, so a handler may unsubscribe while the event is firing
+        self.__eventhandlers = [r for r in self.__eventhandlers if r is not reference]
+
+    def __len__(self) -> int:
+        return len(self.__eventhandlers)
+
+    def clear(self):
+        self.__eventhandlers = []
+
     def __call__(self, *args, **keywargs):
-        for eventhandler in self.__eventhandlers:
+        dead = False
+        for reference in self.__eventhandlers:
+            eventhandler = reference()
+            if eventhandler is None:
+                dead = True
+                continue
             eventhandler(*args, **keywargs)
+        if dead:
+            self.__eventhandlers = [r for r in self.__eventhandlers if r() is not None]
+
+
+class EventBus(object):
+    """
+    Topic events of one world, dispatched in batches: subscribers of a topic
+    receive the list of payloads published since the last flush().
+    """
+
+    def __init__(self):
+        self._topics: Dict[str, Event] = {}
+        self._pending: Dict[str, List] = {}
+
+    def subscribe(self, topic: str, handler: Callable, weak: bool = False) -> Subscription:
+        event = self._topics.get(topic)
+        if event is None:
+            event = self._topics[topic] = Event()
+        return event.subscribe(handler, weak)
+
+    def wants(self, topic: str) -> bool:
+        """
+        Whether anyone listens to topic; publishers check it before building a payload.
+        """
+        event = self._topics.get(topic)
+        return event is not None and len(event) > 0
+
+    def publish(self, topic: str, payload):
+        """
+        Queue a payload until the end of the current phase; dropped if nobody listens.
+        """
+        if self.wants(topic):
+            self._pending.setdefault(topic, []).append(payload)
+
+    def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        for topic, batch in pending.items():
+            self._topics[topic](batch)
+
+    def close(self):
+        """
+        Drop every subscription and anything not yet dispatched.
+        """
+        for event in self._topics.values():
+            event.clear()
+        self._topics.clear()
+        self._pending.clear()
@@ -0,0 +1,91 @@
+"""
+Food as a scalar field over the grid.
+
+Dead creatures and overfed predators leave food behind. Rather than one
+object per leftover, a world keeps the amount of food in every cell in a float
+array: drops are scatter-adds (several drops on one cell simply add up, which
+is the README's "combined into a single entity" rule), and decay is one
+subtraction over the cells holding food, whose flat indices are kept alongside.
+
+A cell with food and nobody on it shows as FOOD in the world's type grid. It is
+taken for spawns, but creatures can walk onto it; the food stays underneath.
+"""
+from typing import Optional
+import numpy as np
+from src.config import Settings, get_settings
+from src.entities import PREY, PREDATOR
+
+
+class FoodField:
+    """
+    Food per cell of a width x height grid.
+    """
+
+    def __init__(self, width: int, height: int, settings: Optional[Settings] = None):
+        self.width = width
+        self.height = height
+        self.settings = settings or get_settings()
+        self.amount = np.zeros((height, width), dtype=np.float32)
+        # Flat indices of the cells holding food, in the order they got it
+        self.cells = np.empty(0, dtype=np.int64)
+
+    @property
+    def count(self) -> int:
+        """
+        Number of cells holding food.
+        """
+        return len(self.cells)
+
+    @property
+    def mass(self) -> float:
+        return float(self.amount.ravel()[self.cells].sum(dtype=np.float64))
+
+    def drop(self, xs: np.ndarray, ys: np.ndarray, amounts):
+        """
+        Add food to cells; drops on the same cell are summed.
+        :param amounts: one amount per cell, or a single amount for all of them
+        """
+        flat = np.asarray(ys, dtype=np.int64) * self.width + np.asarray(xs, dtype=np.int64)
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=np.float32), flat.shape)
+        keep = amounts > 0
+        flat, amounts = flat[keep], amounts[keep]
+        if len(flat) == 0:
+            return
+        field = self.amount.ravel()
+        fresh = np.unique(flat[field[flat] <= 0])
+        np.add.at(field, flat, amounts)
+        if len(fresh):
+            self.cells = np.concatenate((self.cells, fresh))
+
+    def decay(self) -> np.ndarray:
+        """
+        Take food_decay off every cell holding food.
+        :return: flat indices of the cells whose food ran out
+        """
+        if len(self.cells) == 0:
+            return self.cells
+        field = self.amount.ravel()
+        left = field[self.cells] - self.settings.food_decay
+        gone = left <= 0
+        field[self.cells] = np.maximum(left, 0)
+        expired = self.cells[gone]
+        self.cells = self.cells[~gone]
+        return expired
+
+    def restore(self, amount: np.ndarray, cells: np.ndarray):
+        self.amount[:] = amount
+        self.cells = np.array(cells, dtype=np.int64)
+
+
+def remains(kinds: np.ndarray, energies: np.ndarray, cause: Optional[str], settings: Settings) -> np.ndarray:
+    """
+    Food left by creatures that just died: food_starved units if they starved,
+    food_eaten_perc of their energy if they were eaten. Plants leave nothing.
+    """
+    kinds = np.asarray(kinds)
+    creature = (kinds == PREY) | (kinds == PREDATOR)
+    if cause == "starved":
+        return np.where(creature, settings.food_starved, 0.0)
+    if cause == "eaten":
+        return np.where(creature, settings.food_eaten_perc * np.maximum(energies, 0), 0.0)
+    return np.zeros(kinds.shape)
@@ -0,0 +1,124 @@
+"""
+The set of free (EMPTY) cells of a grid, for drawing spawn cells uniformly.
+
+Cells are flat indices kept densely in one array, with each cell's position in
+that array stored alongside, so adding, removing (swap with the last one) and
+drawing a uniformly random member are all O(1), and batches of them are a few
+array operations. Drawing never retries and never fails while a cell is free.
+"""
+from typing import Optional
+import numpy as np
+from src.entities import EMPTY
+
+
+class FreeCells:
+    """
+    Indexable set of the free cells of a width x height grid (all free at first).
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self._cells = np.arange(width * height, dtype=np.int64)
+        # Index of every cell in _cells, -1 for taken cells
+        self._position = np.arange(width * height, dtype=np.int64)
+        self.size = width * height
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, cell: int) -> bool:
+        return self._position[cell] >= 0
+
+    def add(self, cell: int):
+        if self._position[cell] >= 0:
+            return
+        self._cells[self.size] = cell
+        self._position[cell] = self.size
+        self.size += 1
+
+    def discard(self, cell: int):
+        index = self._position[cell]
+        if index < 0:
+            return
+        self.size -= 1
+        last = self._cells[self.size]
+        self._cells[index] = last
+        self._position[last] = index
+        self._position[cell] = -1
+
+    def add_many(self, cells: np.ndarray):
+        """
+        add() for distinct cells.
+        """
+        cells = np.asarray(cells, dtype=np.int64)
+        cells = cells[self._position[cells] < 0]
+        end = self.size + len(cells)
+        self._cells[self.size:end] = cells
+        self._position[cells] = np.arange(self.size, end)
+        self.size = end
+
+    def discard_many(self, cells: np.ndarray):
+        """
+        discard() for distinct cells: the free cells left in the tail fill the holes.
+        """
+        cells = np.asarray(cells, dtype=np.int64)
+        index = self._position[cells]
+        index = index[index >= 0]
+        if len(index) == 0:
+            return
+        self._position[self._cells[index]] = -1
+        end = self.size - len(index)
+        holes = index[index < end]
+        tail = self._cells[end:self.size]
+        movers = tail[self._position[tail] >= 0]
+        self._cells[holes] = movers
+        self._position[movers] = holes
+        self.size = end
+
+    def sample(self, rng) -> Optional[int]:
+        """
+        A uniformly random free cell, or None if the grid is full.
+        :param rng: world random stream
+        """
+        if self.size == 0:
+            return None
+        return int(self._cells[rng.below(self.size)])
+
+    def take(self, n: int, rng) -> np.ndarray:
+        """
+        Up to n distinct free cells, drawn without replacement in one call (still free until placed).
+        """
+        chosen = rng.generator.choice(self.size, size=min(n, self.size), replace=False)
+        return self._cells[chosen]
+
+    def rebuild(self, grid_type: np.ndarray):
+        """
+        Recompute the set from a type grid (after a restore, say).
+        """
+        free = np.flatnonzero(grid_type.ravel() == EMPTY)
+        self._position[:] = -1
+        self.size = 0
+        self.add_many(free)
+
+    def state(self) -> np.ndarray:
+        """
+        The free cells in their sampling order, for a checkpoint.
+        """
+        return self._cells[:self.size].copy()
+
+    def restore(self, cells: np.ndarray):
+        """
+        Set the free cells, in the order state() gave them, so sampling continues as before.
+        """
+        self._position[:] = -1
+        self.size = 0
+        self.add_many(cells)
+
+
+def sample_free(grid_type: np.ndarray, n: int, rng) -> np.ndarray:
+    """
+    Up to n distinct EMPTY cells of a type grid, as flat indices, for bulk placement.
+    """
+    free = np.flatnonzero(grid_type.ravel() == EMPTY)
+    return free[rng.generator.choice(len(free), size=min(n, len(free)), replace=False)]
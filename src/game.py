@@ -1,6 +1,7 @@
+import sys
 from sys import exit
 import pygame
-from src.config import EnvConfig  # Import from config.py
+from src.config import get_store  # Import from config.py
 from src.assetManager import AssetManager
 from src.gameStatus import GameStatus
 from src.gui import Gui
@@ -10,24 +11,27 @@ import ctypes
 
 class Game:
     def __init__(self):
-        ctypes.windll.shcore.SetProcessDpiAwareness(1)  # Disable scaling
+        if sys.platform == "win32":
+            ctypes.windll.shcore.SetProcessDpiAwareness(1)  # Disable scaling
         pygame.init()
         if not pygame.display.get_init():
             pygame.display.init()
-        # Load environment variables
-        self.config = EnvConfig("config/.env")
-        if not self.config.load():
-            raise ValueError("Failed to load .env file. Check the file path and contents.")
-        pygame.display.set_mode((self.config.get_int("SCREEN_WIDTH"), self.config.get_int("SCREEN_HEIGHT")), pygame.SHOWN)  # Use pygame.SHOWN for a regular window
+        # Load environment variables once; every component shares this snapshot
+        self.settings_store = get_store("config/.env")
+        settings = self.settings_store.settings
+        pygame.display.set_mode((settings.screen_width, settings.screen_height), pygame.SHOWN)  # Use pygame.SHOWN for a regular window
         pygame.display.set_caption("Life of Py")
-        self.assetManager = AssetManager()
-        self.assetManager.load_all_images()
+        # Images are loaded (and converted) when first used, from the pixel cache when it is fresh
+        self.assetManager = AssetManager(cache_path=settings.asset_cache_path or None)
         pygame_icon = self.assetManager.load_image("preda.png")
         pygame.display.set_icon(pygame_icon)
         
         self.clock = pygame.time.Clock()
-        self.gameStatus = GameStatus()
-        self.gui = Gui()
+        self.gameStatus = GameStatus(self.settings_store)
+        self.gui = Gui(settings)
+        # The start-up images are loaded by now: store any that were decoded from PNG
+        self.assetManager.flush_cache()
+        self.settings_store.changed += self.on_settings_changed
         self.gui.AddSubscribersForExitEvent(self.close_game)
         self.gui.AddSubscriberForRestartEvent(self.restart)
         self.gui.AddSubscriberForStartEvent(self.start_game)
@@ -37,9 +41,9 @@ class Game:
             #print("game: running")
             events = pygame.event.get()
             self.manage_input(events)
-            self.clock.tick(100)
-            if self.gameStatus.status:
-                self.gameStatus.step_tick()
+            self.clock.tick(self.settings_store.settings.frame_rate)
+            # Inline mode steps here; process mode just picks up the worker's latest snapshot
+            self.gameStatus.update()
             self.gui.renderScreen(events)
 
     def manage_input(self, events: list):
@@ -48,14 +52,30 @@ class Game:
                 self.handle_quit_event()
             elif event.type == pygame.MOUSEBUTTONUP:
                 self.handle_mouse_event()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:
+                # Explicit hot reload; the world picks it up on the next restart
+                self.settings_store.reload_if_changed()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                self.gameStatus.toggle_pause()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_RIGHT:
+                self.gameStatus.step_once()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.gui.toggle_profiler()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.gameStatus.dump_profile()
+
+    def on_settings_changed(self, settings):
+        self.gameStatus.settings = settings
+        self.gui.settings = settings
 
     def start_game(self):
         print("game: start_game")
         self.gameStatus.resetGame()
-        self.gameStatus.fasePartita = self.config.get("FASE_GIOCO")
+        self.gameStatus.fasePartita = self.gameStatus.settings.fase_gioco
         self.gameStatus.start_game()
 
     def close_game(self):
+        self.gameStatus.shutdown()
         pygame.quit()
         exit()
 
@@ -82,5 +102,6 @@ class Game:
         self.gameStatus.start_game()
 
     def close_game(self):
+        self.gameStatus.shutdown()
         pygame.quit()
         exit()
@@ -1,9 +1,13 @@
 import random
 import os
 import time
-import pygame
-from src.world import World
-from src.config import EnvConfig
+from typing import Optional
+from src.config import SettingsStore, get_store
+from src.event import Event
+from src.profiler import Profiler
+from src.simulation import Simulation
+from src.telemetry import Telemetry
+from src.worker import SimulationProcess
 
 
 def singleton(cls):
@@ -20,48 +24,123 @@ def singleton(cls):
 @singleton
 class GameStatus:
     
-    def __init__(self):
-        self.config = EnvConfig("config/.env")
-        if not self.config.load():
-            raise ValueError("Failed to load .env file. Check the file path and contents.")
+    def __init__(self, settings_store: Optional[SettingsStore] = None):
+        self.settings_store = settings_store or get_store()
+        self.settings = self.settings_store.settings
+        self.simulation: Optional[Simulation] = None
+        # Used instead of simulation when SIMULATION_MODE=process
+        self.worker: Optional[SimulationProcess] = None
+        # Fired with this GameStatus whenever a new tick (or a reset) is available
+        self.ticked = Event()
+        # Tick phases (inline mode) and frame sections; a worker process writes its own tick report
+        self.profiler = Profiler(bool(self.settings.profile), self.settings.profile_capture_every,
+                                 self.settings.profile_capture_ticks, self.settings.profile_path)
         self.resetGame()
         self.tick = 0
         self.status = False
     
     def resetGame(self):
-        # Data for graphs
+        # Pick up .env edits (no I/O unless the file's mtime changed)
+        self.settings_store.reload_if_changed()
+        self.settings = self.settings_store.settings
+        # Data for graphs: bounded census history, full resolution for the last max_ticks ticks
         self.max_ticks = 100  # Number of ticks to display in the graphs
-        self.plant_counts = [0]
-        self.prey_counts = [0]
-        self.predator_counts = [0]
-        self.food_counts = [0]
+        self.telemetry = Telemetry(live=self.max_ticks)
         # Initialize world
-        self.world = World(
-            width=self.config.get_int("GRID_WIDTH", fallback=1000),
-            height=self.config.get_int("GRID_HEIGHT", fallback=1000),
-            config=self.config,
-        )
-        self.world.populate_randomly()
-        self.plant_counts.append(self.world.num_plant())
-        self.prey_counts.append(self.world.num_prey())
-        self.predator_counts.append(self.world.num_predator())
-        self.food_counts.append(self.world.num_food())
+        if self.settings.simulation_mode == "process":
+            self.simulation = None
+            if self.worker is None:
+                self.worker = SimulationProcess(self.settings, paused=True)
+            else:
+                self.worker.pause()
+                self.worker.restart(self.settings)
+            # The world is the latest snapshot the worker published
+            self.world = self.worker.wait_for_snapshot(tick=0)
+            if self.world is None:
+                process = self.worker.process
+                state = "still running" if process.is_alive() else f"exited with code {process.exitcode}"
+                raise RuntimeError(f"Simulation worker published no snapshot of tick 0 ({state})")
+        else:
+            self.shutdown()
+            if self.simulation is None:
+                # Checkpoints store the same census history the graphs show
+                self.simulation = Simulation(self.settings, profiler=self.profiler, history=self._history)
+            else:
+                self.simulation.reset(self.settings)
+            self.world = self.simulation.world
+        self.profiler.reset()
+        self._record_census()
         self.status = False
-        self.fasePartita: str = self.config.get("FASE_INIZIO")
+        self.fasePartita: str = self.settings.fase_inizio
 
     def start_game(self):
         self.status = True
         self.start_time = time.time()
         self.tick = 0
+        if self.worker is not None:
+            self.worker.resume()
+
+    def update(self):
+        """
+        Called once per frame: step the inline simulation, or pick up the worker's latest snapshot.
+        """
+        if self.worker is not None:
+            snapshot = self.worker.latest()
+            if snapshot is not None:
+                self.world = snapshot
+                self.tick = snapshot.tick
+                self._record_census()
+        elif self.status:
+            self.step_tick()
+
+    def toggle_pause(self):
+        self.status = not self.status
+        if self.worker is not None:
+            if self.status:
+                self.worker.resume()
+            else:
+                self.worker.pause()
+
+    def step_once(self):
+        """
+        Advance a paused game by exactly one tick.
+        """
+        if self.status:
+            return
+        if self.worker is not None:
+            self.worker.step()
+        else:
+            self.step_tick()
 
-   
     def step_tick(self):
         self.tick += 1
-        self.world.update()
-        self.plant_counts.append(self.world.num_plant())
-        self.prey_counts.append(self.world.num_prey())
-        self.predator_counts.append(self.world.num_predator())
-        self.food_counts.append(self.world.num_food())
+        with self.profiler.section("step"):
+            self.simulation.step()
+        self._record_census()
+
+    def dump_profile(self):
+        """
+        Write the profiler report as JSON to PROFILE_PATH, named after the current tick.
+        """
+        path = self.profiler.dump(os.path.join(self.settings.profile_path, f"profile-{self.tick}.json"))
+        print(f"profile written to {path}")
+
+    def _history(self):
+        return self.telemetry.history()
+
+    def _record_census(self):
+        # The world publishes its census after every tick; reading it costs nothing
+        self.census = self.world.census
+        self.telemetry.record(self.census)
+        self.ticked(self)
+
+    def shutdown(self):
+        """
+        Stop the simulation worker, if any.
+        """
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
 
     def max_ticks(self):
         return self.max_ticks
@@ -74,4 +153,4 @@ class GameStatus:
     
     def elapsed_time(self):
         # Draw counters below the graphs
-        return time.time() - self.start_time
\ No newline at end of file
+        return time.time() - self.start_time
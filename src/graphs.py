@@ -0,0 +1,113 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+import pygame
+from src.ringbuffer import RingBuffer
+
+
+class PopulationGraph:
+    """
+    One population chart kept alive between frames.
+    The figure, axes and line are created once; refreshing only replaces the
+    line data and title, re-renders with Agg and wraps the raw RGBA buffer in a
+    pygame Surface, with no PNG encode/decode round-trip.
+    """
+
+    def __init__(self, label: str, color, window: int, size: Tuple[int, int] = (600, 200), dpi: int = 100):
+        """
+        :param label: series name shown in the title, followed by the latest value
+        :param window: number of ticks shown on the x-axis
+        """
+        # matplotlib takes a while to import, so it is only loaded once a chart is drawn
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        from matplotlib.ticker import MaxNLocator
+
+        self.label = label
+        self.window = window
+        self.figure = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi, facecolor=(1, 1, 1, 0.8))
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.axes = self.figure.add_subplot()
+        (self.line,) = self.axes.plot([], [], color=color, linestyle="-", marker="", label="Population")
+        self.title = self.axes.set_title(label, fontsize=10)
+        self.axes.set_xlabel(f"Ticks (Last {window})", fontsize=8)
+        self.axes.set_ylabel("Population", fontsize=8)
+        self.axes.grid(True)
+        self.axes.set_xlim(0, window)
+        self.axes.set_ylim(0, 1)
+        self.axes.yaxis.set_major_locator(MaxNLocator(integer=True))
+        self.figure.tight_layout()
+        self.surface: Optional[pygame.Surface] = None
+
+    def refresh(self, data: np.ndarray):
+        """
+        Redraw the chart with the latest values of a series.
+        """
+        data = data[-self.window:]
+        if not len(data):
+            data = np.zeros(1)
+        self.line.set_data(np.arange(len(data)), data)
+        # The y-axis always starts at 0, with 10% headroom above the peak
+        self.axes.set_ylim(0, max(float(data.max()) * 1.1, 1))
+        self.title.set_text(f"{self.label}: {int(data[-1])}")
+        self.canvas.draw()
+        buffer = self.canvas.buffer_rgba()
+        surface = pygame.image.frombuffer(bytes(buffer), self.canvas.get_width_height(), "RGBA")
+        # Match the display's pixel format once here, so the per-frame blit stays cheap
+        self.surface = surface.convert_alpha() if pygame.display.get_surface() else surface
+
+
+class GraphPanel:
+    """
+    Stack of population charts drawn on the right of the world.
+    The charts (and matplotlib) are only set up when they are first drawn.
+    Charts are re-rendered at most every refresh_ms milliseconds and only if new
+    data arrived; in between, draw() just blits the cached surfaces, so graph
+    cost is independent of the simulation and frame rates.
+    """
+
+    def __init__(self, series: Sequence[Tuple[str, str]], window: int = 100, refresh_ms: int = 250,
+                 spacing: int = 200):
+        """
+        :param series: (label, color) of each chart, top to bottom
+        :param window: number of ticks shown by each chart
+        :param refresh_ms: minimum time between two re-renders
+        :param spacing: vertical distance between the top edges of two charts
+        """
+        self.series = list(series)
+        self.window = window
+        # Created on the first refresh, so the GUI starts without matplotlib
+        self.graphs: List[PopulationGraph] = []
+        self.refresh_ms = refresh_ms
+        self.spacing = spacing
+        self._last_refresh: Optional[int] = None
+        self._stale = True
+
+    def mark_stale(self):
+        """
+        Note that new data arrived (a tick or a reset); the next due refresh re-renders.
+        """
+        self._stale = True
+
+    def refresh(self, data: List[RingBuffer], now_ms: Optional[int] = None) -> bool:
+        """
+        Re-render the charts if new data arrived and the throttle interval elapsed.
+        :param data: one ring buffer per chart, in the order of the series
+        :return: True if the charts were re-rendered
+        """
+        if not self._stale:
+            return False
+        now_ms = pygame.time.get_ticks() if now_ms is None else now_ms
+        if self._last_refresh is not None and now_ms - self._last_refresh < self.refresh_ms:
+            return False
+        if not self.graphs:
+            self.graphs = [PopulationGraph(label, color, self.window) for label, color in self.series]
+        for graph, buffer in zip(self.graphs, data):
+            graph.refresh(buffer.values())
+        self._last_refresh = now_ms
+        self._stale = False
+        return True
+
+    def draw(self, surface: pygame.Surface, x: int, y: int):
+        for i, graph in enumerate(self.graphs):
+            if graph.surface is not None:
+                surface.blit(graph.surface, (x, y + i * self.spacing))
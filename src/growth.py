@@ -0,0 +1,65 @@
+"""
+Plant reproduction for a whole population at once.
+
+Mature plants reproduce with a Bernoulli draw; each one that does puts one
+seedling in a random free cell of its 8-neighbourhood. The neighbourhoods of
+all parents are read from the type grid in one gather (the grid shifted by each
+of the 8 offsets, sampled at the parents), so no plant is handled in Python.
+"""
+from typing import Tuple
+import numpy as np
+from src.entities import EMPTY
+
+NEIGHBOUR_OFFSETS = [(-1, -1), (0, -1), (1, -1),
+                     (-1, 0),           (1, 0),
+                     (-1, 1),  (0, 1),  (1, 1)]
+
+_DX = np.array([dx for dx, _ in NEIGHBOUR_OFFSETS], dtype=np.int64)
+_DY = np.array([dy for _, dy in NEIGHBOUR_OFFSETS], dtype=np.int64)
+
+
+def sprout(grid_type: np.ndarray, xs: np.ndarray, ys: np.ndarray, rng,
+           row_offset: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pick a random free neighbour cell for each parent, never the same cell twice.
+    Parents that lose a contested cell try again among the cells still free;
+    a parent with no free neighbour has no child.
+    :param grid_type: type grid the neighbourhoods are read from (EMPTY is free, anything outside is taken)
+    :param xs: parent columns
+    :param ys: parent rows, in local coordinates
+    :param rng: world random stream
+    :param row_offset: row of grid_type holding local row 0 (for grids padded with halo rows)
+    :return: x and local y of the children, in placement order
+    """
+    height, width = grid_type.shape
+    cells = grid_type.ravel()
+    xs = np.asarray(xs, dtype=np.int64)
+    ys = np.asarray(ys, dtype=np.int64) + row_offset
+    # Random priority for contested cells
+    pending = rng.permutation(len(xs))
+    claimed = np.empty(0, dtype=np.int64)
+    placed = []
+    while len(pending):
+        nx = xs[pending, None] + _DX
+        ny = ys[pending, None] + _DY
+        inside = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+        flat = np.where(inside, ny * width + nx, 0)
+        free = inside & (cells[flat] == EMPTY) & ~np.isin(flat, claimed)
+        # A random key per free neighbour; the largest one wins
+        keys = np.where(free, rng.random(free.size).reshape(free.shape), -1.0)
+        pick = keys.argmax(axis=1)
+        rows = np.flatnonzero(keys[np.arange(len(pending)), pick] >= 0)
+        if len(rows) == 0:
+            break
+        chosen = flat[rows, pick[rows]]
+        _, first = np.unique(chosen, return_index=True)
+        first.sort()
+        placed.append(chosen[first])
+        claimed = np.concatenate((claimed, chosen[first]))
+        lost = np.ones(len(rows), dtype=bool)
+        lost[first] = False
+        pending = pending[rows[lost]]
+    if not placed:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    children = np.concatenate(placed)
+    return children % width, children // width - row_offset
@@ -5,22 +5,30 @@ from src.assetManager import AssetManager
 from src.button import Button
 from src.event import Event
 from src.gameStatus import GameStatus
-import matplotlib.pyplot as plt
-from io import BytesIO
-from src.config import EnvConfig
-import numpy as np
+from src.renderer import WorldRenderer
+from src.graphs import GraphPanel
+from typing import Optional
+from src.config import Settings, get_settings
 
 
 class Gui:
-    def __init__(self):
-        self.config = EnvConfig("config/.env")
-        if not self.config.load():
-            raise ValueError(
-                "Failed to load .env file. Check the file path and contents."
-            )
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings or get_settings()
         self.assetManager = AssetManager()
         self.screen = pygame.display.get_surface()
         self.gameStatus = GameStatus()
+        # The Gui only observes the simulation: it redraws the world when a tick happened
+        self.world_renderer: Optional[WorldRenderer] = None
+        self._world_dirty = True
+        self.graph_panel = GraphPanel(
+            [("Plants", "green"), ("Prey", "green"), ("Predator", "green"), ("Food", "green")],
+            window=self.gameStatus.max_ticks,
+            refresh_ms=self.settings.graph_refresh_ms,
+        )
+        self.gameStatus.ticked += self.on_world_ticked
+        # Profiler overlay, toggled with F3
+        self.show_profiler = bool(self.settings.profile)
+        self._hud_font: Optional[pygame.font.Font] = None
         self.exit = Event()
         self.restart = Event()
         self.start = Event()
@@ -33,7 +41,7 @@ class Gui:
             self.screen,
             "startButton_up.png",
             "startButton_down.png",
-            (self.config.get_int("START_POS_X"), self.config.get_int("START_POS_Y")),
+            (self.settings.start_pos_x, self.settings.start_pos_y),
             self.onStartButtonClick,
             "black",
             30,
@@ -46,7 +54,7 @@ class Gui:
             self.screen,
             "exitButton_up.png",
             "exitButton_down.png",
-            (self.config.get_int("EXIT_POS_X"), self.config.get_int("EXIT_POS_Y")),
+            (self.settings.exit_pos_x, self.settings.exit_pos_y),
             self.onExitButtonClick,
             "black",
             30,
@@ -56,6 +64,24 @@ class Gui:
         )
         # ---------------------------------------------
 
+    def on_world_ticked(self, game_status):
+        self._world_dirty = True
+        self.graph_panel.mark_stale()
+
+    def draw_world(self) -> pygame.Surface:
+        """
+        Return the world surface, redrawing it only if the simulation moved on.
+        """
+        world = self.gameStatus.world
+        renderer = self.world_renderer
+        if renderer is None or renderer.surface.get_size() != (world.width, world.height):
+            self.world_renderer = renderer = WorldRenderer(world.width, world.height)
+            self._world_dirty = True
+        if self._world_dirty:
+            renderer.draw(world)
+            self._world_dirty = False
+        return renderer.surface
+
     def AddSubscriberForStartEvent(self, objMethod):
         self.start += objMethod
 
@@ -142,63 +168,14 @@ class Gui:
         rect = rotated_image.get_rect(center=pivot + rotated_offset)
         return rotated_image, rect  # Return the rotated image and shifted rect.
 
-    def draw_graph(self, surface, population_data, color, x, y, title):
+    def draw_graphs(self, surface, x, y):
         """
-        Draw a graph on the Pygame surface using matplotlib.
-        Only the last 100 ticks of the population data are shown.
-        The y-axis always starts at 0 and remains at the bottom.
+        Blit the population graphs, re-rendering them only when due.
         """
-        # Ensure only the last 100 ticks are shown
-        if len(population_data) > 100:
-            data_to_plot = population_data[-100:]
-        else:
-            data_to_plot = population_data
-
-        # Handle empty data
-        if not data_to_plot:
-            data_to_plot = [0]  # Default to 0 if no data is available
-
-        # Create the plot
-        plt.figure(
-            figsize=(6, 2), dpi=100, facecolor=(0.5, 1, 1, 0.8)
-        )  # White background
-        plt.plot(
-            data_to_plot, color=color, linestyle="-", marker="", label="Population"
-        )
-        plt.title(title, fontsize=10)
-        plt.xlabel("Ticks (Last 100)", fontsize=8)
-        plt.ylabel("Population", fontsize=8)
-        plt.grid(True)
-
-        # Set x-axis limits (fixed to 100 ticks)
-        plt.xlim(0, 100)
-
-        # Set y-axis limits to always start at 0
-        y_min = 0  # Always start at 0
-        y_max = max(data_to_plot) * 1.1 if data_to_plot else 1  # Add 10% padding
-        plt.ylim(y_min, y_max)
-
-        # Use integer ticks on the y-axis
-        plt.yticks(
-            np.arange(y_min, y_max + 1, max(1, int(y_max / 10)))
-        )  # Ensure at least 1 step
-
-        # Ensure the y-axis starts at the bottom
-        plt.gca().set_ylim(bottom=0)  # Explicitly set the bottom of the y-axis to 0
-
-        plt.tight_layout()
-
-        # Save the plot to a BytesIO object
-        buf = BytesIO()
-        plt.savefig(
-            buf, format="png", bbox_inches="tight", facecolor=(1, 1, 1, 0.8)
-        )  # Ensure background is white
-        buf.seek(0)
-
-        # Load the image into Pygame
-        image = pygame.image.load(buf)
-        surface.blit(image, (x, y))
-        plt.close()
+        self.graph_panel.refresh_ms = self.settings.graph_refresh_ms
+        live = self.gameStatus.telemetry.live
+        self.graph_panel.refresh([live["plants"], live["prey"], live["predators"], live["food"]])
+        self.graph_panel.draw(surface, x, y)
 
     def draw_counters(self, surface, tick, elapsed_time, x, y):
         """
@@ -210,85 +187,80 @@ class Gui:
         pygame.draw.rect(surface, pygame.Color(200, 200, 200, 0), counter_background)
 
         # Draw tick counter
-        tick_text = font.render(f"Tick: {tick}", True, self.config.get_color("BLACK"))
-        surface.blit(tick_text, (self.config.get_int("COUNTER_TEXT_X"), self.config.get_int("COUNTER_TEXT_Y")))
+        tick_text = font.render(f"Tick: {tick}", True, self.settings.black)
+        surface.blit(tick_text, (self.settings.counter_text_x, self.settings.counter_text_y))
 
         # Draw elapsed time
         minutes = int(elapsed_time() // 60)
         seconds = int(elapsed_time() % 60)
         time_text = font.render(
-            f"Time: {minutes:02}:{seconds:02}", True, self.config.get_color("BLACK")
+            f"Time: {minutes:02}:{seconds:02}", True, self.settings.black
         )
-        surface.blit(time_text, (self.config.get_int("COUNTER_TEXT_X"), self.config.get_int("COUNTER_TEXT_Y") + self.config.get_int("MARGIN") * 2))
+        surface.blit(time_text, (self.settings.counter_text_x, self.settings.counter_text_y + self.settings.margin * 2))
 
 
+    def toggle_profiler(self):
+        """
+        Show or hide the profiler overlay; the profiler only collects while it is shown.
+        """
+        self.show_profiler = not self.show_profiler
+        self.gameStatus.profiler.enabled = self.show_profiler
+
+    def draw_profiler(self, surface, x, y):
+        """
+        Draw the profiler report as a translucent text panel.
+        """
+        if self._hud_font is None:
+            self._hud_font = pygame.font.SysFont("Consolas", 14)
+        lines = self.gameStatus.profiler.lines()
+        line_height = self._hud_font.get_linesize()
+        panel = pygame.Surface((260, line_height * len(lines) + 8), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for i, line in enumerate(lines):
+            panel.blit(self._hud_font.render(line, True, self.settings.white), (4, 4 + i * line_height))
+        surface.blit(panel, (x, y))
+
     def renderScreen(self, events):
         
         #self.screen.fill((0, 0, 0))  # Clear the main screen
-        if self.gameStatus.fasePartita == self.config.get("FASE_INIZIO"):
+        if self.gameStatus.fasePartita == self.settings.fase_inizio:
             # Draw the title screen
             self.screen.blit(self.titolo, self.titolo_rect)
             self.start_button.update(events)
             self.start_button.render()
-        elif self.gameStatus.fasePartita == self.config.get("FASE_GIOCO"):
+        elif self.gameStatus.fasePartita == self.settings.fase_gioco:
 
+            profiler = self.gameStatus.profiler
             # Create a clean copy of the background surface
             background_copy = self.background.copy()
 
             # Draw the world grid on the copy
-            self.gameStatus.world.update()
-            self.gameStatus.world.draw_entities()
+            with profiler.section("render.world"):
+                world_surface = self.draw_world()
 
             # Blit the world surface onto the main screen
             background_copy.blit(
-                self.gameStatus.world,
-                (self.config.get_int("WORLD_POS_X"), self.config.get_int("WORLD_POS_Y")))
+                world_surface,
+                (self.settings.world_pos_x, self.settings.world_pos_y))
 
 
 
             # Draw graphs on the copy
-            graph_x = self.config.get_int("GRAPH_X")
-            self.draw_graph(
-                background_copy,
-                self.gameStatus.plant_counts,
-                "green",
-                graph_x,
-                self.config.get_int("MARGIN"),
-                "Plants: " + str(self.gameStatus.plant_counts[-1]),
-            )
-            self.draw_graph(
-                background_copy,
-                self.gameStatus.prey_counts,
-                "green",
-                graph_x,
-                self.config.get_int("MARGIN") + 200,
-                "Prey: " + str(self.gameStatus.prey_counts[-1]),
-            )
-            self.draw_graph(
-                background_copy,
-                self.gameStatus.predator_counts,
-                "green",
-                graph_x,
-                self.config.get_int("MARGIN") + 400,
-                "Predator: "+ str(self.gameStatus.predator_counts[-1]),
-            )
-            self.draw_graph(
-                background_copy,
-                self.gameStatus.food_counts,
-                "green",
-                graph_x,
-                self.config.get_int("MARGIN") + 600,
-                "Food: "+ str(self.gameStatus.food_counts[-1]),
-            )
+            with profiler.section("render.graphs"):
+                self.draw_graphs(background_copy, self.settings.graph_x, self.settings.margin)
 
             # Draw counters on the copy
-            self.draw_counters(
-                background_copy,
-                self.gameStatus.tick,
-                self.gameStatus.elapsed_time,
-                self.config.get_int("COUNTER_X"),
-                self.config.get_int("COUNTER_Y"),
-            )
+            with profiler.section("render.counters"):
+                self.draw_counters(
+                    background_copy,
+                    self.gameStatus.tick,
+                    self.gameStatus.elapsed_time,
+                    self.settings.counter_x,
+                    self.settings.counter_y,
+                )
+
+            if self.show_profiler:
+                self.draw_profiler(background_copy, self.settings.world_pos_x, self.settings.world_pos_y)
 
             # Draw the copy to the main screen
             self.screen.blit(background_copy, self.background_rect)
@@ -298,5 +270,6 @@ class Gui:
             self.exit_button.render()
 
 
-        pygame.display.update()  # Update the display
+        with self.gameStatus.profiler.section("render.display"):
+            pygame.display.update()  # Update the display
 
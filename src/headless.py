@@ -0,0 +1,91 @@
+"""
+Headless simulation runner: no pygame, no display, no frame limiter.
+
+    python -m src.headless --ticks 1000 --seed 42 --engine soa
+"""
+import argparse
+import dataclasses
+import time
+from typing import List, Optional
+from src.config import Settings
+from src.simulation import Simulation
+
+
+def format_census(census) -> str:
+    return (
+        f"tick={census.tick} plants={census.plants} prey={census.prey} "
+        f"predators={census.predators} food={census.food} "
+        f"births={census.plant_births}/{census.prey_births}/{census.predator_births} "
+        f"deaths(starved/eaten/decayed)={census.deaths_starved}/{census.deaths_eaten}/{census.deaths_decayed} "
+        f"prey_energy={census.prey_energy_mean:.2f} predator_energy={census.predator_energy_mean:.2f}"
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.headless", description="Run Life of Py without a display.")
+    parser.add_argument("--ticks", type=int, default=1000, help="number of ticks to simulate")
+    parser.add_argument("--config", default="config/.env", help="path to the .env configuration")
+    parser.add_argument("--seed", type=int, default=None, help="seed for a reproducible run")
+    parser.add_argument("--engine", choices=("object", "soa", "tiled"), default=None, help="override WORLD_ENGINE")
+    parser.add_argument("--workers", type=int, default=None, help="override TILE_WORKERS (tiled engine)")
+    parser.add_argument("--width", type=int, default=None, help="override GRID_WIDTH")
+    parser.add_argument("--height", type=int, default=None, help="override GRID_HEIGHT")
+    parser.add_argument("--resume", default=None, metavar="PATH", help="continue from a checkpoint directory")
+    parser.add_argument("--save", default=None, metavar="PATH", help="write a checkpoint at the end of the run")
+    parser.add_argument("--telemetry", default=None, metavar="PATH", help="override TELEMETRY_PATH")
+    parser.add_argument("--profile", default=None, metavar="PATH", help="profile the run and write the JSON report to PATH")
+    parser.add_argument("--report-every", type=int, default=100, help="print the census every N ticks (0 = only at the end)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Simulation:
+    args = parse_args(argv)
+    settings = Settings.load(args.config)
+    overrides = {}
+    if args.engine:
+        overrides["world_engine"] = args.engine
+    if args.workers:
+        overrides["tile_workers"] = args.workers
+    if args.width:
+        overrides["grid_width"] = args.width
+    if args.height:
+        overrides["grid_height"] = args.height
+    if args.telemetry:
+        overrides["telemetry_path"] = args.telemetry
+    if overrides:
+        settings = dataclasses.replace(settings, **overrides)
+
+    start = time.perf_counter()
+    if args.resume:
+        simulation = Simulation.load(args.resume)
+        print(f"resumed {args.resume} at tick {simulation.tick} in {time.perf_counter() - start:.3f}s")
+    else:
+        simulation = Simulation(settings, seed=args.seed)
+        print(f"populated {settings.grid_width}x{settings.grid_height} ({settings.world_engine}) "
+              f"in {time.perf_counter() - start:.3f}s")
+    print(format_census(simulation.census))
+    if args.profile:
+        simulation.profiler.enabled = True
+
+    start = time.perf_counter()
+    for tick in range(1, args.ticks + 1):
+        simulation.step()
+        if args.report_every and simulation.tick % args.report_every == 0:
+            elapsed = time.perf_counter() - start
+            print(f"{format_census(simulation.census)} ticks/s={tick / elapsed:.1f}")
+    elapsed = time.perf_counter() - start
+
+    print(format_census(simulation.census))
+    if args.profile:
+        print("\n".join(simulation.profiler.lines()))
+        print(f"profile written to {simulation.profiler.dump(args.profile)}")
+    if args.save:
+        simulation.save(args.save)
+        print(f"checkpoint written to {args.save}")
+    simulation.close()
+    print(f"{args.ticks} ticks in {elapsed:.3f}s ({args.ticks / elapsed if elapsed else float('inf'):.1f} ticks/s)")
+    return simulation
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Two-phase movement: every creature states an intent, then all conflicts are
+resolved at once.
+
+Intents are the neural net actions (stay, turn left, turn right, forward).
+Turns never conflict. Forward moves are checked against the type grid as it was
+when the move phase began, in a random per-tick priority order (the shuffled
+update order), so the outcome is what "the first creature to act wins" would
+give in a sequential update:
+
+- several creatures heading for one cell: the first one gets it;
+- prey walking into a predator is eaten, unless the predator left first;
+- a predator walking into prey eats it, unless the prey left first;
+- prey are blocked by prey, predators by predators and plants;
+- prey walking onto a plant eat it; anyone may walk onto food.
+
+A cell that is vacated during the phase only becomes free on the next tick.
+The caller applies the returned moves and kills in bulk.
+"""
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from src.entities import EMPTY, PLANT, PREY, PREDATOR, FOOD
+from src.sensors import DIRECTION_VECTORS
+
+STAY, TURN_LEFT, TURN_RIGHT, FORWARD = range(4)
+
+_DX = np.array([dx for dx, _ in DIRECTION_VECTORS], dtype=np.int64)
+_DY = np.array([dy for _, dy in DIRECTION_VECTORS], dtype=np.int64)
+
+
+@dataclass
+class Moves:
+    """
+    Outcome of one move phase. Every index refers to the creature arrays given
+    to resolve_moves, i.e. to a position in the priority order.
+    """
+
+    movers: np.ndarray     # creatures that move, to (new_x, new_y)
+    new_x: np.ndarray
+    new_y: np.ndarray
+    ate_plant: np.ndarray  # per mover: whether it moves onto a plant (and eats it)
+    victims: np.ndarray    # prey eaten this phase
+    eaters: np.ndarray     # predator that eats each victim
+    leaving: np.ndarray    # creatures heading for a free cell beyond the local rows (see StripWorld)
+    leave_x: np.ndarray
+    leave_y: np.ndarray
+
+
+def turn(directions: np.ndarray, actions: np.ndarray) -> np.ndarray:
+    """
+    New facing directions after the turn actions.
+    """
+    return (directions + (actions == TURN_RIGHT) - (actions == TURN_LEFT)) % 4
+
+
+def resolve_moves(grid_type: np.ndarray, kinds: np.ndarray, xs: np.ndarray, ys: np.ndarray,
+                  directions: np.ndarray, actions: np.ndarray, row_offset: int = 0,
+                  height: Optional[int] = None) -> Moves:
+    """
+    :param grid_type: type grid at the start of the phase, possibly padded with halo rows
+    :param kinds: PREY or PREDATOR for every living creature, in priority order
+    :param xs: columns of the creatures
+    :param ys: local rows of the creatures
+    :param directions: directions they face (after turning)
+    :param actions: their intents; only FORWARD matters here
+    :param row_offset: row of grid_type holding local row 0
+    :param height: number of local rows (defaults to every row of grid_type)
+    """
+    grid_height, width = grid_type.shape
+    height = grid_height if height is None else height
+    n = len(kinds)
+    rank = np.arange(n)
+    prey = kinds == PREY
+
+    tx = xs + _DX[directions]
+    ty = ys + _DY[directions]
+    inside = (actions == FORWARD) & (tx >= 0) & (tx < width) & (ty + row_offset >= 0) & (ty + row_offset < grid_height)
+    target = np.full(n, -1, dtype=np.int8)
+    target[inside] = grid_type[ty[inside] + row_offset, tx[inside]]
+    local = inside & (ty >= 0) & (ty < height)
+    open_cell = (target == EMPTY) | (target == FOOD)
+
+    # Claims on cells that can be entered; hunts and walk-ins only happen inside the local rows
+    claim = inside & (open_cell | (prey & (target == PLANT)) | (local & ~prey & (target == PREY)))
+    walk_in = local & prey & (target == PREDATOR)
+    target_cell = ty * width + tx
+
+    # Who stands where, to find the prey a predator walks into and the predator prey walk into
+    cells = ys * width + xs
+    sorter = np.argsort(cells, kind="stable")
+    sorted_cells = cells[sorter]
+
+    def occupant(query: np.ndarray):
+        # Cells held by someone not in the arrays (e.g. a creature that died earlier this tick) act as walls
+        at = np.minimum(np.searchsorted(sorted_cells, query), max(n - 1, 0))
+        return sorter[at], sorted_cells[at] == query
+
+    def first_claims(claimants: np.ndarray) -> np.ndarray:
+        _, first = np.unique(target_cell[claimants], return_index=True)
+        return claimants[first]
+
+    # Prey caught by a predator that acts before them never get their turn, so their claims do not count.
+    # Only predators claim prey cells and predators never die here, so those hunts are settled first
+    hunters = first_claims(np.flatnonzero(claim & (target == PREY)))
+    hunted, found = occupant(target_cell[hunters])
+    claim[hunted[found & (hunted > hunters)]] = False
+
+    won = np.zeros(n, dtype=bool)
+    won[first_claims(np.flatnonzero(claim))] = True
+    hunters, hunted = hunters[found], hunted[found]
+    # Prey that acted before its hunter and got away
+    escaped = (hunted < hunters) & won[hunted]
+    plain_moves = won & ~prey & (target != PREY)
+
+    walkers = np.flatnonzero(walk_in)
+    hosts, found = occupant(target_cell[walkers])
+    walkers, hosts = walkers[found], hosts[found]
+    # A hunt fails if the prey got away or had already walked into another predator, and a walk-in
+    # fails if the predator acted first and moved off; whether a predator moved off depends on its own
+    # hunt, so both are settled together, from the first creatures in the order to the last
+    caught = ~escaped
+    while True:
+        predator_moves = plain_moves.copy()
+        predator_moves[hunters[caught]] = True
+        stays = ~(predator_moves[hosts] & (hosts < walkers) & local[hosts])
+        walked_in = np.zeros(n, dtype=bool)
+        walked_in[walkers[stays]] = True
+        settled = ~escaped & ~(walked_in[hunted] & (hunted < hunters))
+        if np.array_equal(settled, caught):
+            break
+        caught = settled
+    walkers, hosts = walkers[stays], hosts[stays]
+    hunters, hunted = hunters[caught], hunted[caught]
+    eaten_at = np.full(n, n)
+    eaten_at[hunted] = hunters
+    # Walking into a predator only counts if the prey was not caught before its turn
+    fresh = eaten_at[walkers] > walkers
+    walkers, hosts = walkers[fresh], hosts[fresh]
+
+    dead_before_turn = eaten_at < rank
+    moved = (won & local & ~prey & predator_moves) | (won & local & prey & ~dead_before_turn)
+    leaving = won & ~local & (~prey | ~dead_before_turn)
+    movers = np.flatnonzero(moved)
+    leavers = np.flatnonzero(leaving)
+    return Moves(
+        movers=movers, new_x=tx[movers], new_y=ty[movers], ate_plant=target[movers] == PLANT,
+        victims=np.concatenate((hunted, walkers)), eaters=np.concatenate((hunters, hosts)),
+        leaving=leavers, leave_x=tx[leavers], leave_y=ty[leavers],
+    )
@@ -0,0 +1,105 @@
+"""
+Free-neighbour bitmask: for every cell, which of its 8 neighbours are free.
+
+Bit i of a cell's mask is set when the neighbour at NEIGHBOUR_OFFSETS[i] is
+inside the grid and EMPTY (food is taken, as it is for spawns). A cell turning
+free or taken only touches the masks of the 8 cells around it, so a world can
+keep the field current on every add, move and removal. "Pick a random free
+neighbour" is then a table lookup, and a crowded cell is a zero byte.
+"""
+from typing import Optional, Tuple
+import numpy as np
+from src.entities import EMPTY
+from src.growth import NEIGHBOUR_OFFSETS
+
+# Number of free neighbours per mask value, and the neighbour indices it holds
+FREE_COUNT = np.array([bin(mask).count("1") for mask in range(256)], dtype=np.uint8)
+_FREE_BITS = tuple(tuple(i for i in range(8) if mask >> i & 1) for mask in range(256))
+
+# NEIGHBOUR_OFFSETS is point-symmetric: seen from neighbour i, a cell is neighbour 7 - i
+_OPPOSITE_BIT = np.array([1 << (7 - i) for i in range(8)], dtype=np.uint8)
+
+
+class FreeNeighbours:
+    """
+    Free-neighbour masks of a width x height grid, kept in a buffer with a
+    one-cell border so updates at the edges need no bounds checks.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self._padded = np.zeros((height + 2, width + 2), dtype=np.uint8)
+        self._flat = self._padded.ravel()
+        # Flat distance to each neighbour, in NEIGHBOUR_OFFSETS order
+        self._delta = np.array([dy * (width + 2) + dx for dx, dy in NEIGHBOUR_OFFSETS], dtype=np.int64)
+        self.rebuild(np.zeros((height, width), dtype=np.int8))
+
+    @property
+    def mask(self) -> np.ndarray:
+        """
+        The (height, width) masks, as a view.
+        """
+        return self._padded[1:-1, 1:-1]
+
+    def _cells(self, xs, ys) -> np.ndarray:
+        return (np.asarray(ys, dtype=np.int64) + 1) * (self.width + 2) + np.asarray(xs, dtype=np.int64) + 1
+
+    def rebuild(self, grid_type: np.ndarray):
+        """
+        Recompute every mask from a type grid (after a restore, say).
+        """
+        free = np.zeros(self._padded.shape, dtype=np.uint8)
+        free[1:-1, 1:-1] = grid_type == EMPTY
+        mask = np.zeros((self.height, self.width), dtype=np.uint8)
+        for i, (dx, dy) in enumerate(NEIGHBOUR_OFFSETS):
+            mask |= free[1 + dy:1 + dy + self.height, 1 + dx:1 + dx + self.width] << i
+        self._padded[:] = 0
+        self.mask[:] = mask
+
+    def occupy(self, x: int, y: int):
+        """
+        The free cell x, y was taken.
+        """
+        cell = (y + 1) * (self.width + 2) + x + 1
+        self._flat[cell + self._delta] &= ~_OPPOSITE_BIT
+
+    def release(self, x: int, y: int):
+        """
+        The cell x, y became free.
+        """
+        cell = (y + 1) * (self.width + 2) + x + 1
+        self._flat[cell + self._delta] |= _OPPOSITE_BIT
+
+    def occupy_many(self, xs: np.ndarray, ys: np.ndarray):
+        """
+        occupy() for distinct cells, one scatter per neighbour direction.
+        """
+        cells = self._cells(xs, ys)
+        for delta, bit in zip(self._delta, _OPPOSITE_BIT):
+            self._flat[cells + delta] &= ~bit
+
+    def release_many(self, xs: np.ndarray, ys: np.ndarray):
+        """
+        release() for distinct cells.
+        """
+        cells = self._cells(xs, ys)
+        for delta, bit in zip(self._delta, _OPPOSITE_BIT):
+            self._flat[cells + delta] |= bit
+
+    def count(self, x: int, y: int) -> int:
+        """
+        Number of free neighbours of x, y.
+        """
+        return int(FREE_COUNT[self._padded[y + 1, x + 1]])
+
+    def pick(self, x: int, y: int, rng) -> Optional[Tuple[int, int]]:
+        """
+        A random free neighbour of x, y, or None if there is none.
+        :param rng: world random stream; one draw, as choice() over the free cells in NEIGHBOUR_OFFSETS order
+        """
+        bits = _FREE_BITS[self._padded[y + 1, x + 1]]
+        if not bits:
+            return None
+        dx, dy = NEIGHBOUR_OFFSETS[rng.choice(bits)]
+        return x + dx, y + dy
@@ -1,27 +1,207 @@
 import numpy as np
-import random
+from typing import List, Optional, Sequence, Tuple
+
+
+class GenomeArena:
+    """
+    The weights of many networks of one topology, one float32 row per network in
+    a preallocated matrix (W1, b1, W2 and b2 laid out back to back). Rows are
+    recycled through a free list, so a birth reuses the row of an earlier death,
+    and the matrix only grows (doubling) when every row is taken.
+    """
+
+    def __init__(self, input_size: int, hidden_size: int, output_size: int, capacity: int = 1024):
+        """
+        :param capacity: initial number of rows
+        """
+        self.input_size = input_size
+        self.hidden_size = hidden_size
+        self.output_size = output_size
+        self.shapes = ((hidden_size, input_size), (hidden_size, 1), (output_size, hidden_size), (output_size, 1))
+        self.offsets = np.cumsum([0] + [rows * cols for rows, cols in self.shapes]).tolist()
+        self.genome_size = self.offsets[-1]
+        self.rows = np.zeros((max(1, capacity), self.genome_size), dtype=np.float32)
+        self.size = 0  # high-water mark of used rows
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        """
+        Number of rows in use.
+        """
+        return self.size - len(self._free)
+
+    def _grow(self, capacity: int):
+        rows = np.zeros((capacity, self.genome_size), dtype=np.float32)
+        rows[:len(self.rows)] = self.rows
+        self.rows = rows
+
+    def allocate(self) -> int:
+        """
+        A free row (its contents are whatever the last owner left).
+        """
+        if self._free:
+            return self._free.pop()
+        if self.size == len(self.rows):
+            self._grow(len(self.rows) * 2)
+        self.size += 1
+        return self.size - 1
+
+    def allocate_many(self, n: int) -> np.ndarray:
+        recycled = self._free[len(self._free) - min(n, len(self._free)):][::-1]
+        del self._free[len(self._free) - len(recycled):]
+        fresh = n - len(recycled)
+        if self.size + fresh > len(self.rows):
+            self._grow(max(len(self.rows) * 2, self.size + fresh))
+        slots = np.concatenate((np.array(recycled, dtype=np.int64), np.arange(self.size, self.size + fresh)))
+        self.size += fresh
+        return slots
+
+    def free(self, slot: int):
+        self._free.append(slot)
+
+    def free_many(self, slots: np.ndarray):
+        self._free.extend(np.asarray(slots).tolist())
+
+    def clone(self, slot: int) -> int:
+        """
+        Copy the genome in slot to a new row, with a single row copy.
+        """
+        child = self.allocate()
+        self.rows[child] = self.rows[slot]
+        return child
+
+    def net(self, slot: int) -> "NeuralNet":
+        """
+        The network stored in slot, as a view (nothing is copied).
+        """
+        net = NeuralNet.__new__(NeuralNet)
+        net.arena, net.slot = self, slot
+        return net
+
+    def parameter(self, slot: int, index: int) -> np.ndarray:
+        """
+        View of parameter index (0 = W1, 1 = b1, 2 = W2, 3 = b2) of the network in slot.
+        """
+        return self.rows[slot, self.offsets[index]:self.offsets[index + 1]].reshape(self.shapes[index])
+
+    def parameters(self, slots) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        W1, b1, W2, b2 of one row as views, or of an array of rows as (N, ...) tensors from one gather.
+        """
+        block = self.rows[slots]
+        if block.ndim == 1:
+            return tuple(block[start:end].reshape(shape)
+                         for start, end, shape in zip(self.offsets, self.offsets[1:], self.shapes))
+        return tuple(block[:, start:end].reshape(len(block), *shape)
+                     for start, end, shape in zip(self.offsets, self.offsets[1:], self.shapes))
+
+    def add_many(self, W1: np.ndarray, b1: np.ndarray, W2: np.ndarray, b2: np.ndarray) -> List["NeuralNet"]:
+        """
+        Store N networks given as (N, ...) parameter tensors; returns their views.
+        """
+        slots = self.allocate_many(len(W1))
+        for start, end, values in zip(self.offsets, self.offsets[1:], (W1, b1, W2, b2)):
+            self.rows[slots, start:end] = values.reshape(len(slots), end - start)
+        return [self.net(slot) for slot in slots.tolist()]
+
+    def adopt(self, net: "NeuralNet") -> "NeuralNet":
+        """
+        net itself if it lives here, otherwise a copy of it in a row of this arena.
+        """
+        if net.arena is self:
+            return net
+        slot = self.allocate()
+        self.rows[slot] = net.arena.rows[net.slot]
+        return self.net(slot)
+
 
 class NeuralNet:
     """
     A simple feedforward neural network with one hidden layer.
+    The weights are a view over one row of a GenomeArena; a network created
+    without an arena gets a private one-row arena.
     """
 
-    def __init__(self, input_size: int, hidden_size: int, output_size: int):
+    def __init__(self, input_size: int, hidden_size: int, output_size: int, rng,
+                 arena: Optional[GenomeArena] = None):
         """
         :param input_size: Number of input neurons
         :param hidden_size: Number of neurons in hidden layer
         :param output_size: Number of output neurons
+        :param rng: Generator (or world random stream) for the initial weights
+        :param arena: arena of the same topology to store the weights in
         """
-        self.input_size = input_size
-        self.hidden_size = hidden_size
-        self.output_size = output_size
+        self.arena = arena if arena is not None else GenomeArena(input_size, hidden_size, output_size, capacity=1)
+        self.slot = self.arena.allocate()
 
         # Initialize weights (e.g., Xavier or small random)
-        # We'll store them as NumPy arrays
-        self.W1 = np.random.randn(self.hidden_size, self.input_size) * 0.1
-        self.b1 = np.zeros((self.hidden_size, 1))
-        self.W2 = np.random.randn(self.output_size, self.hidden_size) * 0.1
-        self.b2 = np.zeros((self.output_size, 1))
+        self.W1[:] = rng.standard_normal((hidden_size, input_size)) * 0.1
+        self.b1[:] = 0
+        self.W2[:] = rng.standard_normal((output_size, hidden_size)) * 0.1
+        self.b2[:] = 0
+
+    @classmethod
+    def from_parameters(cls, W1: np.ndarray, b1: np.ndarray, W2: np.ndarray, b2: np.ndarray,
+                        arena: Optional[GenomeArena] = None) -> "NeuralNet":
+        """
+        Build a network from existing weights (copied into the arena), without drawing random ones.
+        """
+        hidden_size, input_size = W1.shape
+        if arena is None:
+            arena = GenomeArena(input_size, hidden_size, W2.shape[0], capacity=1)
+        return arena.add_many(W1[np.newaxis], b1[np.newaxis], W2[np.newaxis], b2[np.newaxis])[0]
+
+    def __reduce__(self):
+        # Pickled (e.g. sent to another process) as a standalone copy of the row
+        return NeuralNet.from_parameters, (self.W1.copy(), self.b1.copy(), self.W2.copy(), self.b2.copy())
+
+    @property
+    def input_size(self) -> int:
+        return self.arena.input_size
+
+    @property
+    def hidden_size(self) -> int:
+        return self.arena.hidden_size
+
+    @property
+    def output_size(self) -> int:
+        return self.arena.output_size
+
+    @property
+    def W1(self) -> np.ndarray:
+        return self.arena.parameter(self.slot, 0)
+
+    @property
+    def b1(self) -> np.ndarray:
+        return self.arena.parameter(self.slot, 1)
+
+    @property
+    def W2(self) -> np.ndarray:
+        return self.arena.parameter(self.slot, 2)
+
+    @property
+    def b2(self) -> np.ndarray:
+        return self.arena.parameter(self.slot, 3)
+
+    def clone(self) -> "NeuralNet":
+        """
+        A copy of this network in a new row of the same arena.
+        """
+        return self.arena.net(self.arena.clone(self.slot))
+
+    def detach(self) -> "NeuralNet":
+        """
+        Move this network out of its arena into a private one, freeing its row.
+        """
+        net = NeuralNet.from_parameters(self.W1, self.b1, self.W2, self.b2)
+        self.release()
+        return net
+
+    def release(self):
+        """
+        Give the row back to the arena; the network must not be used afterwards.
+        """
+        self.arena.free(self.slot)
 
     def forward(self, inputs: np.ndarray) -> np.ndarray:
         """
@@ -33,12 +213,15 @@ class NeuralNet:
         if inputs.ndim == 1:
             inputs = inputs.reshape(-1, 1)  # column vector
 
+        # One lookup of the arena row, then views of its four parameters
+        W1, b1, W2, b2 = self.arena.parameters(self.slot)
+
         # Hidden layer: z1 = W1*inputs + b1, then ReLU
-        z1 = np.dot(self.W1, inputs) + self.b1
+        z1 = np.dot(W1, inputs) + b1
         a1 = self.relu(z1)
 
         # Output layer: z2 = W2*a1 + b2
-        z2 = np.dot(self.W2, a1) + self.b2
+        z2 = np.dot(W2, a1) + b2
         # We could do a softmax or leave it raw. 
         # For discrete actions, we might just pick argmax from these raw scores.
         return z2.flatten()  # shape (output_size,)
@@ -46,24 +229,98 @@ class NeuralNet:
     def relu(self, x: np.ndarray) -> np.ndarray:
         return np.maximum(0, x)
 
-    def mutate(self, mutation_rate: float, mutation_stddev: float):
+    def mutate(self, mutation_rate: float, mutation_stddev: float, rng):
         """
         Apply random noise to weights/biases with a probability of mutation.
         :param mutation_rate: chance of each weight being mutated
         :param mutation_stddev: std deviation of Gaussian noise
+        :param rng: NumPy Generator or world random stream
         """
-        # We'll mutate W1, b1, W2, b2 in place
-        self._mutate_array(self.W1, mutation_rate, mutation_stddev)
-        self._mutate_array(self.b1, mutation_rate, mutation_stddev)
-        self._mutate_array(self.W2, mutation_rate, mutation_stddev)
-        self._mutate_array(self.b2, mutation_rate, mutation_stddev)
+        mutate_rows(self.arena, [self.slot], mutation_rate, mutation_stddev, rng)
 
-    def _mutate_array(self, arr: np.ndarray, rate: float, stddev: float):
-        """
-        For each element in arr, with probability rate, add Gaussian noise ~ N(0, stddev).
-        """
-        rows, cols = arr.shape
-        for r in range(rows):
-            for c in range(cols):
-                if random.random() < rate:
-                    arr[r, c] += random.gauss(0, stddev)
+def stack_parameters(nets: Sequence[NeuralNet]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stack the weights of many networks with the same topology into 3-D tensors.
+    :return: W1 (N, hidden, input), b1 (N, hidden, 1), W2 (N, output, hidden), b2 (N, output, 1)
+    """
+    return (
+        np.stack([net.W1 for net in nets]),
+        np.stack([net.b1 for net in nets]),
+        np.stack([net.W2 for net in nets]),
+        np.stack([net.b2 for net in nets]),
+    )
+
+
+def forward_batch(W1: np.ndarray, b1: np.ndarray, W2: np.ndarray, b2: np.ndarray,
+                  inputs: np.ndarray) -> np.ndarray:
+    """
+    Forward pass of N networks at once, network i applied to inputs[i].
+    :param inputs: (N, input_size) matrix
+    :return: Output activations (N, output_size)
+    """
+    # Match NeuralNet.forward, which computes in the weights' dtype
+    x = inputs.astype(W1.dtype, copy=False)[:, :, np.newaxis]
+    a1 = np.maximum(0, np.matmul(W1, x) + b1)
+    return (np.matmul(W2, a1) + b2)[:, :, 0]
+
+
+def batch_actions(nets: Sequence[NeuralNet], inputs: np.ndarray) -> np.ndarray:
+    """
+    Pick the argmax action for every network in one batched pass.
+    :param nets: N networks with the same topology
+    :param inputs: (N, input_size) matrix, row i feeds nets[i]
+    :return: (N,) array of action indices
+    """
+    if len(nets) == 0:
+        return np.zeros(0, dtype=np.int64)
+    arena = nets[0].arena
+    if all(net.arena is arena for net in nets):
+        return arena_actions(arena, np.array([net.slot for net in nets], dtype=np.int64), inputs)
+    return np.argmax(forward_batch(*stack_parameters(nets), inputs), axis=1)
+
+
+def arena_actions(arena: GenomeArena, slots: np.ndarray, inputs: np.ndarray) -> np.ndarray:
+    """
+    batch_actions() for the networks in the given rows of an arena, read straight from its matrix.
+    """
+    return np.argmax(forward_batch(*arena.parameters(slots), inputs), axis=1)
+
+
+def mutate_arrays(arrays: Sequence[np.ndarray], rate: float, stddev: float, rng):
+    """
+    In place, add Gaussian noise ~ N(0, stddev) to each element of every array with probability rate.
+    All arrays share one bulk draw for the mask and one for the noise, so mutating
+    many genomes at once costs two RNG calls in total.
+    :param rng: NumPy Generator or world random stream
+    """
+    sizes = [arr.size for arr in arrays]
+    mask = rng.random(sum(sizes)) < rate
+    noise = np.zeros(mask.shape)
+    noise[mask] = rng.normal(0.0, stddev, np.count_nonzero(mask))
+
+    offset = 0
+    for arr, size in zip(arrays, sizes):
+        arr += noise[offset:offset + size].reshape(arr.shape)
+        offset += size
+
+
+def mutate_batch(nets: Sequence[NeuralNet], rate: float, stddev: float, rng):
+    """
+    Mutate many networks (e.g. all children born in a tick) with a single set of RNG draws.
+    """
+    if nets and all(net.arena is nets[0].arena for net in nets):
+        mutate_rows(nets[0].arena, [net.slot for net in nets], rate, stddev, rng)
+        return
+    mutate_arrays([arr for net in nets for arr in (net.W1, net.b1, net.W2, net.b2)], rate, stddev, rng)
+
+
+def mutate_rows(arena: GenomeArena, slots: Sequence[int], rate: float, stddev: float, rng):
+    """
+    mutate_arrays() for whole rows of an arena: the same draws, added to the matrix in one scatter.
+    :param slots: distinct rows
+    """
+    slots = np.asarray(slots, dtype=np.int64)
+    mask = rng.random(len(slots) * arena.genome_size) < rate
+    noise = np.zeros(mask.shape)
+    noise[mask] = rng.normal(0.0, stddev, np.count_nonzero(mask))
+    arena.rows[slots] += noise.reshape(len(slots), arena.genome_size)
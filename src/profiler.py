@@ -0,0 +1,177 @@
+"""
+Tick profiler: where the time of a tick, and of a GUI frame, goes.
+
+When enabled, a world runs its phases through Profiler.run_tick, which times
+each one with perf_counter_ns; the object engine also times its entity updates
+per type, and the move phases count neural net forwards, moves and blocked
+moves. Births and removals come from the census. Every capture_every ticks a
+cProfile window of capture_ticks ticks can be written to disk as well.
+
+When disabled, a world pays one attribute check per tick and the GUI one per
+section, so the profiler can stay wired in permanently.
+"""
+import cProfile
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+from src.entities import PLANT, PREY, PREDATOR
+
+COUNTERS = ("nn_forwards", "moves", "blocked_moves", "births", "removals")
+TYPE_NAMES = {PLANT: "plant", PREY: "prey", PREDATOR: "predator"}
+
+_NO_SECTION = nullcontext()
+
+
+class Profiler:
+    """
+    Cumulative timings (nanoseconds) and counters since the last reset().
+    """
+
+    def __init__(self, enabled: bool = False, capture_every: int = 0, capture_ticks: int = 10,
+                 capture_path="profiles"):
+        """
+        :param enabled: collect timings from the start
+        :param capture_every: start a cProfile window every N ticks (0 = never)
+        :param capture_ticks: ticks covered by each cProfile window
+        :param capture_path: directory the .prof files of the windows go to
+        """
+        self.enabled = enabled
+        self.capture_every = capture_every
+        self.capture_ticks = capture_ticks
+        self.capture_path = Path(capture_path)
+        self._capture: Optional[cProfile.Profile] = None
+        self._capture_left = 0
+        self.reset()
+
+    def reset(self):
+        self.ticks = 0
+        self.tick_ns = 0
+        self.phase_ns: Dict[str, int] = {}
+        self.type_ns = [0] * 5
+        self.section_ns: Dict[str, int] = {}
+        self.section_calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self._last_census = None
+
+    # ------------------------------------------------------------------
+    # Collection
+    # ------------------------------------------------------------------
+
+    def run_tick(self, world):
+        """
+        Run the phases of one world tick, timing each of them (with the event dispatch it triggers).
+        """
+        self._maybe_start_capture(world.tick)
+        clock = time.perf_counter_ns
+        tick_start = clock()
+        for name, phase in world.phases():
+            start = clock()
+            phase()
+            world.events.flush()
+            self.phase_ns[name] = self.phase_ns.get(name, 0) + clock() - start
+        self.tick_ns += clock() - tick_start
+        self.ticks += 1
+        self._count_census(world.census)
+        self._maybe_stop_capture(world.tick)
+
+    def add_type_time(self, type_code: int, ns: int):
+        self.type_ns[type_code] += ns
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def count_moves(self, thinkers: int, forward: int, moved: int):
+        """
+        :param thinkers: creatures whose net ran
+        :param forward: creatures that tried to move forward and are still alive
+        :param moved: how many of them moved
+        """
+        counters = self.counters
+        counters["nn_forwards"] += thinkers
+        counters["moves"] += moved
+        counters["blocked_moves"] += forward - moved
+
+    def _count_census(self, census):
+        last = self._last_census
+        if last is not None and census.tick > last.tick:
+            self.counters["births"] += (census.plant_births + census.prey_births + census.predator_births
+                                        - last.plant_births - last.prey_births - last.predator_births)
+            self.counters["removals"] += (census.deaths_starved + census.deaths_eaten
+                                          - last.deaths_starved - last.deaths_eaten)
+        self._last_census = census
+
+    def section(self, name: str):
+        """
+        Context manager timing one section of a frame (or anything else); free when disabled.
+        """
+        if not self.enabled:
+            return _NO_SECTION
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.section_ns[name] = self.section_ns.get(name, 0) + time.perf_counter_ns() - start
+            self.section_calls[name] = self.section_calls.get(name, 0) + 1
+
+    def _maybe_start_capture(self, tick: int):
+        if self.capture_every and self._capture is None and tick % self.capture_every == 0:
+            self._capture = cProfile.Profile()
+            self._capture_left = self.capture_ticks
+            self._capture.enable()
+
+    def _maybe_stop_capture(self, tick: int):
+        if self._capture is None:
+            return
+        self._capture_left -= 1
+        if self._capture_left > 0:
+            return
+        self._capture.disable()
+        self.capture_path.mkdir(parents=True, exist_ok=True)
+        self._capture.dump_stats(str(self.capture_path / f"tick-{tick}.prof"))
+        self._capture = None
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def report(self) -> dict:
+        """
+        Mean milliseconds per tick (phases, entity types) or per call (sections), and counters per tick.
+        """
+        ticks = max(self.ticks, 1)
+        return {
+            "ticks": self.ticks,
+            "tick_ms": self.tick_ns / ticks / 1e6,
+            "phase_ms": {name: ns / ticks / 1e6 for name, ns in self.phase_ns.items()},
+            "type_ms": {TYPE_NAMES[code]: self.type_ns[code] / ticks / 1e6 for code in TYPE_NAMES
+                        if self.type_ns[code]},
+            "section_ms": {name: ns / self.section_calls[name] / 1e6 for name, ns in self.section_ns.items()},
+            "per_tick": {name: n / ticks for name, n in self.counters.items()},
+        }
+
+    def dump(self, path) -> Path:
+        """
+        Write report() as JSON.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2))
+        return path
+
+    def lines(self) -> List[str]:
+        """
+        The report as short text lines, for the HUD overlay.
+        """
+        report = self.report()
+        lines = [f"tick {report['tick_ms']:.2f} ms ({report['ticks']} ticks)"]
+        lines += [f"  {name} {ms:.2f} ms" for name, ms in report["phase_ms"].items()]
+        lines += [f"  [{name}] {ms:.2f} ms" for name, ms in report["type_ms"].items()]
+        lines += [f"{name} {ms:.2f} ms" for name, ms in report["section_ms"].items()]
+        lines += [f"{name} {n:.1f}/tick" for name, n in report["per_tick"].items()]
+        return lines
@@ -0,0 +1,134 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class EntityRegistry:
+    """
+    Registry of the entities living in a World.
+
+    - Every entity gets a stable integer handle (entity.handle) that stays valid
+      until it is removed; freed handles are reused by later additions.
+    - Entities are kept in one dense list for iteration. Removal swaps the last
+      entity into the freed position, so add and remove are both O(1).
+    - The same swap-remove scheme keeps a dense sub-list per entity class.
+    """
+
+    def __init__(self):
+        self._by_handle: List[Optional[object]] = []  # handle -> entity
+        self._free_handles: List[int] = []
+        self._dense: List[object] = []
+        self._by_type: Dict[type, List[object]] = {}
+
+    def add(self, entity) -> int:
+        """
+        Register entity and return its handle.
+        """
+        if self._free_handles:
+            handle = self._free_handles.pop()
+            self._by_handle[handle] = entity
+        else:
+            handle = len(self._by_handle)
+            self._by_handle.append(entity)
+        entity.handle = handle
+
+        entity._dense_index = len(self._dense)
+        self._dense.append(entity)
+
+        same_type = self._by_type.setdefault(type(entity), [])
+        entity._type_index = len(same_type)
+        same_type.append(entity)
+        return handle
+
+    def remove(self, entity) -> bool:
+        """
+        Unregister entity in O(1). Returns False if it was not registered here.
+        """
+        if entity not in self:
+            return False
+
+        self._swap_remove(self._dense, entity._dense_index, "_dense_index")
+        self._swap_remove(self._by_type[type(entity)], entity._type_index, "_type_index")
+
+        self._by_handle[entity.handle] = None
+        self._free_handles.append(entity.handle)
+        entity.handle = -1
+        return True
+
+    @staticmethod
+    def _swap_remove(items: list, index: int, index_attr: str):
+        last = items.pop()
+        if index < len(items):
+            items[index] = last
+            setattr(last, index_attr, index)
+
+    def state(self) -> Tuple[List[object], List[int], List[int], List[int]]:
+        """
+        Everything needed to rebuild this registry with restore():
+        entities in iteration order, their handles, their positions in their
+        class sub-list, and the free handles.
+        """
+        return (
+            list(self._dense),
+            [entity.handle for entity in self._dense],
+            [entity._type_index for entity in self._dense],
+            list(self._free_handles),
+        )
+
+    @classmethod
+    def restore(cls, dense: List[object], handles: List[int], type_indices: List[int],
+                free_handles: List[int]) -> "EntityRegistry":
+        """
+        Rebuild a registry from the output of state(), with the same iteration
+        orders and handles, so a restored world updates exactly like the original.
+        """
+        registry = cls()
+        registry._by_handle = [None] * (max(handles + free_handles, default=-1) + 1)
+        registry._free_handles = list(free_handles)
+        registry._dense = list(dense)
+        for index, (entity, handle) in enumerate(zip(dense, handles)):
+            entity.handle = handle
+            entity._dense_index = index
+            registry._by_handle[handle] = entity
+        for entity, type_index in zip(dense, type_indices):
+            same_type = registry._by_type.setdefault(type(entity), [])
+            if len(same_type) <= type_index:
+                same_type.extend([None] * (type_index + 1 - len(same_type)))
+            same_type[type_index] = entity
+            entity._type_index = type_index
+        return registry
+
+    def get(self, handle: int):
+        """
+        Entity registered under handle, or None.
+        """
+        if 0 <= handle < len(self._by_handle):
+            return self._by_handle[handle]
+        return None
+
+    def of_type(self, cls: type) -> List[object]:
+        """
+        Dense list of the registered entities of exactly class cls (do not modify).
+        """
+        return self._by_type.get(cls, [])
+
+    def count(self, cls: type) -> int:
+        return len(self._by_type.get(cls, ()))
+
+    def shuffle(self, rnd):
+        """
+        Shuffle the iteration order in place and refresh the dense indices.
+        :param rnd: anything with a random.shuffle-like shuffle(list) method
+        """
+        rnd.shuffle(self._dense)
+        for index, entity in enumerate(self._dense):
+            entity._dense_index = index
+
+    def __contains__(self, entity) -> bool:
+        handle = getattr(entity, "handle", -1)
+        return 0 <= handle < len(self._by_handle) and self._by_handle[handle] is entity
+
+    def __iter__(self) -> Iterator:
+        # Iterates the live list: entities added during the loop are visited too
+        return iter(self._dense)
+
+    def __len__(self) -> int:
+        return len(self._dense)
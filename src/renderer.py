@@ -0,0 +1,40 @@
+import numpy as np
+import pygame
+from src.entities import PLANT, PREY, PREDATOR, FOOD
+
+
+class WorldRenderer:
+    """
+    Draws a world (World or SoAWorld) onto its own pygame Surface.
+    The surface is 8-bit and palette-indexed: the world's type-code occupancy
+    grid is copied into it in a single surfarray call, so drawing costs the
+    same whatever the number of entities.
+    The world itself holds no rendering state; any number of renderers can observe it.
+    """
+
+    def __init__(self, width: int, height: int):
+        """
+        :param width: number of columns of the world grid
+        :param height: number of rows of the world grid
+        """
+        self.surface = pygame.Surface((width, height), depth=8)
+
+        # Define colors for each entity type (palette index = type code, 0 = empty)
+        self.colors = {
+            PLANT: (0, 255, 0),    # Green
+            PREY: (0, 0, 255),     # Blue
+            PREDATOR: (255, 0, 0), # Red
+            FOOD: (255, 255, 0)    # Yellow
+        }
+        palette = [(0, 0, 0)] * 256  # Black background
+        for type_code, color in self.colors.items():
+            palette[type_code] = color
+        self.surface.set_palette(palette)
+
+    def draw(self, world) -> pygame.Surface:
+        """
+        Copies the world's occupancy grid into the surface and returns it.
+        """
+        # The grid is indexed [y, x]; surfarray expects [x, y]
+        pygame.surfarray.blit_array(self.surface, world.occupancy.T.astype(np.uint8, copy=False))
+        return self.surface
@@ -0,0 +1,46 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-size history of numbers backed by a preallocated NumPy array.
+    Appending never allocates; once full, the oldest value is overwritten.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float64):
+        """
+        :param capacity: number of most recent values kept
+        """
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def clear(self):
+        self._next = 0
+        self._size = 0
+
+    @property
+    def last(self):
+        """
+        Most recent value (0 if the buffer is empty).
+        """
+        if not self._size:
+            return self._data.dtype.type(0)
+        return self._data[self._next - 1]
+
+    def values(self) -> np.ndarray:
+        """
+        Contents in insertion order, oldest first. A view when the buffer has not wrapped yet.
+        """
+        if self._size < self.capacity:
+            return self._data[:self._size]
+        return np.roll(self._data, -self._next)
@@ -0,0 +1,135 @@
+"""
+Random number service: one seeded NumPy generator per simulation subsystem.
+
+Every stream is spawned from the same SeedSequence, so a single seed makes a
+whole run reproducible while the subsystems stay independent: drawing more
+mutation noise, say, does not shift where plants grow.
+Scalar draws come from blocks of uniforms drawn in bulk, so hot per-entity
+paths read a list instead of calling into the generator every time.
+"""
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+
+# Spawn order is part of the reproducibility contract: only ever append
+STREAMS = ("placement", "ordering", "plant_growth", "reproduction", "mutation", "genome")
+
+
+class RandomStream:
+    """
+    A Generator plus a pre-drawn block of uniform floats in [0, 1).
+    random() with no size and the scalar helpers read the block; everything
+    else (permutation, normal, ...) goes straight to the generator.
+    """
+
+    def __init__(self, generator: np.random.Generator, block: int = 4096):
+        """
+        :param block: number of uniforms drawn at a time
+        """
+        self.generator = generator
+        self.block = block
+        self._refill()
+
+    def _refill(self):
+        self._block_state = self.generator.bit_generator.state
+        self._buffer = self.generator.random(self.block)
+        self._values = self._buffer.tolist()
+        self._pos = 0
+
+    def random(self, size: Optional[int] = None):
+        """
+        One uniform float, or an array of size of them, from the pre-drawn block.
+        """
+        if size is None:
+            if self._pos == self.block:
+                self._refill()
+            value = self._values[self._pos]
+            self._pos += 1
+            return value
+        out = np.empty(size)
+        take = min(size, self.block - self._pos)
+        out[:take] = self._buffer[self._pos:self._pos + take]
+        self._pos += take
+        if take < size:
+            # The rest of a large request comes directly from the generator
+            out[take:] = self.generator.random(size - take)
+        return out
+
+    def below(self, n: int) -> int:
+        """
+        Uniform integer in [0, n).
+        """
+        return int(self.random() * n)
+
+    def randint(self, low: int, high: int) -> int:
+        """
+        Uniform integer in [low, high], both included (like random.randint).
+        """
+        return low + int(self.random() * (high - low + 1))
+
+    def choice(self, items: Sequence):
+        """
+        One element of a non-empty sequence (like random.choice).
+        """
+        return items[int(self.random() * len(items))]
+
+    def shuffle(self, items: List):
+        """
+        Shuffle a list in place (like random.shuffle).
+        """
+        order = self.generator.permutation(len(items))
+        items[:] = [items[i] for i in order]
+
+    def permutation(self, x):
+        return self.generator.permutation(x)
+
+    def normal(self, loc: float = 0.0, scale: float = 1.0, size=None):
+        return self.generator.normal(loc, scale, size)
+
+    def standard_normal(self, size=None):
+        return self.generator.standard_normal(size)
+
+    def get_state(self) -> dict:
+        """
+        JSON-friendly state: the generator state before and after the current block, and the read position.
+        """
+        return {"block_state": self._block_state, "state": self.generator.bit_generator.state, "pos": self._pos}
+
+    def set_state(self, state: dict):
+        self.generator.bit_generator.state = state["block_state"]
+        self._refill()
+        self.generator.bit_generator.state = state["state"]
+        self._pos = state["pos"]
+
+
+class RandomService:
+    """
+    The independent random streams of one world, all derived from one seed:
+    placement (initial population, random plants), ordering (update order),
+    plant_growth, reproduction (where offspring go), mutation and genome (new nets).
+    """
+
+    placement: RandomStream
+    ordering: RandomStream
+    plant_growth: RandomStream
+    reproduction: RandomStream
+    mutation: RandomStream
+    genome: RandomStream
+
+    def __init__(self, seed: Union[None, int, np.random.SeedSequence] = None, block: int = 4096):
+        """
+        :param seed: an int, a SeedSequence (e.g. spawned for a worker) or None for fresh entropy
+        """
+        sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.streams: Dict[str, RandomStream] = {
+            name: RandomStream(np.random.default_rng(child), block)
+            for name, child in zip(STREAMS, sequence.spawn(len(STREAMS)))
+        }
+        for name, stream in self.streams.items():
+            setattr(self, name, stream)
+
+    def get_state(self) -> Dict[str, dict]:
+        return {name: stream.get_state() for name, stream in self.streams.items()}
+
+    def set_state(self, state: Dict[str, dict]):
+        for name, stream_state in state.items():
+            self.streams[name].set_state(stream_state)
@@ -0,0 +1,104 @@
+"""
+Vision sensors for creatures.
+
+A creature looks left, front and right relative to the direction it faces and
+sees the type code of the nearest occupied cell in each of those directions and
+its distance normalised by the view range. Cells further than the view range,
+or a clear line of sight, read as type 0 (empty) at distance 1.0.
+"""
+from typing import Tuple
+import numpy as np
+from src.entities import EMPTY
+
+# (dx, dy) for direction 0=Up, 1=Right, 2=Down, 3=Left
+DIRECTION_VECTORS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+def _nearest_along_rows(occupied: np.ndarray, xs: np.ndarray, row_idx: np.ndarray):
+    """
+    For each creature, column of the nearest occupied cell strictly to its left
+    (-1 if none) and strictly to its right (width if none), from two prefix scans.
+    """
+    width = occupied.shape[1]
+    cols = np.arange(width, dtype=np.int32)
+    last = np.maximum.accumulate(np.where(occupied, cols, -1), axis=1)
+    first = np.minimum.accumulate(np.where(occupied, cols, width)[:, ::-1], axis=1)[:, ::-1]
+    left = np.where(xs > 0, last[row_idx, np.maximum(xs - 1, 0)], -1)
+    right = np.where(xs < width - 1, first[row_idx, np.minimum(xs + 1, width - 1)], width)
+    return left, right
+
+
+def nearest_occupants(grid_type: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Type and distance of the nearest occupant in each absolute direction for every creature.
+    Scans only the rows and columns that contain at least one creature.
+    :param grid_type: (height, width) type-code occupancy grid
+    :return: types (4, N) and distances (4, N); distance 0 means nothing in that direction
+    """
+    n = len(xs)
+    types = np.zeros((4, n), dtype=np.int8)
+    dists = np.zeros((4, n), dtype=np.int32)
+    if n == 0:
+        return types, dists
+    occupied = grid_type != EMPTY
+    xs = xs.astype(np.int64)
+    ys = ys.astype(np.int64)
+
+    rows, row_idx = np.unique(ys, return_inverse=True)
+    left, right = _nearest_along_rows(occupied[rows], xs, row_idx)
+    cols, col_idx = np.unique(xs, return_inverse=True)
+    up, down = _nearest_along_rows(occupied[:, cols].T, ys, col_idx)
+
+    width, height = grid_type.shape[1], grid_type.shape[0]
+    for direction, found, hit, dist in (
+        (0, up >= 0, (np.maximum(up, 0), xs), ys - up),
+        (1, right < width, (ys, np.minimum(right, width - 1)), right - xs),
+        (2, down < height, (np.minimum(down, height - 1), xs), down - ys),
+        (3, left >= 0, (ys, np.maximum(left, 0)), xs - left),
+    ):
+        types[direction] = np.where(found, grid_type[hit], EMPTY)
+        dists[direction] = np.where(found, dist, 0)
+    return types, dists
+
+
+def vision_inputs(grid_type: np.ndarray, xs: np.ndarray, ys: np.ndarray, directions: np.ndarray,
+                  view_range: int) -> np.ndarray:
+    """
+    Neural net view inputs for all creatures at once.
+    :return: (N, 6) float32 matrix: left type, left distance, front type,
+             front distance, right type, right distance
+    """
+    n = len(xs)
+    out = np.zeros((n, 6), dtype=np.float32)
+    if n == 0:
+        return out
+    types, dists = nearest_occupants(grid_type, xs, ys)
+    creatures = np.arange(n)
+    directions = directions.astype(np.int64)
+    for column, turn in ((0, -1), (2, 0), (4, 1)):
+        absolute = (directions + turn) % 4
+        dist = dists[absolute, creatures]
+        visible = (dist > 0) & (dist <= view_range)
+        out[:, column] = np.where(visible, types[absolute, creatures], EMPTY)
+        out[:, column + 1] = np.where(visible, dist / view_range, 1.0)
+    return out
+
+
+def look(grid_type: np.ndarray, x: int, y: int, direction: int, view_range: int) -> tuple:
+    """
+    Same inputs as one row of vision_inputs, walking the grid for a single creature.
+    """
+    height, width = grid_type.shape
+    view = []
+    for turn in (-1, 0, 1):
+        dx, dy = DIRECTION_VECTORS[(direction + turn) % 4]
+        seen_type, seen_dist = EMPTY, 1.0
+        for step in range(1, view_range + 1):
+            cx, cy = x + dx * step, y + dy * step
+            if not (0 <= cx < width and 0 <= cy < height):
+                break
+            if grid_type[cy, cx] != EMPTY:
+                seen_type, seen_dist = int(grid_type[cy, cx]), step / view_range
+                break
+        view.extend((float(seen_type), seen_dist))
+    return tuple(view)
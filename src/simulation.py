@@ -0,0 +1,160 @@
+from pathlib import Path
+from typing import Callable, Dict, Optional
+import numpy as np
+from src.config import Settings, get_settings
+from src.event import Event
+from src.profiler import Profiler
+from src.telemetry import Telemetry
+from src.world import create_world
+
+
+class Simulation:
+    """
+    The simulation core: a world and its tick loop, with no rendering and no pygame.
+    Used directly by the headless runner and wrapped by GameStatus for the GUI.
+    Observers subscribe to the ticked Event and receive the Simulation after
+    every tick and after every reset; per-tick detail (sprouts, deaths) comes
+    from world.events, whose subscriptions are dropped when the world is replaced.
+    Checkpoints carry the census history: the series of a history provider, or
+    else of the last HISTORY_TICKS ticks, which the Simulation records itself.
+    """
+
+    HISTORY_TICKS = 1000
+
+    def __init__(self, settings: Optional[Settings] = None, seed: Optional[int] = None, world=None,
+                 profiler: Optional[Profiler] = None,
+                 history: Optional[Callable[[], Dict[str, "np.ndarray"]]] = None):
+        """
+        :param settings: configuration snapshot (defaults to the process-wide one)
+        :param seed: if given, every run started by reset() is reproducible (defaults to settings.seed, -1 = none)
+        :param world: continue with this world (e.g. loaded from a checkpoint) instead of populating one
+        :param profiler: profiler handed to every world (defaults to one configured by the PROFILE settings)
+        :param history: returns the census history series saved with every checkpoint
+                        (defaults to the Simulation's own record of the last HISTORY_TICKS ticks)
+        """
+        self.settings = settings or get_settings()
+        if seed is None and self.settings.seed >= 0:
+            seed = self.settings.seed
+        self.seed = seed
+        self.ticked = Event()
+        self.history = history
+        # Own census record, only kept when nobody else provides the history
+        self.census_history = Telemetry(live=self.HISTORY_TICKS, tiers=()) if history is None else None
+        # History series read from the checkpoint this run was loaded from, if any
+        self.loaded_history: Dict[str, "np.ndarray"] = {}
+        self.profiler = profiler or Profiler(bool(self.settings.profile), self.settings.profile_capture_every,
+                                             self.settings.profile_capture_ticks, self.settings.profile_path)
+        self.world = world
+        if world is not None:
+            world.profiler = self.profiler
+        self.autosaver = None
+        if self.settings.autosave_ticks > 0 and self.settings.world_engine == "tiled":
+            print("[WARNING] Autosave is not supported by the tiled engine; AUTOSAVE_TICKS is ignored")
+        elif self.settings.autosave_ticks > 0:
+            from src.checkpoint import Autosaver
+            self.autosaver = Autosaver(self, self.settings.autosave_path, self.settings.autosave_ticks,
+                                       history=self.history_series)
+        self.telemetry = None
+        if self.settings.telemetry_path:
+            from src.telemetry import TelemetryWriter
+            self.telemetry = TelemetryWriter(self.settings.telemetry_path)
+            self.ticked += self.telemetry.on_ticked
+        if world is None:
+            self.reset()
+        else:
+            self._record_census()
+
+    @classmethod
+    def load(cls, path, settings: Optional[Settings] = None) -> "Simulation":
+        """
+        Resume a run from a checkpoint directory written by save() or by the autosave.
+        """
+        from src.checkpoint import load_checkpoint
+        world, manifest, history = load_checkpoint(path, settings)
+        simulation = cls(world.settings, seed=manifest["seed"], world=world)
+        if simulation.census_history is not None and history:
+            simulation.census_history.restore(history)
+        simulation.loaded_history = history
+        return simulation
+
+    def save(self, path, history: Optional[Dict[str, "np.ndarray"]] = None):
+        """
+        Write a checkpoint of the current world and random generator states.
+        :param history: census history series to store (defaults to history_series())
+        """
+        from src.checkpoint import save_checkpoint
+        save_checkpoint(self.world, Path(path), self.seed, self.history_series() if history is None else history)
+
+    def history_series(self) -> Dict[str, "np.ndarray"]:
+        """
+        The census history to checkpoint: the provider's, or the Simulation's own record.
+        """
+        if self.history is not None:
+            return self.history()
+        return self.census_history.history()
+
+    def _record_census(self):
+        if self.census_history is not None:
+            self.census_history.record(self.world.census)
+
+    def reset(self, settings: Optional[Settings] = None):
+        """
+        Build and populate a fresh world; with a seed its random streams restart from it.
+        """
+        if settings is not None:
+            self.settings = settings
+        self._close_world()
+        self.world = create_world(self.settings.grid_width, self.settings.grid_height,
+                                  self.settings, seed=self.seed)
+        self.world.profiler = self.profiler
+        self.world.populate_randomly()
+        if self.census_history is not None:
+            self.census_history.clear()
+        self._record_census()
+        self.ticked(self)
+
+    def _close_world(self):
+        if self.world is None:
+            return
+        # Subscriptions made on the world's events end with it
+        self.world.events.close()
+        # Only the tiled engine holds resources (its worker processes)
+        close = getattr(self.world, "close", None)
+        if close is not None:
+            close()
+
+    def close(self):
+        """
+        Release the world's resources and finish any autosave and telemetry writes in progress.
+        """
+        self._close_world()
+        if self.autosaver is not None:
+            self.autosaver.close()
+            self.autosaver = None
+        if self.telemetry is not None:
+            self.ticked -= self.telemetry.on_ticked
+            self.telemetry.close()
+            self.telemetry = None
+
+    @property
+    def tick(self) -> int:
+        return self.world.tick
+
+    @property
+    def census(self):
+        return self.world.census
+
+    def step(self):
+        """
+        Advance the world by one tick and notify the observers.
+        """
+        self.world.update()
+        self._record_census()
+        self.ticked(self)
+
+    def run(self, ticks: int):
+        """
+        Advance the world by ticks ticks as fast as possible.
+        """
+        for _ in range(ticks):
+            self.step()
@@ -0,0 +1,703 @@
+from typing import Optional, List, Tuple
+import numpy as np
+from src.entities import Entity, Plant, Prey, Predator, EMPTY, PLANT, PREY, PREDATOR, FOOD
+from src.config import Settings, get_settings
+from src.neural_net import GenomeArena, NeuralNet, arena_actions, mutate_batch
+from src.census import Census, CensusCounter
+from src.sensors import look, vision_inputs
+from src.growth import sprout
+from src.food import FoodField, remains
+from src.free_cells import FreeCells, sample_free
+from src.neighbours import FreeNeighbours
+from src.rng import RandomService
+from src.event import EventBus
+from src.movement import resolve_moves, turn, FORWARD
+
+TYPE_NAMES = {PLANT: "Plant", PREY: "Prey", PREDATOR: "Predator"}
+
+
+class EntityHandle:
+    """
+    Lightweight reference to an entity slot of a SoAWorld.
+    Exposes the same attributes the object engine's entities do,
+    reading and writing straight through to the column arrays.
+    """
+
+    __slots__ = ("world", "slot")
+
+    def __init__(self, world: "SoAWorld", slot: int):
+        self.world = world
+        self.slot = slot
+
+    @property
+    def type_code(self) -> int:
+        return int(self.world.kind[self.slot])
+
+    @property
+    def type_name(self) -> str:
+        return TYPE_NAMES.get(self.type_code, "")
+
+    @property
+    def x(self) -> int:
+        return int(self.world.x[self.slot])
+
+    @property
+    def y(self) -> int:
+        return int(self.world.y[self.slot])
+
+    @property
+    def energy(self) -> float:
+        return float(self.world.energy[self.slot])
+
+    @energy.setter
+    def energy(self, value: float):
+        self.world.energy[self.slot] = value
+
+    @property
+    def direction(self) -> int:
+        return int(self.world.direction[self.slot])
+
+    @property
+    def alive(self) -> bool:
+        return bool(self.world.alive[self.slot])
+
+    @property
+    def net(self) -> Optional[NeuralNet]:
+        return self.world._net(self.slot)
+
+    def get_position(self):
+        return self.x, self.y
+
+    def die(self, cause: Optional[str] = None):
+        self.world._kill(self.slot, cause)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, EntityHandle) and other.world is self.world and other.slot == self.slot
+
+    def __hash__(self) -> int:
+        return hash((id(self.world), self.slot))
+
+    def __repr__(self) -> str:
+        return f"<{self.type_name or 'Empty'} slot={self.slot} pos=({self.x}, {self.y})>"
+
+
+class SoAWorld:
+    """
+    Structure-of-arrays variant of World.
+    The grid is a pair of NumPy arrays (type code and entity slot per cell) and
+    every entity is a row in a set of typed column arrays instead of a Python object.
+    Offers the same public methods as World so the two engines are interchangeable.
+    """
+
+    # (column name, dtype, value of an empty slot)
+    _COLUMNS = (
+        ("kind", np.int8, EMPTY),
+        ("x", np.int32, -1),
+        ("y", np.int32, -1),
+        ("energy", np.float32, 0.0),      # energy for creatures, nutrition for plants
+        ("max_energy", np.float32, 0.0),
+        ("direction", np.int8, 0),        # 0=Up, 1=Right, 2=Down, 3=Left
+        ("cooldown", np.int32, 0),        # reproduction cooldown or plant maturity
+        ("cooldown_max", np.int32, 0),
+        ("repro_threshold", np.float32, 0.0),
+        ("alive", np.bool_, False),
+        ("genome", np.int32, -1),         # row of the creature's net in the genome arena, -1 for none
+    )
+
+    def __init__(self, width: int, height: int, settings: Optional[Settings] = None, capacity: int = 1024,
+                 seed: Optional[int] = None):
+        """
+        :param width: number of columns in the grid
+        :param height: number of rows in the grid
+        :param settings: configuration snapshot (defaults to the process-wide one)
+        :param capacity: initial number of entity slots (grows on demand)
+        :param seed: seed of the world's random streams (an int, a SeedSequence or None)
+        """
+        self.width = width
+        self.height = height
+        self.settings = settings or get_settings()
+        self.rng = RandomService(seed)
+
+        # Occupancy grid: type code and slot index of the entity in each cell
+        self.grid_type = np.zeros((height, width), dtype=np.int8)
+        self.grid_slot = np.full((height, width), -1, dtype=np.int32)
+
+        # Leftover food per cell, shown as FOOD in grid_type where nobody stands on it
+        self.food = FoodField(width, height, self.settings)
+
+        # Which neighbours of each cell are free, kept current on every spawn, move and removal
+        self.free_neighbours = FreeNeighbours(width, height)
+        # The EMPTY cells themselves, for drawing spawn cells without scanning the grid
+        self.free_cells = FreeCells(width, height)
+
+        # Per-entity column arrays
+        self.capacity = 0
+        self.size = 0  # high-water mark of used slots
+        for name, dtype, empty in self._COLUMNS:
+            setattr(self, name, np.full(0, empty, dtype=dtype))
+        self.genomes = GenomeArena(input_size=8, hidden_size=10, output_size=4, capacity=capacity)
+        self._free_slots: List[int] = []
+        self._grow(capacity)
+
+        # Live population counters and the snapshot published after each tick
+        self.tick = 0
+        self.census_counter = CensusCounter()
+        self.census = Census()
+
+        # Optional src.profiler.Profiler, set by the Simulation
+        self.profiler = None
+
+        # Batched world events ("sprouted", "died"), dispatched at the end of every phase
+        self.events = EventBus()
+
+        # Shuffled living slots of the current tick and their type codes
+        self._order = np.zeros(0, dtype=np.int64)
+        self._order_kinds = np.zeros(0, dtype=np.int8)
+
+
+    # ------------------------------------------------------------------
+    # Slot management
+    # ------------------------------------------------------------------
+
+    def _grow(self, new_capacity: int):
+        """
+        Enlarge every column array to new_capacity slots.
+        """
+        for name, dtype, empty in self._COLUMNS:
+            old = getattr(self, name)
+            column = np.full(new_capacity, empty, dtype=dtype)
+            column[:len(old)] = old
+            setattr(self, name, column)
+        self.capacity = new_capacity
+
+    def _acquire_slot(self) -> int:
+        if self._free_slots:
+            return self._free_slots.pop()
+        if self.size == self.capacity:
+            self._grow(max(1024, self.capacity * 2))
+        slot = self.size
+        self.size += 1
+        return slot
+
+    def _release_slot(self, slot: int):
+        if self.genome[slot] >= 0:
+            self.genomes.free(int(self.genome[slot]))
+        for name, dtype, empty in self._COLUMNS:
+            getattr(self, name)[slot] = empty
+        self._free_slots.append(slot)
+
+    def _spawn(self, kind: int, x: int, y: int, energy: float = 0.0, max_energy: float = 0.0,
+               direction: int = 0, cooldown: int = 0, cooldown_max: int = 0,
+               repro_threshold: float = 0.0, net: Optional[NeuralNet] = None) -> int:
+        """
+        Store a new entity in a free slot and place it on the (empty) cell x, y.
+        """
+        slot = self._acquire_slot()
+        self.kind[slot] = kind
+        self.x[slot] = x
+        self.y[slot] = y
+        self.energy[slot] = energy
+        self.max_energy[slot] = max_energy
+        self.direction[slot] = direction
+        self.cooldown[slot] = cooldown
+        self.cooldown_max[slot] = cooldown_max
+        self.repro_threshold[slot] = repro_threshold
+        self.alive[slot] = True
+        self.genome[slot] = -1 if net is None else self.genomes.adopt(net).slot
+        if self.grid_type[y, x] == EMPTY:
+            self._cell_taken(x, y)
+        self.grid_type[y, x] = kind
+        self.grid_slot[y, x] = slot
+        self.census_counter.added(kind)
+        return slot
+
+    def _kill(self, slot: int, cause: Optional[str] = None):
+        """
+        Mark an entity as dead. As in World, the body keeps its cell until
+        cleanup, which frees the cell and recycles the slot.
+        """
+        if not self.alive[slot]:
+            return
+        self.alive[slot] = False
+        self.census_counter.removed(self.kind[slot])
+        self.census_counter.died(cause)
+        x, y = self.x[slot], self.y[slot]
+        if self.events.wants("died"):
+            self.events.publish("died", (cause, self.kind[slot:slot + 1].astype(np.int64),
+                                         np.array([x], dtype=np.int64), np.array([y], dtype=np.int64)))
+        if cause is not None and self.kind[slot] != PLANT:
+            self.food.drop(x, y, remains(self.kind[slot], self.energy[slot], cause, self.settings))
+
+    def _kill_many(self, slots: np.ndarray, cause: Optional[str] = None):
+        """
+        Vectorized _kill for slots that are alive.
+        """
+        if len(slots) == 0:
+            return
+        self.alive[slots] = False
+        for kind, n in enumerate(np.bincount(self.kind[slots], minlength=5)):
+            if n:
+                self.census_counter.removed(kind, int(n))
+        self.census_counter.died(cause, len(slots))
+        ys, xs = self.y[slots], self.x[slots]
+        if self.events.wants("died"):
+            self.events.publish("died", (cause, self.kind[slots].astype(np.int64), xs.astype(np.int64),
+                                         ys.astype(np.int64)))
+        self.food.drop(xs, ys, remains(self.kind[slots], self.energy[slots], cause, self.settings))
+
+    def _vacate(self, x: int, y: int):
+        """
+        Free a cell: it reads FOOD if food lies there, EMPTY otherwise.
+        """
+        self.grid_slot[y, x] = -1
+        if self.food.amount[y, x] > 0:
+            self.grid_type[y, x] = FOOD
+        else:
+            self.grid_type[y, x] = EMPTY
+            self._cell_freed(x, y)
+
+    def _vacate_many(self, xs: np.ndarray, ys: np.ndarray):
+        """
+        _vacate() for distinct cells.
+        """
+        freed = self.food.amount[ys, xs] <= 0
+        self.grid_type[ys, xs] = np.where(freed, EMPTY, FOOD)
+        self.grid_slot[ys, xs] = -1
+        self._cells_freed(xs[freed], ys[freed])
+
+    def _cell_taken(self, x: int, y: int):
+        """
+        Keep the free-cell structures current: the EMPTY cell x, y was taken.
+        """
+        self.free_neighbours.occupy(x, y)
+        self.free_cells.discard(y * self.width + x)
+
+    def _cell_freed(self, x: int, y: int):
+        self.free_neighbours.release(x, y)
+        self.free_cells.add(y * self.width + x)
+
+    def _cells_taken(self, xs: np.ndarray, ys: np.ndarray):
+        self.free_neighbours.occupy_many(xs, ys)
+        self.free_cells.discard_many(ys * self.width + xs)
+
+    def _cells_freed(self, xs: np.ndarray, ys: np.ndarray):
+        self.free_neighbours.release_many(xs, ys)
+        self.free_cells.add_many(ys * self.width + xs)
+
+    def _relocate(self, slot: int, new_x: int, new_y: int):
+        old_x, old_y = self.x[slot], self.y[slot]
+        self._vacate(old_x, old_y)
+        if self.grid_type[new_y, new_x] == EMPTY:
+            self._cell_taken(new_x, new_y)
+        self.grid_type[new_y, new_x] = self.kind[slot]
+        self.grid_slot[new_y, new_x] = slot
+        self.x[slot] = new_x
+        self.y[slot] = new_y
+
+    def _relocate_many(self, slots: np.ndarray, new_x: np.ndarray, new_y: np.ndarray):
+        """
+        Vectorized _relocate for distinct target cells that none of the movers start on.
+        """
+        self._vacate_many(self.x[slots], self.y[slots])
+        taken = self.grid_type[new_y, new_x] == EMPTY
+        self._cells_taken(new_x[taken], new_y[taken])
+        self.grid_type[new_y, new_x] = self.kind[slots]
+        self.grid_slot[new_y, new_x] = slots
+        self.x[slots] = new_x
+        self.y[slots] = new_y
+
+    def _slot_of(self, entity) -> int:
+        if isinstance(entity, EntityHandle):
+            return entity.slot
+        return int(entity)
+
+    # ------------------------------------------------------------------
+    # World interface shared with the object engine
+    # ------------------------------------------------------------------
+
+    @property
+    def occupancy(self) -> np.ndarray:
+        """
+        Type-code grid, under the same name World uses for its mirror.
+        """
+        return self.grid_type
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get_entity(self, x: int, y: int) -> Optional[EntityHandle]:
+        if not self.in_bounds(x, y):
+            return None
+        slot = self.grid_slot[y, x]
+        if slot < 0:
+            return None
+        return EntityHandle(self, int(slot))
+
+    def add_entity(self, entity: Entity) -> bool:
+        """
+        Copies the state of an entity object into a free slot if its cell is free.
+        Returns True if successful, False otherwise.
+        """
+        x, y = entity.x, entity.y
+        if not self.in_bounds(x, y):
+            return False
+
+        if self.grid_type[y, x] != EMPTY:
+            # Cell is occupied
+            return False
+
+        if isinstance(entity, Plant):
+            self._spawn(PLANT, x, y, energy=entity.nutrition_value, cooldown=entity.ticks_to_mature)
+        elif isinstance(entity, Prey):
+            self._spawn(PREY, x, y, energy=entity.energy, max_energy=entity.max_energy,
+                        direction=entity.direction, cooldown=entity.reproduction_cooldown,
+                        cooldown_max=entity.reproduction_cooldown_max,
+                        repro_threshold=entity.reproduction_energy_threshold, net=entity.net)
+        elif isinstance(entity, Predator):
+            self._spawn(PREDATOR, x, y, energy=entity.energy, max_energy=entity.max_energy,
+                        direction=entity.direction, cooldown=entity.reproduction_cooldown, net=entity.net)
+        else:
+            return False
+        return True
+
+    def remove_entity(self, entity: EntityHandle):
+        """
+        Removes entity from the grid and recycles its slot.
+        """
+        slot = self._slot_of(entity)
+        if self.kind[slot] == EMPTY:
+            return
+        self._kill(slot)
+        x, y = self.x[slot], self.y[slot]
+        if self.grid_slot[y, x] == slot:
+            self._vacate(x, y)
+        self._release_slot(slot)
+
+    def move_entity(self, entity: EntityHandle, new_x: int, new_y: int) -> bool:
+        """
+        Tries to move an entity to a new position. Returns True if moved, False otherwise.
+        """
+        if not self.in_bounds(new_x, new_y):
+            return False
+        if self.grid_type[new_y, new_x] not in (EMPTY, FOOD):
+            # Occupied (food can be walked onto)
+            return False
+        self._relocate(self._slot_of(entity), new_x, new_y)
+        return True
+
+    @property
+    def entities(self) -> List[EntityHandle]:
+        """
+        Handles for every living entity (built on demand, not used by the tick).
+        """
+        return [EntityHandle(self, int(s)) for s in np.flatnonzero(self.alive[:self.size])]
+
+    # ------------------------------------------------------------------
+    # Tick
+    # ------------------------------------------------------------------
+
+    def update(self):
+        """
+        Main per-tick update for the world:
+        1. Shuffle the living slots
+        2. Update plants, food, predators and prey, each as a batch
+        3. Move every creature at once (see src.movement)
+        4. Recycle the slots of entities that died
+        5. Maybe spawn a random plant
+        6. Publish the census for this tick
+        """
+        self.tick += 1
+        if self.profiler is not None and self.profiler.enabled:
+            self.profiler.run_tick(self)
+            return
+        for _, phase in self.phases():
+            phase()
+            self.events.flush()
+
+    def phases(self):
+        """
+        The steps of one tick, in order, as (name, callable) pairs.
+        update() runs them all; benchmarks time them one by one.
+        """
+        return [
+            ("shuffle", self._shuffle_phase),
+            ("plants", lambda: self._update_plants(self._order[self._order_kinds == PLANT])),
+            ("food", self._decay_food),
+            ("predators", lambda: self._update_predators(self._order[self._order_kinds == PREDATOR])),
+            ("prey", lambda: self._update_prey(self._order[self._order_kinds == PREY])),
+            ("move", self._move_phase),
+            ("cleanup", self._cleanup),
+            ("spawn", self._spawn_phase),
+            ("census", self._publish_census),
+        ]
+
+    def _shuffle_phase(self):
+        # 1) Shuffle entities
+        self._order = self.rng.ordering.permutation(np.flatnonzero(self.alive[:self.size]))
+        self._order_kinds = self.kind[self._order]
+
+    def _spawn_phase(self):
+        if self.rng.placement.random() <= self.settings.random_plant_perc:
+            self.add_plant()
+
+    def _publish_census(self):
+        """
+        Energy totals per type come from a single weighted bincount over the columns.
+        """
+        live = self.alive[:self.size]
+        totals = np.bincount(self.kind[:self.size], weights=np.where(live, self.energy[:self.size], 0.0),
+                             minlength=5)
+        self.census_counter.energy_total = totals.tolist()
+        self.census_counter.counts[FOOD] = self.food.count
+        self.census_counter.food_mass = self.food.mass
+        self.census = self.census_counter.snapshot(self.tick)
+
+    def _update_plants(self, slots: np.ndarray):
+        growing = slots[self.cooldown[slots] < self.settings.plant_tick_to_mature]
+        self.cooldown[growing] += 1
+
+        mature = slots[self.cooldown[slots] >= self.settings.plant_tick_to_mature]
+        reproducing = mature[self.rng.plant_growth.random(len(mature)) <= self.settings.plant_perc_new]
+        if len(reproducing) == 0:
+            return
+        grid_type, row_offset = self._padded_grid()
+        xs, ys = sprout(grid_type, self.x[reproducing], self.y[reproducing], self.rng.plant_growth, row_offset)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self._spawn(PLANT, x, y, energy=1)
+        self.events.publish("sprouted", (xs, ys))
+
+    def _net(self, slot: int) -> Optional[NeuralNet]:
+        """
+        The net of the creature in slot, as a view of its arena row.
+        """
+        row = self.genome[slot]
+        return None if row < 0 else self.genomes.net(int(row))
+
+    def _padded_grid(self):
+        """
+        The type grid plus any visible rows around it (see StripWorld), and the row holding y = 0.
+        """
+        return self.grid_type, 0
+
+    def _decay_food(self):
+        expired = self.food.decay()
+        if len(expired):
+            cells = self.grid_type.ravel()
+            freed = expired[cells[expired] == FOOD]
+            cells[freed] = EMPTY
+            self._cells_freed(freed % self.width, freed // self.width)
+            self.census_counter.died("decayed", len(expired))
+
+    def _update_predators(self, slots: np.ndarray):
+        self.energy[slots] -= 0.2  # example idle cost
+        starved = self.energy[slots] <= 0
+        self._kill_many(slots[starved], "starved")
+        slots = slots[~starved]
+        cooling = slots[self.cooldown[slots] > 0]
+        self.cooldown[cooling] -= 1
+
+    def _update_prey(self, slots: np.ndarray):
+        # (1) Idle energy consumption and starvation
+        self.energy[slots] -= 0.1
+        starved = self.energy[slots] <= 0
+        self._kill_many(slots[starved], "starved")
+        slots = slots[~starved]
+
+        # (2) Reproduction
+        cooldown = self.cooldown[slots]
+        self.cooldown[slots[cooldown > 0]] -= 1
+        ready = slots[(cooldown <= 0) & (self.energy[slots] >= self.repro_threshold[slots])]
+        child_nets = []
+        for slot in ready:
+            child_net = self._reproduce_prey(int(slot))
+            if child_net is not None:
+                child_nets.append(child_net)
+        # Mutate every newborn's genome with one bulk draw
+        if child_nets:
+            mutate_batch(child_nets, self.settings.mutation_rate, self.settings.mutation_stddev, self.rng.mutation)
+
+    def _move_phase(self):
+        """
+        Every living creature states an intent in one batched net pass; the
+        conflicts are resolved in bulk in update order, then all moves, meals
+        and kills are applied at once.
+        """
+        slots = self._order[self._order_kinds != PLANT]
+        slots = slots[self.alive[slots]]
+        if len(slots) == 0:
+            return
+        grid_type, row_offset = self._padded_grid()
+        actions = self._decide_actions(slots, grid_type, row_offset)
+        directions = turn(self.direction[slots].astype(np.int64), actions)
+        self.direction[slots] = directions
+        moves = resolve_moves(grid_type, self.kind[slots], self.x[slots], self.y[slots], directions, actions,
+                              row_offset, self.height)
+        if self.profiler is not None and self.profiler.enabled:
+            forward = actions == FORWARD
+            forward[moves.victims] = False
+            thinkers = int(np.count_nonzero(self.genome[slots] >= 0))
+            self.profiler.count_moves(thinkers, int(forward.sum()), len(moves.movers) + len(moves.leaving))
+
+        # Predators get the share of the prey's energy that is not left behind as food
+        victims, eaters = slots[moves.victims], slots[moves.eaters]
+        np.add.at(self.energy, eaters, (1.0 - self.settings.food_eaten_perc) * self.energy[victims])
+        self._kill_many(victims, "eaten")
+
+        movers = slots[moves.movers]
+        grazers = movers[moves.ate_plant]
+        plants = self.grid_slot[moves.new_y[moves.ate_plant], moves.new_x[moves.ate_plant]]
+        self.energy[grazers] = np.minimum(self.max_energy[grazers], self.energy[grazers] + self.energy[plants])
+        self._kill_many(plants, "eaten")
+        self._relocate_many(movers, moves.new_x, moves.new_y)
+
+        # Overfed predators leave the excess as food in the cell they end up in
+        fed = np.unique(eaters)
+        excess = self.energy[fed] - self.max_energy[fed]
+        overfed = fed[excess > 0]
+        self.food.drop(self.x[overfed], self.y[overfed], excess[excess > 0])
+        self.energy[overfed] = self.max_energy[overfed]
+
+        self._emigrate(slots[moves.leaving], moves.leave_x, moves.leave_y)
+
+    def _emigrate(self, slots: np.ndarray, xs: np.ndarray, ys: np.ndarray):
+        """
+        Hook for creatures heading for a cell beyond the local rows; a whole world has none.
+        """
+
+    def _decide_actions(self, slots: np.ndarray, grid_type: np.ndarray, row_offset: int = 0) -> np.ndarray:
+        """
+        Run the neural nets of all given creatures in one batched pass and return
+        the chosen action per slot. Creatures without a net stay still (action 0).
+        :param grid_type: type grid the creatures see, as returned by _padded_grid()
+        :param row_offset: row of grid_type holding y = 0
+        """
+        actions = np.zeros(len(slots), dtype=np.int64)
+        has_net = self.genome[slots] >= 0
+        thinkers = slots[has_net]
+        if len(thinkers) == 0:
+            return actions
+
+        cooldown_max = self.cooldown_max[thinkers]
+        inputs = np.zeros((len(thinkers), 8), dtype=np.float32)
+        inputs[:, 0] = self.energy[thinkers] / self.max_energy[thinkers]
+        inputs[:, 1] = np.divide(self.cooldown[thinkers], cooldown_max,
+                                 out=np.zeros(len(thinkers)), where=cooldown_max > 0)
+        inputs[:, 2:] = vision_inputs(grid_type, self.x[thinkers], self.y[thinkers] + row_offset,
+                                      self.direction[thinkers], self.settings.view_range)
+        actions[has_net] = arena_actions(self.genomes, self.genome[thinkers], inputs)
+        return actions
+
+    def look_around(self, entity) -> tuple:
+        """
+        Vision inputs (left/front/right type and distance) for a single creature.
+        """
+        slot = self._slot_of(entity)
+        return look(self.grid_type, int(self.x[slot]), int(self.y[slot]), int(self.direction[slot]),
+                    self.settings.view_range)
+
+    def _free_neighbour(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """
+        A random free cell around x, y for a newborn, or None if there is none.
+        """
+        return self.free_neighbours.pick(x, y, self.rng.reproduction)
+
+    def _reproduce_prey(self, slot: int) -> Optional[NeuralNet]:
+        """
+        Place a child next to the prey in slot. Returns the child's (not yet mutated) net.
+        """
+        cell = self._free_neighbour(int(self.x[slot]), int(self.y[slot]))
+        if cell is None:
+            return None  # No space to reproduce
+        child_x, child_y = cell
+
+        child_net = None
+        parent_net = self._net(slot)
+        if parent_net:
+            # One row copy within the genome arena
+            child_net = parent_net.clone()
+
+        self.energy[slot] *= 0.5
+        self.cooldown[slot] = self.cooldown_max[slot]
+        self._spawn(PREY, child_x, child_y, energy=self.energy[slot], max_energy=self.max_energy[slot],
+                    cooldown=self.cooldown_max[slot], cooldown_max=self.cooldown_max[slot],
+                    repro_threshold=self.repro_threshold[slot], net=child_net)
+        return child_net
+
+    def _cleanup(self):
+        """
+        Free the cells of every entity that died during this tick and recycle their slots.
+        """
+        dead = np.flatnonzero(~self.alive[:self.size] & (self.kind[:self.size] != EMPTY))
+        # Eaten bodies are already covered by their eaters
+        xs, ys = self.x[dead], self.y[dead]
+        own = self.grid_slot[ys, xs] == dead
+        self._vacate_many(xs[own], ys[own])
+        rows = self.genome[dead]
+        self.genomes.free_many(rows[rows >= 0])
+        for name, dtype, empty in self._COLUMNS:
+            getattr(self, name)[dead] = empty
+        self._free_slots.extend(dead.tolist())
+
+    # ------------------------------------------------------------------
+    # Spawning and drawing
+    # ------------------------------------------------------------------
+
+    def add_plant(self):
+        """
+        Place a plant on a uniformly random free cell, if there is one (one draw, no retries).
+        """
+        cell = self.free_cells.sample(self.rng.placement)
+        if cell is not None:
+            y, x = divmod(cell, self.width)
+            self._spawn(PLANT, x, y, energy=1)
+
+    def _spawn_initial_prey(self, x: int, y: int) -> int:
+        return self._spawn(PREY, x, y, energy=self.settings.prey_initial, max_energy=self.settings.prey_max,
+                           cooldown=100, cooldown_max=100, repro_threshold=15.0,
+                           net=NeuralNet(input_size=8, hidden_size=10, output_size=4, rng=self.rng.genome,
+                                         arena=self.genomes))
+
+    def _spawn_initial_predator(self, x: int, y: int) -> int:
+        return self._spawn(PREDATOR, x, y, energy=self.settings.predator_initial,
+                           max_energy=self.settings.predator_max, cooldown=120,
+                           net=NeuralNet(input_size=8, hidden_size=10, output_size=4, rng=self.rng.genome,
+                                         arena=self.genomes))
+
+    def populate_randomly(self):
+        """
+        Place the configured number of plants, prey, and predators in random free cells.
+        """
+        num_plants = self.settings.initial_plants
+        num_preys = self.settings.initial_preys
+        num_preds = self.settings.initial_predators
+
+        # Distinct random free cells drawn in one go: exact counts unless the grid fills up
+        cells = sample_free(self.grid_type, num_plants + num_preys + num_preds, self.rng.placement)
+        ys, xs = np.divmod(cells, self.width)
+        kinds = [PLANT] * num_plants + [PREY] * num_preys + [PREDATOR] * num_preds
+        # Take the cells out of the free-cell structures in one batch; _spawn then finds them taken
+        self.grid_type[ys, xs] = kinds[:len(cells)]
+        self._cells_taken(xs, ys)
+        for x, y, kind in zip(xs.tolist(), ys.tolist(), kinds):
+            if kind == PLANT:
+                self._spawn(PLANT, x, y, energy=1)
+            elif kind == PREY:
+                self._spawn_initial_prey(x, y)
+            else:
+                self._spawn_initial_predator(x, y)
+
+        # The initial placement does not count as births
+        self.census_counter.reset_flows()
+        self._publish_census()
+
+    def num_plant(self):
+        return self.census_counter.counts[PLANT]
+
+    def num_prey(self):
+        return self.census_counter.counts[PREY]
+
+    def num_predator(self):
+        return self.census_counter.counts[PREDATOR]
+
+    def num_food(self):
+        return self.census_counter.counts[FOOD]
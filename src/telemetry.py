@@ -0,0 +1,195 @@
+"""
+Census time series: bounded in memory, unbounded on disk.
+
+Telemetry keeps the latest census values in fixed-size ring buffers for the
+live graphs, plus downsampled tiers (the mean of every 10, 100, 1000 ... ticks)
+for long-range plots, so memory stays flat however long a run lasts.
+
+TelemetryWriter appends every census row to a columnar store on disk from a
+background thread: a directory with one raw float64 file per column and a
+telemetry.json manifest holding the column names and the row count.
+load_telemetry() maps the columns back with np.memmap for offline analysis,
+without reading them into memory.
+"""
+import dataclasses
+import json
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from src.census import Census
+from src.ringbuffer import RingBuffer
+
+COLUMNS = tuple(field.name for field in dataclasses.fields(Census))
+MANIFEST = "telemetry.json"
+DTYPE = "<f8"
+
+
+def census_row(census: Census) -> np.ndarray:
+    """
+    The census as one float64 row, in COLUMNS order.
+    """
+    return np.array([getattr(census, name) for name in COLUMNS], dtype=np.float64)
+
+
+class Telemetry:
+    """
+    In-memory census history: the last `live` rows at full resolution, and for
+    each tier the last `tier_capacity` means of `every` consecutive rows.
+    """
+
+    def __init__(self, live: int = 100, tiers: Sequence[int] = (10, 100, 1000), tier_capacity: int = 1000):
+        """
+        :param live: number of most recent ticks kept at full resolution
+        :param tiers: downsampling factors, in ticks per stored point
+        :param tier_capacity: number of points kept per tier
+        """
+        self.live: Dict[str, RingBuffer] = {name: RingBuffer(live) for name in COLUMNS}
+        self.tiers: Dict[int, Dict[str, RingBuffer]] = {
+            every: {name: RingBuffer(tier_capacity) for name in COLUMNS} for every in tiers
+        }
+        self._sums = {every: np.zeros(len(COLUMNS)) for every in tiers}
+        self._seen = {every: 0 for every in tiers}
+
+    def record(self, census: Census):
+        row = census_row(census)
+        for buffer, value in zip(self.live.values(), row.tolist()):
+            buffer.append(value)
+        for every, sums in self._sums.items():
+            sums += row
+            self._seen[every] += 1
+            if self._seen[every] == every:
+                point = sums / every
+                point[0] = row[0]  # a point is labelled with the last tick it covers
+                for buffer, value in zip(self.tiers[every].values(), point.tolist()):
+                    buffer.append(value)
+                sums[:] = 0
+                self._seen[every] = 0
+
+    def series(self, name: str, every: int = 1) -> np.ndarray:
+        """
+        Values of one column, oldest first: full resolution, or the tier of the given factor.
+        """
+        buffers = self.live if every == 1 else self.tiers[every]
+        return buffers[name].values()
+
+    def history(self) -> Dict[str, np.ndarray]:
+        """
+        The full-resolution series of every column, as stored in a checkpoint.
+        """
+        return {name: buffer.values() for name, buffer in self.live.items()}
+
+    def restore(self, history: Dict[str, np.ndarray]):
+        """
+        Refill the full-resolution series from a checkpoint's history (tiers start over).
+        """
+        self.clear()
+        for name, values in history.items():
+            buffer = self.live.get(name)
+            if buffer is not None:
+                for value in np.asarray(values)[-buffer.capacity:].tolist():
+                    buffer.append(value)
+
+    def clear(self):
+        for buffers in (self.live, *self.tiers.values()):
+            for buffer in buffers.values():
+                buffer.clear()
+        for every in self._sums:
+            self._sums[every][:] = 0
+            self._seen[every] = 0
+
+
+class TelemetryWriter:
+    """
+    Streams census rows to a columnar store on disk. Rows are gathered in
+    chunks; the tick thread only copies a full chunk into a queue, and a
+    background thread appends it to the column files and updates the manifest.
+    Opening a path that already holds a store starts it over.
+    """
+
+    def __init__(self, path, chunk_rows: int = 1024):
+        """
+        :param path: directory of the store
+        :param chunk_rows: rows gathered before a write
+        """
+        self.path = Path(path)
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self._chunk = np.zeros((chunk_rows, len(COLUMNS)), dtype=np.float64)
+        self._filled = 0
+        self.path.mkdir(parents=True, exist_ok=True)
+        for name in COLUMNS:
+            (self.path / f"{name}.f8").write_bytes(b"")
+        self._write_manifest(0)
+        self._pending: "queue.Queue[Optional[np.ndarray]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, name="life-of-py-telemetry", daemon=True)
+        self._thread.start()
+
+    def on_ticked(self, simulation):
+        """
+        Event handler for Simulation.ticked.
+        """
+        self.append(simulation.census)
+
+    def append(self, census: Census):
+        self._chunk[self._filled] = census_row(census)
+        self._filled += 1
+        if self._filled == self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        Hand the rows gathered so far to the writer thread.
+        """
+        if self._filled:
+            self._pending.put(self._chunk[:self._filled].copy())
+            self._filled = 0
+
+    def _write_manifest(self, rows: int):
+        tmp = self.path / (MANIFEST + ".tmp")
+        tmp.write_text(json.dumps({"columns": list(COLUMNS), "dtype": DTYPE, "rows": rows}, indent=2))
+        os.replace(tmp, self.path / MANIFEST)
+
+    def _write_loop(self):
+        while True:
+            chunk = self._pending.get()
+            try:
+                if chunk is None:
+                    return
+                # Column-major copy, so every column is one contiguous write
+                for name, column in zip(COLUMNS, np.asfortranarray(chunk).T):
+                    with open(self.path / f"{name}.f8", "ab") as file:
+                        file.write(column.astype(DTYPE, copy=False).tobytes())
+                self.rows += len(chunk)
+                self._write_manifest(self.rows)
+            except OSError as error:
+                print(f"[WARNING] Telemetry write to {self.path} failed: {error}")
+            finally:
+                self._pending.task_done()
+
+    def close(self):
+        """
+        Write the remaining rows and stop the writer thread.
+        """
+        self.flush()
+        self._pending.put(None)
+        self._thread.join()
+
+
+def load_telemetry(path, columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Map the columns of a store written by TelemetryWriter, read-only and without loading them.
+    :param columns: the columns wanted (defaults to all of them)
+    """
+    path = Path(path)
+    manifest = json.loads((path / MANIFEST).read_text())
+    rows = manifest["rows"]
+    result = {}
+    for name in columns or manifest["columns"]:
+        if rows == 0:
+            result[name] = np.zeros(0, dtype=manifest["dtype"])
+        else:
+            result[name] = np.memmap(path / f"{name}.f8", dtype=manifest["dtype"], mode="r", shape=(rows,))
+    return result
@@ -0,0 +1,473 @@
+"""
+Multi-core world engine: the grid is split into horizontal strips, each owned
+by a worker process that keeps its strip's state in a StripWorld (a SoAWorld
+of the strip's rows).
+
+A tick has two parallel rounds around a deterministic exchange:
+
+1. compute: every worker runs the plant, food, predator, prey and move phases
+   on its strip. Vision reads a halo of neighbouring rows copied from the end of
+   the previous tick. Moves and births that would land in another strip are not
+   applied; they are returned as requests, and the source cell stays occupied.
+   Hunting across a strip edge is not possible: there the other strip's
+   creatures act as walls.
+2. exchange: the coordinator walks the requests in priority order (strip order,
+   then the shuffled update order inside the strip) and grants each one whose
+   target cell is still free after the compute round (food does not count), or
+   holds a plant a moving prey can eat. The first request to claim a cell wins, the rest are
+   dropped (a refused mover stays where it is, a refused newborn is lost).
+3. apply: every worker places its granted immigrants, removes its granted
+   emigrants, recycles dead slots and reports its census counters.
+
+World events ("sprouted", "died") happen in the workers: the coordinator tells
+them which topics have subscribers, they send back the matching payloads (in
+world coordinates) with their replies, and the coordinator publishes them on
+its own bus, along with the sprouts it granted across strip edges.
+
+Strip seeds are spawned from the world seed, so a run is reproducible for a
+given seed and worker count.
+"""
+import multiprocessing as mp
+import weakref
+from multiprocessing import shared_memory
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.census import Census, CensusCounter
+from src.config import Settings, get_settings
+from src.entities import EMPTY, PLANT, PREY, PREDATOR, FOOD
+from src.event import EventBus, Subscription
+from src.growth import NEIGHBOUR_OFFSETS
+from src.rng import RandomService
+from src.soa_world import SoAWorld
+
+# State copied with a creature that crosses a strip boundary
+_MOVER_COLUMNS = ("energy", "max_energy", "direction", "cooldown", "cooldown_max", "repro_threshold")
+
+
+class StripWorld(SoAWorld):
+    """
+    The rows [y0, y0 + height) of a larger world, as seen by one worker.
+    Local y coordinates run from 0 to height - 1; halo rows from the
+    neighbouring strips are visible for vision and for boundary moves/births.
+    """
+
+    def __init__(self, width: int, height: int, y0: int, world_height: int,
+                 settings: Optional[Settings] = None, seed=None):
+        """
+        :param y0: global row of the strip's first local row
+        :param world_height: number of rows of the whole world
+        """
+        super().__init__(width, height, settings, seed=seed)
+        self.y0 = y0
+        self.world_height = world_height
+        self.halo_above = np.zeros((0, width), dtype=np.int8)
+        self.halo_below = np.zeros((0, width), dtype=np.int8)
+        # Cross-boundary requests of the current tick, in update order
+        self.outbox: List[tuple] = []
+        # Event payloads the coordinator asked for, as (topic, payload) in world coordinates
+        self.records: List[tuple] = []
+        self._forwarded: Dict[str, Subscription] = {}
+
+    def phases(self):
+        """
+        The local part of a tick; cleanup, spawning and the census run after the exchange.
+        """
+        return [(name, phase) for name, phase in super().phases() if name not in ("cleanup", "spawn", "census")]
+
+    def _cell_type(self, x: int, y: int) -> int:
+        if not 0 <= x < self.width:
+            return -1
+        if 0 <= y < self.height:
+            return int(self.grid_type[y, x])
+        if -len(self.halo_above) <= y < 0:
+            return int(self.halo_above[y, x])
+        if 0 <= y - self.height < len(self.halo_below):
+            return int(self.halo_below[y - self.height, x])
+        return -1
+
+    def _free_neighbour(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        # The rows at the strip edges can also give birth into the halos, which the masks do not cover
+        if 0 < y < self.height - 1:
+            return super()._free_neighbour(x, y)
+        cells = [(x + dx, y + dy) for dx, dy in NEIGHBOUR_OFFSETS if self._cell_type(x + dx, y + dy) == EMPTY]
+        return self.rng.reproduction.choice(cells) if cells else None
+
+    def _claim_halo(self, x: int, y: int, kind: int):
+        """
+        Mark a halo cell as taken so this strip does not send two requests for it.
+        """
+        if y < 0:
+            self.halo_above[y, x] = kind
+        else:
+            self.halo_below[y - self.height, x] = kind
+
+    def _spawn(self, kind: int, x: int, y: int, **state) -> int:
+        if 0 <= y < self.height:
+            return super()._spawn(kind, x, y, **state)
+        self._claim_halo(x, y, kind)
+        self.outbox.append(("birth", x, y + self.y0, kind, state))
+        return -1
+
+    def _emigrate(self, slots: np.ndarray, xs: np.ndarray, ys: np.ndarray):
+        for slot, x, y in zip(slots.tolist(), xs.tolist(), ys.tolist()):
+            kind = int(self.kind[slot])
+            self._claim_halo(x, y, kind)
+            self.outbox.append(("move", x, y + self.y0, kind, slot))
+
+    def _padded_grid(self) -> Tuple[np.ndarray, int]:
+        # Vision and moves see across the strip edges through the halo rows
+        return np.vstack((self.halo_above, self.grid_type, self.halo_below)), len(self.halo_above)
+
+    def forward(self, topics: Sequence[str]):
+        """
+        Collect the payloads of exactly these topics into records, for the coordinator.
+        """
+        for topic in set(self._forwarded) - set(topics):
+            self._forwarded.pop(topic).cancel()
+        for topic in set(topics) - set(self._forwarded):
+            self._forwarded[topic] = self.events.subscribe(topic, partial(self._record, topic))
+
+    def _record(self, topic: str, batch: list):
+        for payload in batch:
+            if topic == "sprouted":
+                # Sprouts across the strip edges are requests; the coordinator reports the granted ones
+                xs, ys = payload
+                local = (ys >= 0) & (ys < self.height)
+                self.records.append((topic, (xs[local], ys[local] + self.y0)))
+            elif payload[0] is not None:
+                # Leaving the strip is not a death
+                cause, kinds, xs, ys = payload
+                self.records.append((topic, (cause, kinds, xs, ys + self.y0)))
+
+    def take_records(self) -> List[tuple]:
+        records, self.records = self.records, []
+        return records
+
+    def compute(self, halo_above: np.ndarray, halo_below: np.ndarray) -> List[tuple]:
+        """
+        Run the local phases of one tick and return the cross-boundary requests.
+        A move request carries the mover's state as of the end of the round.
+        """
+        self.tick += 1
+        self.halo_above, self.halo_below = halo_above, halo_below
+        self.outbox = []
+        for _, phase in self.phases():
+            phase()
+            self.events.flush()
+        requests = []
+        for request in self.outbox:
+            if request[0] == "move":
+                slot = request[4]
+                state = {name: getattr(self, name)[slot].item() for name in _MOVER_COLUMNS}
+                state["net"] = self._net(slot)
+                request = ("move", request[1], request[2], request[3], state, slot)
+            elif request[4].get("net") is not None:
+                # A newborn across the edge has no slot here: its (mutated) net leaves the arena with it
+                request[4]["net"] = request[4]["net"].detach()
+            requests.append(request)
+        return requests
+
+    def apply(self, arrivals: List[tuple], departures: List[int]):
+        """
+        Place the granted immigrants and newborns, drop the granted emigrants, then clean up.
+        :param arrivals: (kind, x, global y, state, moved) per granted request, in priority order
+        :param departures: slots of the local creatures whose move out was granted
+        """
+        for slot in departures:
+            # Leaving is neither a death nor counted as one
+            self._kill(slot)
+        for kind, x, gy, state, moved in arrivals:
+            y = gy - self.y0
+            if moved and self.grid_type[y, x] == PLANT:
+                plant = self.grid_slot[y, x]
+                state["energy"] = min(state["max_energy"], state["energy"] + float(self.energy[plant]))
+                self._kill(plant, "eaten")
+            super()._spawn(kind, x, y, **state)
+            if moved:
+                self.census_counter.births[kind] -= 1
+        self._cleanup()
+        self._publish_census()
+        self.events.flush()
+
+    def populate(self, plants: np.ndarray, prey: np.ndarray, predators: np.ndarray):
+        """
+        Place the initial population on the given local (x, y) cells.
+        """
+        for x, y in plants:
+            self._spawn(PLANT, int(x), int(y), energy=1)
+        for x, y in prey:
+            self._spawn_initial_prey(int(x), int(y))
+        for x, y in predators:
+            self._spawn_initial_predator(int(x), int(y))
+        self.census_counter.reset_flows()
+        self._publish_census()
+
+    def counters(self) -> tuple:
+        counter = self.census_counter
+        return counter.counts, counter.births, counter.deaths, counter.energy_total, counter.food_mass
+
+
+def _strip_worker(conn, width: int, y0: int, y1: int, world_height: int, settings: Settings,
+                  seed_sequence: np.random.SeedSequence, shm_name: str):
+    """
+    Worker process: owns one StripWorld and answers the coordinator's messages.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    grid = np.ndarray((world_height, width), dtype=np.int8, buffer=shm.buf)
+    strip = StripWorld(width, y1 - y0, y0, world_height, settings, seed=seed_sequence)
+    try:
+        while True:
+            message, *args = conn.recv()
+            if message == "stop":
+                break
+            if message == "populate":
+                strip.populate(*args)
+                grid[y0:y1] = strip.grid_type
+                conn.send(strip.counters())
+            elif message == "compute":
+                halo_above, halo_below, topics = args
+                strip.forward(topics)
+                requests = strip.compute(halo_above, halo_below)
+                grid[y0:y1] = strip.grid_type
+                conn.send((requests, strip.take_records()))
+            elif message == "apply":
+                strip.apply(*args)
+                grid[y0:y1] = strip.grid_type
+                conn.send((strip.counters(), strip.take_records()))
+    finally:
+        del grid
+        shm.close()
+        conn.close()
+
+
+def _shutdown(processes, connections, shm):
+    for conn in connections:
+        try:
+            conn.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+    for process in processes:
+        process.join(5)
+        if process.is_alive():
+            process.terminate()
+    for conn in connections:
+        conn.close()
+    shm.close()
+    shm.unlink()
+
+
+class TiledWorld:
+    """
+    Coordinator of the strip workers. Offers the World interface the simulation,
+    renderer, headless runner and benchmarks use (update, phases, occupancy,
+    census, populate_randomly, num_*); entity-level access stays inside the workers.
+    """
+
+    def __init__(self, width: int, height: int, settings: Optional[Settings] = None, seed: Optional[int] = None,
+                 workers: Optional[int] = None):
+        """
+        :param workers: number of strips and worker processes (defaults to TILE_WORKERS)
+        """
+        self.width = width
+        self.height = height
+        self.settings = settings or get_settings()
+        self.workers = max(1, min(workers or self.settings.tile_workers, height))
+        seeds = np.random.SeedSequence(seed).spawn(self.workers + 1)
+        self.rng = RandomService(seeds[-1])
+
+        self.tick = 0
+        self.census_counter = CensusCounter()
+        self.census = Census()
+
+        # Optional src.profiler.Profiler, set by the Simulation
+        self.profiler = None
+
+        # World events, published from the payloads the strips send back
+        self.events = EventBus()
+
+        # The shared occupancy grid: each worker writes only its own rows
+        self._shm = shared_memory.SharedMemory(create=True, size=width * height)
+        self.occupancy = np.ndarray((height, width), dtype=np.int8, buffer=self._shm.buf)
+        self.occupancy[:] = EMPTY
+
+        bounds = np.linspace(0, height, self.workers + 1).astype(int)
+        self.strips = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+        context = mp.get_context("spawn")
+        self._connections = []
+        self._processes = []
+        for (y0, y1), seed_sequence in zip(self.strips, seeds):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_strip_worker,
+                args=(child, width, y0, y1, height, self.settings, seed_sequence, self._shm.name),
+                name=f"life-of-py-strip-{y0}",
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+        self._finalizer = weakref.finalize(self, _shutdown, self._processes, self._connections, self._shm)
+
+        self._counters: List[tuple] = []
+        self._requests: List[List[tuple]] = []
+        self._arrivals: List[List[tuple]] = []
+        self._departures: List[List[int]] = []
+
+    def close(self):
+        """
+        Stop the workers and release the shared grid.
+        """
+        self.occupancy = None
+        self._finalizer()
+
+    def _strip_of(self, y: int) -> int:
+        for index, (y0, y1) in enumerate(self.strips):
+            if y0 <= y < y1:
+                return index
+        raise IndexError(y)
+
+    def _broadcast(self, messages: List[tuple]) -> list:
+        for conn, message in zip(self._connections, messages):
+            conn.send(message)
+        return [conn.recv() for conn in self._connections]
+
+    # ------------------------------------------------------------------
+    # Tick
+    # ------------------------------------------------------------------
+
+    def update(self):
+        """
+        Main per-tick update: compute on every strip, exchange, apply, publish the census.
+        """
+        self.tick += 1
+        if self.profiler is not None and self.profiler.enabled:
+            self.profiler.run_tick(self)
+            return
+        for _, phase in self.phases():
+            phase()
+            self.events.flush()
+
+    def phases(self):
+        """
+        The steps of one tick, in order, as (name, callable) pairs.
+        """
+        return [
+            ("compute", self._compute_phase),
+            ("exchange", self._exchange_phase),
+            ("apply", self._apply_phase),
+            ("census", self._publish_census),
+        ]
+
+    def _topics(self) -> Tuple[str, ...]:
+        """
+        The topics the strips should send payloads for: those with subscribers.
+        """
+        return tuple(topic for topic in ("sprouted", "died") if self.events.wants(topic))
+
+    def _publish_records(self, records: List[tuple]):
+        for topic, payload in records:
+            self.events.publish(topic, payload)
+
+    def _compute_phase(self):
+        view_range = self.settings.view_range
+        topics = self._topics()
+        messages = []
+        for y0, y1 in self.strips:
+            messages.append(("compute",
+                             self.occupancy[max(0, y0 - view_range):y0].copy(),
+                             self.occupancy[y1:min(self.height, y1 + view_range)].copy(),
+                             topics))
+        replies = self._broadcast(messages)
+        self._requests = [requests for requests, _ in replies]
+        for _, records in replies:
+            self._publish_records(records)
+
+    def _exchange_phase(self):
+        """
+        Grant cross-boundary requests first come, first served, against the grid after the compute round.
+        """
+        self._arrivals = [[] for _ in self.strips]
+        self._departures = [[] for _ in self.strips]
+        claimed: Dict[Tuple[int, int], int] = {}
+        # Seedlings that grew across a strip edge
+        sprouts: List[Tuple[int, int]] = []
+        requests = [(source, request) for source, strip_requests in enumerate(self._requests)
+                    for request in strip_requests]
+        # The random plant of this tick comes last
+        if self.rng.placement.random() <= self.settings.random_plant_perc:
+            x, y = self.rng.placement.below(self.width), self.rng.placement.below(self.height)
+            requests.append((None, ("birth", x, y, PLANT, {"energy": 1})))
+
+        for source, (action, x, gy, kind, state, *slot) in requests:
+            occupant = claimed.get((x, gy), int(self.occupancy[gy, x]))
+            moved = action == "move"
+            if occupant != EMPTY and not (moved and (occupant == FOOD or (occupant == PLANT and kind == PREY))):
+                continue
+            claimed[(x, gy)] = kind
+            self._arrivals[self._strip_of(gy)].append((kind, x, gy, state, moved))
+            if moved:
+                self._departures[source].append(slot[0])
+            elif kind == PLANT and source is not None:
+                sprouts.append((x, gy))
+        if sprouts and self.events.wants("sprouted"):
+            xs, ys = np.array(sprouts, dtype=np.int64).T
+            self.events.publish("sprouted", (xs, ys))
+
+    def _apply_phase(self):
+        messages = [("apply", arrivals, departures) for arrivals, departures in zip(self._arrivals, self._departures)]
+        replies = self._broadcast(messages)
+        self._counters = [counters for counters, _ in replies]
+        for _, records in replies:
+            self._publish_records(records)
+
+    def _publish_census(self):
+        """
+        Sum the workers' counters into a single census.
+        """
+        counter = CensusCounter()
+        for counts, births, deaths, energy_total, food_mass in self._counters:
+            counter.counts = [a + b for a, b in zip(counter.counts, counts)]
+            counter.births = [a + b for a, b in zip(counter.births, births)]
+            for cause, n in deaths.items():
+                counter.died(cause, n)
+            counter.energy_total = [a + b for a, b in zip(counter.energy_total, energy_total)]
+            counter.food_mass += food_mass
+        self.census_counter = counter
+        self.census = counter.snapshot(self.tick)
+
+    # ------------------------------------------------------------------
+    # Spawning
+    # ------------------------------------------------------------------
+
+    def populate_randomly(self):
+        """
+        Place the configured populations on distinct random cells, then hand each strip its share.
+        """
+        counts = (self.settings.initial_plants, self.settings.initial_preys, self.settings.initial_predators)
+        total = min(sum(counts), self.width * self.height)
+        cells = self.rng.placement.generator.choice(self.width * self.height, size=total, replace=False)
+        groups = np.split(cells, np.cumsum(counts)[:2].clip(max=total))
+        messages = []
+        for y0, y1 in self.strips:
+            per_kind = []
+            for group in groups:
+                ys, xs = np.divmod(group, self.width)
+                inside = (ys >= y0) & (ys < y1)
+                per_kind.append(np.column_stack((xs[inside], ys[inside] - y0)))
+            messages.append(("populate", *per_kind))
+        self._counters = self._broadcast(messages)
+        self._publish_census()
+
+    def num_plant(self):
+        return self.census_counter.counts[PLANT]
+
+    def num_prey(self):
+        return self.census_counter.counts[PREY]
+
+    def num_predator(self):
+        return self.census_counter.counts[PREDATOR]
+
+    def num_food(self):
+        return self.census_counter.counts[FOOD]
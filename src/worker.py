@@ -0,0 +1,278 @@
+"""
+Simulation in a separate process, decoupled from the renderer (README 4.3, "variable time step").
+
+The worker steps the simulation as fast as it can and, after every tick,
+publishes a snapshot (occupancy grid, census and tick) into one of two slots of
+a shared-memory region. The renderer reads the latest complete slot whenever it
+draws a frame and drives the worker with commands sent over a queue.
+"""
+import atexit
+import dataclasses
+import multiprocessing as mp
+import os
+import queue
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+import numpy as np
+from src.census import Census
+from src.config import Settings
+from src.simulation import Simulation
+
+CENSUS_FIELDS = tuple(field.name for field in dataclasses.fields(Census))
+_INT_FIELDS = frozenset(field.name for field in dataclasses.fields(Census) if field.type in (int, "int"))
+
+# Header: index of the latest complete slot and a publish counter
+_HEADER_WORDS = 2
+# Slot: sequence number (odd while being written), tick, census fields, then the grid
+_SLOT_WORDS = 2 + len(CENSUS_FIELDS)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    A complete, private copy of one published tick. Quacks like a world for the renderer.
+    """
+
+    tick: int
+    census: Census
+    occupancy: np.ndarray
+
+    @property
+    def width(self) -> int:
+        return self.occupancy.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.occupancy.shape[0]
+
+
+class SnapshotBuffer:
+    """
+    Double-buffered snapshot region in shared memory.
+    The single writer always fills the slot that is not the latest one, then
+    flips the latest index; each slot carries a sequence number (a seqlock), so a
+    reader that raced with a writer lapping it twice notices and retries.
+    """
+
+    def __init__(self, width: int, height: int, name: Optional[str] = None):
+        """
+        :param name: attach to an existing region instead of creating one
+        """
+        self.width = width
+        self.height = height
+        grid_bytes = width * height
+        self._slot_bytes = _SLOT_WORDS * 8 + (grid_bytes + 7) // 8 * 8
+        size = _HEADER_WORDS * 8 + 2 * self._slot_bytes
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        buf = self.shm.buf
+        self._header = np.ndarray(_HEADER_WORDS, dtype=np.int64, buffer=buf)
+        self._words = []
+        self._grids = []
+        for slot in range(2):
+            offset = _HEADER_WORDS * 8 + slot * self._slot_bytes
+            self._words.append(np.ndarray(_SLOT_WORDS, dtype=np.float64, buffer=buf, offset=offset))
+            self._grids.append(np.ndarray((height, width), dtype=np.int8, buffer=buf,
+                                          offset=offset + _SLOT_WORDS * 8))
+        if self.owner:
+            self._header[:] = (0, 0)
+            for words in self._words:
+                words[:] = 0
+        self._last_version = -1
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def publish(self, tick: int, census: Census, occupancy: np.ndarray):
+        slot = 1 - int(self._header[0])
+        words = self._words[slot]
+        words[0] += 1  # odd: write in progress
+        words[1] = tick
+        words[2:] = dataclasses.astuple(census)
+        self._grids[slot][:] = occupancy
+        words[0] += 1
+        self._header[0] = slot
+        self._header[1] += 1
+
+    def read(self, force: bool = False, retries: int = 10) -> Optional[Snapshot]:
+        """
+        Copy the latest complete snapshot.
+        :param force: also return it if it was already read
+        :return: None if nothing new was published (or every attempt raced with the writer)
+        """
+        version = int(self._header[1])
+        if version == 0 or (version == self._last_version and not force):
+            return None
+        for _ in range(retries):
+            slot = int(self._header[0])
+            words = self._words[slot]
+            seq = words[0]
+            if int(seq) % 2:
+                continue
+            values = words.copy()
+            occupancy = self._grids[slot].copy()
+            if words[0] == seq:
+                self._last_version = version
+                census = Census(**{
+                    name: int(value) if name in _INT_FIELDS else float(value)
+                    for name, value in zip(CENSUS_FIELDS, values[2:])
+                })
+                return Snapshot(int(values[1]), census, occupancy)
+        return None
+
+    def close(self):
+        # The NumPy views must go before the mapping can be closed
+        self._header = None
+        self._words = []
+        self._grids = []
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _publish(simulation: Simulation, buffer: SnapshotBuffer):
+    world = simulation.world
+    buffer.publish(world.tick, world.census, world.occupancy)
+
+
+def run_worker(settings: Settings, seed: Optional[int], shm_name: str, commands, paused: bool):
+    """
+    Worker process entry point: step, publish, obey commands, until told to stop.
+    """
+    buffer = SnapshotBuffer(settings.grid_width, settings.grid_height, name=shm_name)
+    simulation = Simulation(settings, seed=seed)
+    _publish(simulation, buffer)
+    running = not paused
+    try:
+        while True:
+            # Block while paused; otherwise only drain what is already queued
+            try:
+                command, argument = commands.get(block=not running)
+            except queue.Empty:
+                command, argument = None, None
+            if command == "stop":
+                break
+            elif command == "pause":
+                running = False
+            elif command == "resume":
+                running = True
+            elif command == "step":
+                simulation.step()
+                _publish(simulation, buffer)
+            elif command == "restart":
+                simulation.reset(argument)
+                _publish(simulation, buffer)
+            if running and command is None:
+                simulation.step()
+                _publish(simulation, buffer)
+    finally:
+        if simulation.profiler.enabled:
+            # The GUI only sees frames; the tick timings of this process go to a report of their own
+            simulation.profiler.dump(os.path.join(simulation.settings.profile_path, "worker-profile.json"))
+        simulation.close()
+        buffer.close()
+
+
+class SimulationProcess:
+    """
+    Handle the renderer keeps on a simulation running in a worker process.
+    """
+
+    def __init__(self, settings: Settings, seed: Optional[int] = None, paused: bool = True):
+        """
+        :param paused: start the worker paused (it still publishes the initial population)
+        """
+        self.settings = settings
+        self.seed = seed
+        self.paused = paused
+        self._context = mp.get_context("spawn")
+        self.buffer: Optional[SnapshotBuffer] = None
+        self.process = None
+        self.commands = None
+        self.start()
+
+    def start(self):
+        self.buffer = SnapshotBuffer(self.settings.grid_width, self.settings.grid_height)
+        self.commands = self._context.Queue()
+        self.process = self._context.Process(
+            target=run_worker,
+            args=(self.settings, self.seed, self.buffer.name, self.commands, self.paused),
+            name="life-of-py-simulation",
+            # Not a daemon, so that the tiled engine can start its own workers inside it
+            daemon=False,
+        )
+        self.process.start()
+        atexit.register(self.stop)
+
+    def _send(self, command: str, argument=None):
+        self.commands.put((command, argument))
+
+    def pause(self):
+        self.paused = True
+        self._send("pause")
+
+    def resume(self):
+        self.paused = False
+        self._send("resume")
+
+    def step(self):
+        """
+        Advance exactly one tick; meant to be used while paused.
+        """
+        self._send("step")
+
+    def restart(self, settings: Optional[Settings] = None):
+        """
+        Start over with a fresh world. A different grid size needs a new region, hence a new worker.
+        """
+        settings = settings or self.settings
+        size_changed = (settings.grid_width, settings.grid_height) != self.grid_size
+        self.settings = settings
+        if size_changed:
+            self.stop()
+            self.start()
+        else:
+            self._send("restart", settings)
+
+    @property
+    def grid_size(self) -> Tuple[int, int]:
+        return self.buffer.width, self.buffer.height
+
+    def latest(self, force: bool = False) -> Optional[Snapshot]:
+        """
+        The most recent complete snapshot, or None if nothing new since the last call.
+        """
+        return self.buffer.read(force=force)
+
+    def wait_for_snapshot(self, tick: Optional[int] = None, timeout: float = 30.0) -> Optional[Snapshot]:
+        """
+        Block until the worker publishes (e.g. right after start or restart).
+        :param tick: wait for a snapshot of this tick, skipping older ones
+        :return: None on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            snapshot = self.latest()
+            if snapshot is not None and (tick is None or snapshot.tick == tick):
+                return snapshot
+            if not self.process.is_alive():
+                raise RuntimeError(f"Simulation worker exited with code {self.process.exitcode}")
+            self.process.join(0.005)
+        return None
+
+    def stop(self, timeout: float = 5.0):
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self._send("stop")
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        self.commands.close()
+        self.buffer.close()
+        self.process = None
+        atexit.unregister(self.stop)
@@ -1,74 +1,75 @@
-import random
+import time
 from typing import Optional, List
-import pygame
-from src.entities import Entity, Plant, Prey, Predator, Food
-from src.config import EnvConfig
-from src.neural_net import NeuralNet
-from src.event import Event
-
-class World(pygame.Surface):
+import numpy as np
+from src.entities import Entity, Plant, Prey, Predator, EMPTY, PLANT, PREY, PREDATOR, FOOD
+from src.config import Settings, get_settings
+from src.neural_net import GenomeArena, batch_actions
+from src.soa_world import SoAWorld
+from src.registry import EntityRegistry
+from src.census import Census, CensusCounter
+from src.sensors import look, vision_inputs
+from src.growth import sprout
+from src.food import FoodField, remains
+from src.rng import RandomService
+from src.movement import resolve_moves, turn, FORWARD
+from src.neighbours import FreeNeighbours
+from src.free_cells import FreeCells
+from src.event import EventBus
+
+class World:
     """
     Manages a 2D grid of entities and provides methods for adding,
-    removing, and updating them. Inherits from pygame.Surface.
+    removing, and updating them. Pure simulation state: drawing is done by
+    src.renderer.WorldRenderer, so the world runs without pygame or a display.
     """
 
-    def __init__(self, width: int, height: int, config: Optional[EnvConfig] = None):
+    def __init__(self, width: int, height: int, settings: Optional[Settings] = None, seed: Optional[int] = None):
         """
         :param width: number of columns in the grid
         :param height: number of rows in the grid
-        :param config: optional EnvConfig for loading environment-based parameters
+        :param settings: configuration snapshot shared with every entity (defaults to the process-wide one)
+        :param seed: seed of the world's random streams (None for fresh entropy)
         """
-        super().__init__((width, height))  # Initialize the Surface with the given dimensions
         self.width = width
         self.height = height
-        self.config = config
+        self.settings = settings or get_settings()
+        self.rng = RandomService(seed)
 
         # 2D array (list of lists), each cell can hold a reference to an entity or None
         self.grid: List[List[Optional[Entity]]] = [
             [None for _ in range(width)] for _ in range(height)
         ]
 
-        # Master list of all entities for iteration
-        self.entities = []
+        # Type-code mirror of the grid, read by the vectorized vision sensors
+        self.occupancy = np.zeros((height, width), dtype=np.int8)
 
-        # Define colors for each entity type
-        self.colors = {
-            "Plant": (0, 255, 0),    # Green
-            "Prey": (0, 0, 255),     # Blue
-            "Predator": (255, 0, 0), # Red
-            "Food": (255, 255, 0)    # Yellow
-        }
+        # Leftover food per cell, shown as FOOD in occupancy where nobody stands on it
+        self.food = FoodField(width, height, self.settings)
 
-        Plant.plant_reproduce += self.handle_plant_reproduce
+        # Which neighbours of each cell are free, kept current on every add, move and removal
+        self.free_neighbours = FreeNeighbours(width, height)
+        # The EMPTY cells themselves, for drawing spawn cells without retries
+        self.free_cells = FreeCells(width, height)
 
+        # Ticks each plant has grown, capped at plant_tick_to_mature; meaningless on other cells
+        self.plant_maturity = np.zeros((height, width), dtype=np.int16)
 
-    def handle_plant_reproduce(self, plant):
-        """
-        Handle the plant reproduction event by adding a new plant nearby.
-        """
-        x = plant.x
-        y = plant.y
-        self.add_new_plant_nearby(x, y)
+        # Master registry of all entities: dense list for iteration, O(1) removal
+        self.entities = EntityRegistry()
 
-    def add_new_plant_nearby(self, x: int, y: int):
-        """
-        Attempt to add a new plant near the given coordinates.
-        """
-        directions = [(-1, -1), (-1, 0), (-1, 1),
-                      (0, -1),          (0, 1),
-                      (1, -1),  (1, 0), (1, 1)]
+        # Weights of every creature's net, one row each; rows are freed when their creature is removed
+        self.genomes = GenomeArena(input_size=8, hidden_size=10, output_size=4)
 
-        random.shuffle(directions)  # Randomize the order of directions
+        # Live population counters and the snapshot published after each tick
+        self.tick = 0
+        self.census_counter = CensusCounter()
+        self.census = Census()
 
-        for dx, dy in directions:
-            new_x = x + dx
-            new_y = y + dy
+        # Optional src.profiler.Profiler, set by the Simulation
+        self.profiler = None
 
-            if self.in_bounds(new_x, new_y) and self.grid[new_y][new_x] is None:
-                # Add a new plant at the empty cell
-                new_plant = Plant(new_x, new_y)
-                self.add_entity(new_plant)
-                break  # Stop after placing one new plant
+        # Batched world events ("sprouted", "died"), dispatched at the end of every phase
+        self.events = EventBus()
 
     def in_bounds(self, x: int, y: int) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height
@@ -86,14 +87,39 @@ class World(pygame.Surface):
         if not self.in_bounds(x, y):
             return False
 
-        if self.grid[y][x] is not None:
-            # Cell is occupied
+        if self.occupancy[y, x] != EMPTY:
+            # Cell is occupied (food counts, too)
             return False
 
+        self._adopt_net(entity)
         self.grid[y][x] = entity
-        self.entities.append(entity)
+        self.occupancy[y, x] = entity.type_code
+        self._cell_taken(x, y)
+        if entity.type_code == PLANT:
+            self.plant_maturity[y, x] = entity.ticks_to_mature
+        self.entities.add(entity)
+        self.census_counter.added(entity.type_code)
         return True
 
+    def _add_many(self, entities: List[Entity], cells: np.ndarray):
+        """
+        add_entity() for new entities on distinct free cells, with the grid mirrors updated in bulk.
+        :param cells: flat index of each entity's cell
+        """
+        ys, xs = np.divmod(cells, self.width)
+        kinds = np.array([entity.type_code for entity in entities], dtype=np.int8)
+        for entity in entities:
+            self._adopt_net(entity)
+            self.grid[entity.y][entity.x] = entity
+            self.entities.add(entity)
+        self.occupancy[ys, xs] = kinds
+        plants = kinds == PLANT
+        self.plant_maturity[ys[plants], xs[plants]] = [e.ticks_to_mature for e in entities if e.type_code == PLANT]
+        self._cells_taken(xs, ys)
+        for kind, n in enumerate(np.bincount(kinds, minlength=5).tolist()):
+            if n:
+                self.census_counter.added(kind, n)
+
     def remove_entity(self, entity: Entity):
         """
         Removes entity from the grid. If the entity is in self.entities, remove it from there too.
@@ -101,9 +127,54 @@ class World(pygame.Surface):
         x, y = entity.x, entity.y
         if self.in_bounds(x, y) and self.grid[y][x] == entity:
             self.grid[y][x] = None
+            self._vacate(x, y)
+
+        if self.entities.remove(entity):  # O(1), False if not registered
+            self.census_counter.removed(entity.type_code)
+            if getattr(entity, "net", None) is not None:
+                entity.net.release()
+                entity.net = None
+
+    def _adopt_net(self, entity: Entity):
+        # Nets built elsewhere are copied into this world's arena, so the batched pass can read them from it
+        net = getattr(entity, "net", None)
+        if net is not None and net.arena is not self.genomes:
+            entity.net = self.genomes.adopt(net)
 
-        if entity in self.entities:
-            self.entities.remove(entity)
+    def _vacate(self, x: int, y: int):
+        """
+        Mirror an emptied grid cell in occupancy: FOOD if food lies there, EMPTY otherwise.
+        """
+        if self.food.amount[y, x] > 0:
+            self.occupancy[y, x] = FOOD
+        else:
+            self.occupancy[y, x] = EMPTY
+            self._cell_freed(x, y)
+
+    def _cell_taken(self, x: int, y: int):
+        """
+        Keep the free-cell structures current: the EMPTY cell x, y was taken.
+        """
+        self.free_neighbours.occupy(x, y)
+        self.free_cells.discard(y * self.width + x)
+
+    def _cell_freed(self, x: int, y: int):
+        self.free_neighbours.release(x, y)
+        self.free_cells.add(y * self.width + x)
+
+    def _cells_taken(self, xs: np.ndarray, ys: np.ndarray):
+        self.free_neighbours.occupy_many(xs, ys)
+        self.free_cells.discard_many(ys * self.width + xs)
+
+    def _cells_freed(self, xs: np.ndarray, ys: np.ndarray):
+        self.free_neighbours.release_many(xs, ys)
+        self.free_cells.add_many(ys * self.width + xs)
+
+    def get_by_handle(self, handle: int) -> Optional[Entity]:
+        """
+        Look up a living entity by its registry handle.
+        """
+        return self.entities.get(handle)
 
     def move_entity(self, entity: Entity, new_x: int, new_y: int) -> bool:
         """
@@ -112,16 +183,20 @@ class World(pygame.Surface):
         if not self.in_bounds(new_x, new_y):
             return False
         if self.grid[new_y][new_x] is not None:
-            # Occupied
+            # Occupied (food is not an entity, so it can be walked onto)
             return False
 
         # Clear old position
         old_x, old_y = entity.x, entity.y
         if self.in_bounds(old_x, old_y) and self.grid[old_y][old_x] == entity:
             self.grid[old_y][old_x] = None
+            self._vacate(old_x, old_y)
 
         # Place at new position
+        if self.occupancy[new_y, new_x] == EMPTY:
+            self._cell_taken(new_x, new_y)
         self.grid[new_y][new_x] = entity
+        self.occupancy[new_y, new_x] = entity.type_code
         entity.x, entity.y = new_x, new_y
         return True
 
@@ -129,101 +204,255 @@ class World(pygame.Surface):
         """
         Main per-tick update for the world:
         1. Build a random list of all living entities
-        2. Update each one
-        3. Remove any that died
+        2. Grow and reproduce all plants as grid operations
+        3. Decay the food field
+        4. Update each animal (energy, starvation, reproduction)
+        5. Move every creature at once: batched intents, conflicts resolved in bulk
+        6. Remove any that died, dropping their remains as food
+        7. Publish the census for this tick
         """
-        # 1) Shuffle entities
-        random.shuffle(self.entities)
+        self.tick += 1
+        if self.profiler is not None and self.profiler.enabled:
+            self.profiler.run_tick(self)
+            return
+        for _, phase in self.phases():
+            phase()
+            self.events.flush()
 
-        # 2) Update each entity
+    def phases(self):
+        """
+        The steps of one tick, in order, as (name, callable) pairs.
+        update() runs them all; benchmarks time them one by one.
+        """
+        return [
+            ("shuffle", self._shuffle_phase),
+            ("plants", self._plants_phase),
+            ("food", self._food_phase),
+            ("entities", self._entities_phase),
+            ("move", self._move_phase),
+            ("cleanup", self._cleanup_phase),
+            ("spawn", self._spawn_phase),
+            ("census", self._census_phase),
+        ]
+
+    def _shuffle_phase(self):
+        # 1) Shuffle entities
+        self.entities.shuffle(self.rng.ordering)
+
+    def _plants_phase(self):
+        # 2) Maturity counters, a Bernoulli draw over the mature plants, one seedling per parent;
+        #    crowded plants cannot have one and are left out up front
+        tick_to_mature = self.settings.plant_tick_to_mature
+        maturity = self.plant_maturity
+        np.minimum(maturity + 1, tick_to_mature, out=maturity)
+        mature = np.flatnonzero((self.occupancy == PLANT) & (maturity >= tick_to_mature)
+                                & (self.free_neighbours.mask != 0))
+        reproducing = mature[self.rng.plant_growth.random(len(mature)) <= self.settings.plant_perc_new]
+        if len(reproducing) == 0:
+            return
+        xs, ys = sprout(self.occupancy, reproducing % self.width, reproducing // self.width, self.rng.plant_growth)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.add_entity(Plant(x, y, settings=self.settings))
+        self.events.publish("sprouted", (xs, ys))
+
+    def _food_phase(self):
+        # 3) One subtraction over the cells holding food; emptied cells go back to EMPTY
+        expired = self.food.decay()
+        if len(expired):
+            cells = self.occupancy.ravel()
+            freed = expired[cells[expired] == FOOD]
+            cells[freed] = EMPTY
+            self._cells_freed(freed % self.width, freed // self.width)
+            self.census_counter.died("decayed", len(expired))
+
+    def _entities_phase(self):
+        # 4) Update each animal
+        profiler = self.profiler
+        if profiler is not None and profiler.enabled:
+            self._timed_entities_phase(profiler)
+            return
         for entity in self.entities:
-            if entity.alive:
+            if entity.alive and entity.type_code != PLANT:
                 entity.update(world=self)
 
-        # 3) Remove dead entities
+    def _timed_entities_phase(self, profiler):
+        # The same loop, timing every update by entity type
+        clock = time.perf_counter_ns
+        for entity in self.entities:
+            if entity.alive and entity.type_code != PLANT:
+                start = clock()
+                entity.update(world=self)
+                profiler.add_type_time(entity.type_code, clock() - start)
+
+    def _move_phase(self):
+        # 5) Intents of all creatures from one batched net pass, resolved together (see src.movement)
+        creatures = [e for e in self.entities if e.alive and e.type_code != PLANT]
+        energy_total = [0.0] * 5
+        if creatures:
+            kinds, xs, ys, directions = np.array(
+                [(e.type_code, e.x, e.y, e.direction) for e in creatures], dtype=np.int64).T
+            actions = np.zeros(len(creatures), dtype=np.int64)
+            thinking = np.array([e.net is not None for e in creatures], dtype=bool)
+            if thinking.any():
+                thinkers = [e for e in creatures if e.net is not None]
+                inputs = np.array([e.input_vector(e.energy) for e in thinkers], dtype=np.float32)
+                inputs[:, 2:] = vision_inputs(self.occupancy, xs[thinking], ys[thinking], directions[thinking],
+                                              self.settings.view_range)
+                actions[thinking] = batch_actions([e.net for e in thinkers], inputs)
+            directions = turn(directions, actions)
+            for creature, direction in zip(creatures, directions.tolist()):
+                creature.direction = direction
+            moves = resolve_moves(self.occupancy, kinds, xs, ys, directions, actions)
+            if self.profiler is not None and self.profiler.enabled:
+                forward = actions == FORWARD
+                forward[moves.victims] = False
+                self.profiler.count_moves(int(thinking.sum()), int(forward.sum()), len(moves.movers))
+
+            # Eaten prey and plants stay on the grid until cleanup; their eaters are placed over them
+            grazing = moves.ate_plant
+            for i, x, y in zip(moves.movers[grazing].tolist(), moves.new_x[grazing].tolist(),
+                               moves.new_y[grazing].tolist()):
+                plant = self.grid[y][x]
+                creatures[i].eat_plant(plant.nutrition_value)
+                plant.die("eaten")
+            for victim in moves.victims.tolist():
+                creatures[victim].die("eaten")
+            self._relocate_many([creatures[i] for i in moves.movers.tolist()], moves.new_x, moves.new_y)
+            share = 1.0 - self.settings.food_eaten_perc
+            for victim, eater in zip(moves.victims.tolist(), moves.eaters.tolist()):
+                creatures[eater].eat_prey(share * creatures[victim].energy, self)
+
+            for creature in creatures:
+                if creature.alive:
+                    energy_total[creature.type_code] += creature.energy
+        self.census_counter.energy_total = energy_total
+
+    def _relocate_many(self, movers: List[Entity], new_x: np.ndarray, new_y: np.ndarray):
+        """
+        Move entities to distinct cells that no mover starts on, with one scatter per grid mirror.
+        """
+        if not movers:
+            return
+        old_x = np.array([e.x for e in movers], dtype=np.int64)
+        old_y = np.array([e.y for e in movers], dtype=np.int64)
+        for e in movers:
+            self.grid[e.y][e.x] = None
+        taken = self.occupancy[new_y, new_x] == EMPTY
+        freed = self.food.amount[old_y, old_x] <= 0
+        self.occupancy[old_y, old_x] = np.where(freed, EMPTY, FOOD)
+        self.occupancy[new_y, new_x] = [e.type_code for e in movers]
+        self._cells_freed(old_x[freed], old_y[freed])
+        self._cells_taken(new_x[taken], new_y[taken])
+        for e, x, y in zip(movers, new_x.tolist(), new_y.tolist()):
+            self.grid[y][x] = e
+            e.x, e.y = x, y
+
+    def _cleanup_phase(self):
+        # 6) Remove dead entities; creatures leave food behind, dropped in one scatter-add per cause
         dead_entities = [e for e in self.entities if not e.alive]
+        for cause in ("starved", "eaten"):
+            dead = [e for e in dead_entities if e.death_cause == cause and e.type_code != PLANT]
+            if dead:
+                amounts = remains([e.type_code for e in dead], [e.energy for e in dead], cause, self.settings)
+                self.food.drop([e.x for e in dead], [e.y for e in dead], amounts)
+        if dead_entities and self.events.wants("died"):
+            for cause in dict.fromkeys(e.death_cause for e in dead_entities):
+                dead = [e for e in dead_entities if e.death_cause == cause]
+                kinds, xs, ys = np.array([(e.type_code, e.x, e.y) for e in dead], dtype=np.int64).T
+                self.events.publish("died", (cause, kinds, xs, ys))
         for e in dead_entities:
+            self.census_counter.died(e.death_cause)
             self.remove_entity(e)
 
-        if random.random() <= self.config.get_float("RANDOM_PLANT_PERC"):
+    def _spawn_phase(self):
+        if self.rng.placement.random() <= self.settings.random_plant_perc:
             self.add_plant()
 
-    def draw_entities(self):
+    def _census_phase(self):
+        # 7) Census
+        self.census_counter.counts[FOOD] = self.food.count
+        self.census_counter.food_mass = self.food.mass
+        self.census = self.census_counter.snapshot(self.tick)
+
+    def look_around(self, entity) -> tuple:
         """
-        Draws all entities on the World surface.
-        Each entity is represented as a point with a specific color:
-        - Plant: Green
-        - Prey: Blue
-        - Predator: Red
-        - Food: Yellow
+        Vision inputs (left/front/right type and distance) for a single creature.
         """
-        self.fill((0, 0, 0))  # Clear the surface with a black background
-
-        for entity in self.entities:
-            entity_type = type(entity).__name__  # Get the entity's type
-            if entity_type in self.colors:
-                # Draw a single pixel at the entity's position
-                self.set_at((entity.x, entity.y), self.colors[entity_type])
+        return look(self.occupancy, entity.x, entity.y, entity.direction, self.settings.view_range)
 
     def populate_randomly(self):
         """
-        Example method to place some plants, prey, and predators randomly in the world.
+        Place the configured number of plants, prey, and predators on random free cells.
         """
-        if self.config:
-            num_plants = self.config.get_int("INITIAL_PLANTS")
-            num_preys = self.config.get_int("INITIAL_PREYS")
-            num_preds = self.config.get_int("INITIAL_PREDATORS")
-        else:
-            return
-
-        # Randomly place plants
-        for _ in range(num_plants):
-            self.add_plant()
-
-        # Randomly place preys
-        for _ in range(num_preys):
-            placed = False
-            tries = 0
-            while not placed and tries < 1000:
-                x = random.randint(0, self.width - 1)
-                y = random.randint(0, self.height - 1)
-                net = NeuralNet(input_size=8, hidden_size=10, output_size=4)
-                prey = Prey(x, y, energy=self.config.get_float("PREY_INITIAL"), max_energy=self.config.get_float("PREY_MAX"), net=net)
-                if self.add_entity(prey):
-                    placed = True
-                tries += 1
-
-        # Randomly place predators
-        for _ in range(num_preds):
-            placed = False
-            tries = 0
-            while not placed and tries < 1000:
-                x = random.randint(0, self.width - 1)
-                y = random.randint(0, self.height - 1)
-                predator = Predator(x, y, energy=self.config.get_float("PREDATOR_INITIAL"), max_energy=self.config.get_float("PREDATOR_MAX"))
-                if self.add_entity(predator):
-                    placed = True
-                tries += 1
+        num_plants = self.settings.initial_plants
+        num_preys = self.settings.initial_preys
+        num_preds = self.settings.initial_predators
+
+        # Distinct random free cells for everybody, drawn in one go: the counts are exact
+        # unless the grid runs out of free cells (plants first, then prey, then predators)
+        cells = self.free_cells.take(num_plants + num_preys + num_preds, self.rng.placement)
+        xs, ys = (cells % self.width).tolist(), (cells // self.width).tolist()
+        num_plants = min(num_plants, len(cells))
+        num_preys = min(num_preys, len(cells) - num_plants)
+        num_preds = len(cells) - num_plants - num_preys
+        # Initial weights of every creature from two bulk draws, written to the arena rows in one go
+        W1 = self.rng.genome.standard_normal((num_preys + num_preds, 10, 8)) * 0.1
+        W2 = self.rng.genome.standard_normal((num_preys + num_preds, 4, 10)) * 0.1
+        b1 = np.zeros((num_preys + num_preds, 10, 1))
+        b2 = np.zeros((num_preys + num_preds, 4, 1))
+        nets = self.genomes.add_many(W1, b1, W2, b2)
+
+        settings = self.settings
+        entities = [Plant(x, y, nutrition_value=1, settings=settings) for x, y in zip(xs, ys[:num_plants])]
+        entities += [Prey(x, y, energy=settings.prey_initial, max_energy=settings.prey_max, net=net, settings=settings)
+                     for x, y, net in zip(xs[num_plants:], ys[num_plants:num_plants + num_preys], nets)]
+        entities += [Predator(x, y, energy=settings.predator_initial, max_energy=settings.predator_max, net=net,
+                              settings=settings)
+                     for x, y, net in zip(xs[num_plants + num_preys:], ys[num_plants + num_preys:], nets[num_preys:])]
+        self._add_many(entities, cells)
+
+        # The initial placement does not count as births
+        self.census_counter.reset_flows()
+        for entity in self.entities.of_type(Prey):
+            self.census_counter.energy_total[PREY] += entity.energy
+        for entity in self.entities.of_type(Predator):
+            self.census_counter.energy_total[PREDATOR] += entity.energy
+        self.census = self.census_counter.snapshot(self.tick)
 
     def add_plant(self):
-        placed = False
-        tries = 0
-        while not placed and tries < 1000:
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            plant = Plant(x, y, nutrition_value=1)
-            if self.add_entity(plant):
-                placed = True
-            tries += 1
+        """
+        Place a plant on a uniformly random free cell, if there is one.
+        """
+        cell = self.free_cells.sample(self.rng.placement)
+        if cell is not None:
+            self.add_entity(Plant(cell % self.width, cell // self.width, nutrition_value=1, settings=self.settings))
 
     def num_plant(self):
-        return sum(1 for entity in self.entities if isinstance(entity, Plant))
+        return self.census_counter.counts[Plant.type_code]
 
     def num_prey(self):
-        return sum(1 for entity in self.entities if isinstance(entity, Prey))
+        return self.census_counter.counts[Prey.type_code]
 
     def num_predator(self):
-        return sum(1 for entity in self.entities if isinstance(entity, Predator))
+        return self.census_counter.counts[Predator.type_code]
 
     def num_food(self):
-        return sum(1 for entity in self.entities if isinstance(entity, Food))
\ No newline at end of file
+        return self.census_counter.counts[FOOD]
+
+def create_world(width: int, height: int, settings: Optional[Settings] = None, seed: Optional[int] = None):
+    """
+    Build the world engine selected by the WORLD_ENGINE setting:
+    "object" (default) for World, "soa" for the structure-of-arrays SoAWorld,
+    "tiled" for the multi-process TiledWorld (TILE_WORKERS strips).
+    :param seed: seed of the world's random streams
+    """
+    settings = settings or get_settings()
+    engine = settings.world_engine.strip().lower()
+    if engine == "soa":
+        return SoAWorld(width, height, settings, seed=seed)
+    if engine == "tiled":
+        from src.tiled_world import TiledWorld
+        return TiledWorld(width, height, settings, seed=seed)
+    if engine != "object":
+        raise ValueError(f"Unknown WORLD_ENGINE '{engine}'. Use 'object', 'soa' or 'tiled'.")
+    return World(width, height, settings, seed=seed)
@@ -0,0 +1,39 @@
+import dataclasses
+import numpy as np
+import pytest
+from src.config import Settings
+from src.simulation import Simulation
+
+
+def _settings(engine: str) -> Settings:
+    return dataclasses.replace(Settings(), world_engine=engine, grid_width=60, grid_height=60, initial_plants=400,
+                               initial_preys=200, initial_predators=40, random_plant_perc=1.0,
+                               autosave_ticks=0, telemetry_path="", profile=0)
+
+
+@pytest.mark.parametrize("engine", ["object", "soa"])
+def test_resume_matches_uninterrupted_run(engine, tmp_path):
+    original = Simulation(_settings(engine), seed=7)
+    original.run(30)
+    original.save(tmp_path / "checkpoint")
+    original.run(80)
+
+    resumed = Simulation.load(tmp_path / "checkpoint")
+    assert resumed.tick == 30
+    resumed.run(80)
+
+    assert resumed.census == original.census
+    assert np.array_equal(resumed.world.occupancy if engine == "object" else resumed.world.grid_type,
+                          original.world.occupancy if engine == "object" else original.world.grid_type)
+
+
+def test_checkpoint_carries_census_history(tmp_path):
+    original = Simulation(_settings("object"), seed=7)
+    original.run(20)
+    original.save(tmp_path / "checkpoint")
+
+    resumed = Simulation.load(tmp_path / "checkpoint")
+    plants = resumed.loaded_history["plants"]
+    assert len(plants) == 21  # the populated world and 20 ticks
+    assert plants[-1] == original.census.plants
+    assert np.array_equal(resumed.history_series()["plants"], plants)
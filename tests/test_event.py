@@ -0,0 +1,161 @@
+import dataclasses
+import gc
+import weakref
+import numpy as np
+import pytest
+from benchmarks.soak import soak
+from src.config import Settings
+from src.event import Event, EventBus
+from src.simulation import Simulation
+
+
+class _Listener:
+
+    def __init__(self):
+        self.calls = []
+
+    def on_event(self, *args):
+        self.calls.append(args)
+
+
+def _settings(engine: str = "object", **overrides) -> Settings:
+    values = dict(world_engine=engine, grid_width=40, grid_height=30, initial_plants=300, initial_preys=150,
+                  initial_predators=30, tile_workers=3, autosave_ticks=0, telemetry_path="", profile=0)
+    return dataclasses.replace(Settings(), **{**values, **overrides})
+
+
+def test_handlers_are_called_in_subscription_order():
+    event, calls = Event(), []
+    event += lambda value: calls.append(("a", value))
+    event.subscribe(lambda value: calls.append(("b", value)))
+    event(1)
+    assert calls == [("a", 1), ("b", 1)]
+
+
+def test_unsubscribing_an_unknown_handler_raises():
+    event = Event()
+    with pytest.raises(ValueError):
+        event -= print
+
+
+def test_weak_subscriptions_drop_out_when_the_handler_is_collected():
+    event, listener = Event(), _Listener()
+    event.subscribe(listener.on_event, weak=True)
+    event(1)
+    assert listener.calls == [(1,)]
+    assert len(event) == 1
+
+    del listener
+    gc.collect()
+    event(2)
+    assert len(event) == 0
+
+
+def test_strong_subscriptions_keep_the_handler_alive():
+    event, listener = Event(), _Listener()
+    event.subscribe(listener.on_event)
+    reference = weakref.ref(listener)
+    del listener
+    gc.collect()
+    assert reference() is not None
+    event(1)
+    assert reference().calls == [(1,)]
+
+
+def test_subscription_as_a_context_manager():
+    event, listener = Event(), _Listener()
+    with event.subscribe(listener.on_event) as subscription:
+        event(1)
+    event(2)
+    assert listener.calls == [(1,)]
+    assert len(event) == 0
+    subscription.cancel()  # cancelling twice is harmless
+
+
+def test_a_handler_may_unsubscribe_while_the_event_fires():
+    event, calls = Event(), []
+    subscription = None
+
+    def once(value):
+        calls.append(value)
+        subscription.cancel()
+
+    subscription = event.subscribe(once)
+    event += calls.append
+    event(1)
+    event(2)
+    assert calls == [1, 1, 2]
+
+
+def test_bus_dispatches_batches_on_flush():
+    bus, listener = EventBus(), _Listener()
+    bus.subscribe("died", listener.on_event)
+    assert bus.wants("died") and not bus.wants("sprouted")
+    bus.publish("died", "a")
+    bus.publish("died", "b")
+    bus.publish("sprouted", "dropped")  # nobody listens
+    assert listener.calls == []
+    bus.flush()
+    assert listener.calls == [(["a", "b"],)]
+    bus.flush()
+    assert listener.calls == [(["a", "b"],)]
+
+
+def test_closing_the_bus_drops_subscriptions_and_pending_payloads():
+    bus, listener = EventBus(), _Listener()
+    bus.subscribe("died", listener.on_event)
+    bus.publish("died", "a")
+    bus.close()
+    bus.flush()
+    assert listener.calls == []
+    assert not bus.wants("died")
+    bus.publish("died", "b")
+    bus.flush()
+    assert listener.calls == []
+
+
+@pytest.mark.parametrize("engine", ["object", "soa", "tiled"])
+def test_worlds_publish_their_sprouts_and_deaths(engine):
+    simulation = Simulation(_settings(engine, random_plant_perc=0.0, plant_perc_new=0.05), seed=2)
+    sprouted, died = [], []
+    simulation.world.events.subscribe("sprouted", sprouted.extend)
+    simulation.world.events.subscribe("died", died.extend)
+    try:
+        simulation.run(25)
+        census = simulation.census
+    finally:
+        simulation.close()
+
+    assert sum(len(xs) for xs, _ in sprouted) == census.plant_births > 0
+    assert sum(len(kinds) for _, kinds, _, _ in died) == census.deaths_starved + census.deaths_eaten > 0
+    for xs, ys in sprouted:
+        assert np.all((xs >= 0) & (xs < 40) & (ys >= 0) & (ys < 30))
+    for cause, _, xs, ys in died:
+        assert cause in ("starved", "eaten")
+        assert np.all((xs >= 0) & (xs < 40) & (ys >= 0) & (ys < 30))
+
+
+def test_reset_releases_the_old_world_and_its_listeners():
+    simulation = Simulation(_settings(), seed=1)
+    try:
+        world, strong, weak = simulation.world, _Listener(), _Listener()
+        world.events.subscribe("died", strong.on_event)
+        world.events.subscribe("died", weak.on_event, weak=True)
+        simulation.run(5)
+        old_world, old_listener = weakref.ref(world), weakref.ref(strong)
+        del world, strong, weak
+        simulation.reset()
+        gc.collect()
+        assert old_world() is None
+        assert old_listener() is None
+    finally:
+        simulation.close()
+
+
+def test_restarts_keep_memory_flat():
+    result = soak(_settings(grid_width=30, grid_height=30, initial_plants=150, initial_preys=60,
+                            initial_predators=10), restarts=25, ticks=5)
+    assert result["leaked"] == 0
+    memory = result["memory"][1:]
+    # Allocator noise aside (1 MB), the last restarts hold no more than the first ones
+    assert np.median(memory[-5:]) <= np.median(memory[:5]) * 1.1 + 1e6
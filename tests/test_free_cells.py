@@ -0,0 +1,116 @@
+import dataclasses
+import numpy as np
+import pytest
+from src.config import Settings
+from src.entities import EMPTY, PLANT
+from src.free_cells import FreeCells, sample_free
+from src.rng import RandomService
+from src.simulation import Simulation
+
+
+def _check(free: FreeCells, expected: set):
+    """
+    The swap-remove invariants: the first size entries are exactly the free cells,
+    and every cell's position points at its entry (-1 for taken cells).
+    """
+    members = free._cells[:free.size]
+    assert len(free) == len(expected)
+    assert set(members.tolist()) == expected
+    assert np.array_equal(free._position[members], np.arange(free.size))
+    taken = np.setdiff1d(np.arange(free.width * free.height), members)
+    assert np.all(free._position[taken] == -1)
+    for cell in range(free.width * free.height):
+        assert (cell in free) == (cell in expected)
+
+
+def test_starts_with_every_cell_free():
+    free = FreeCells(4, 3)
+    _check(free, set(range(12)))
+
+
+def test_add_and_discard_keep_the_invariants():
+    rng = np.random.default_rng(1)
+    free = FreeCells(7, 5)
+    expected = set(range(35))
+    for _ in range(400):
+        cell = int(rng.integers(35))
+        if rng.random() < 0.5:
+            free.discard(cell)
+            expected.discard(cell)
+        else:
+            free.add(cell)
+            expected.add(cell)
+        _check(free, expected)
+
+
+def test_batches_keep_the_invariants():
+    rng = np.random.default_rng(2)
+    free = FreeCells(8, 8)
+    expected = set(range(64))
+    for _ in range(100):
+        cells = rng.choice(64, int(rng.integers(0, 20)), replace=False)
+        if rng.random() < 0.5:
+            free.discard_many(cells)
+            expected -= set(cells.tolist())
+        else:
+            free.add_many(cells)
+            expected |= set(cells.tolist())
+        _check(free, expected)
+    free.discard_many(np.arange(64))
+    _check(free, set())
+
+
+def test_sample_and_take_only_return_free_cells():
+    rng = RandomService(3).placement
+    free = FreeCells(10, 10)
+    free.discard_many(np.arange(0, 100, 3))
+    expected = set(range(100)) - set(range(0, 100, 3))
+    assert {free.sample(rng) for _ in range(500)} <= expected
+    taken = free.take(40, rng)
+    assert len(set(taken.tolist())) == 40
+    assert set(taken.tolist()) <= expected
+    assert len(free.take(1000, rng)) == len(expected)
+    # take() leaves the cells in the set until they are placed
+    _check(free, expected)
+
+
+def test_sample_on_a_full_grid():
+    free = FreeCells(3, 3)
+    free.discard_many(np.arange(9))
+    assert free.sample(RandomService(4).placement) is None
+    assert len(free.take(5, RandomService(4).placement)) == 0
+
+
+def test_state_and_restore_keep_the_sampling_order():
+    rng = np.random.default_rng(5)
+    free = FreeCells(9, 9)
+    free.discard_many(rng.choice(81, 30, replace=False))
+    for cell in rng.choice(81, 10, replace=False).tolist():
+        free.add(cell)
+    restored = FreeCells(9, 9)
+    restored.restore(free.state())
+    assert np.array_equal(restored.state(), free.state())
+    _check(restored, set(free.state().tolist()))
+    a, b = RandomService(6).placement, RandomService(6).placement
+    assert [free.sample(a) for _ in range(50)] == [restored.sample(b) for _ in range(50)]
+
+
+def test_rebuild_and_sample_free_follow_the_grid():
+    grid = np.full((4, 5), PLANT, dtype=np.int8)
+    grid[1, 2] = grid[3, 0] = EMPTY
+    free = FreeCells(5, 4)
+    free.rebuild(grid)
+    _check(free, {7, 15})
+    assert set(sample_free(grid, 10, RandomService(7).placement).tolist()) == {7, 15}
+
+
+@pytest.mark.parametrize("engine", ["object", "soa"])
+def test_worlds_keep_their_free_cells_current(engine):
+    settings = dataclasses.replace(Settings(), world_engine=engine, grid_width=40, grid_height=30,
+                                   initial_plants=300, initial_preys=150, initial_predators=30,
+                                   random_plant_perc=1.0, autosave_ticks=0, telemetry_path="", profile=0)
+    simulation = Simulation(settings, seed=3)
+    for _ in range(40):
+        simulation.step()
+        world = simulation.world
+        _check(world.free_cells, set(np.flatnonzero(world.occupancy.ravel() == EMPTY).tolist()))
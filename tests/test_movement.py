@@ -0,0 +1,165 @@
+import numpy as np
+import pytest
+from src.entities import EMPTY, PLANT, PREY, PREDATOR, FOOD
+from src.movement import STAY, TURN_LEFT, TURN_RIGHT, FORWARD, resolve_moves, turn
+from src.sensors import DIRECTION_VECTORS
+
+UP, RIGHT, DOWN, LEFT = range(4)
+
+
+def _resolve(grid: np.ndarray, creatures: list):
+    """
+    :param creatures: (kind, x, y, direction, action) per creature, in priority order
+    """
+    for kind, x, y, _, _ in creatures:
+        grid[y, x] = kind
+    kinds, xs, ys, directions, actions = (np.array(column, dtype=np.int64) for column in zip(*creatures))
+    return resolve_moves(grid, kinds, xs, ys, directions, actions)
+
+
+def _moved(moves) -> dict:
+    return {i: (x, y) for i, x, y in zip(moves.movers.tolist(), moves.new_x.tolist(), moves.new_y.tolist())}
+
+
+def _eaten(moves) -> dict:
+    return dict(zip(moves.victims.tolist(), moves.eaters.tolist()))
+
+
+def test_turns():
+    directions = np.array([UP, UP, UP, LEFT, UP])
+    actions = np.array([STAY, TURN_LEFT, TURN_RIGHT, TURN_RIGHT, FORWARD])
+    assert turn(directions, actions).tolist() == [UP, LEFT, RIGHT, UP, UP]
+
+
+@pytest.mark.parametrize("first", [0, 1])
+def test_first_claimant_of_a_cell_wins(first):
+    creatures = [(PREY, 1, 2, RIGHT, FORWARD), (PREDATOR, 3, 2, LEFT, FORWARD)]
+    if first:
+        creatures.reverse()
+    moves = _resolve(np.zeros((5, 5), dtype=np.int8), creatures)
+    assert _moved(moves) == {0: (2, 2)}
+    assert _eaten(moves) == {}
+
+
+def test_prey_walking_into_a_predator_is_eaten():
+    moves = _resolve(np.zeros((5, 5), dtype=np.int8), [(PREY, 1, 1, RIGHT, FORWARD), (PREDATOR, 2, 1, UP, STAY)])
+    assert _moved(moves) == {}
+    assert _eaten(moves) == {0: 1}
+
+
+def test_prey_walking_into_a_predator_that_left_first_survives():
+    moves = _resolve(np.zeros((5, 5), dtype=np.int8),
+                     [(PREDATOR, 2, 1, DOWN, FORWARD), (PREY, 1, 1, RIGHT, FORWARD)])
+    # The predator's cell only becomes free next tick
+    assert _moved(moves) == {0: (2, 2)}
+    assert _eaten(moves) == {}
+
+
+def test_predator_walking_into_prey_eats_it():
+    moves = _resolve(np.zeros((5, 5), dtype=np.int8), [(PREDATOR, 1, 1, RIGHT, FORWARD), (PREY, 2, 1, RIGHT, FORWARD)])
+    assert _moved(moves) == {0: (2, 1)}
+    assert _eaten(moves) == {1: 0}
+
+
+def test_prey_that_left_first_escapes():
+    moves = _resolve(np.zeros((5, 5), dtype=np.int8), [(PREY, 2, 1, RIGHT, FORWARD), (PREDATOR, 1, 1, RIGHT, FORWARD)])
+    assert _moved(moves) == {0: (3, 1)}
+    assert _eaten(moves) == {}
+
+
+@pytest.mark.parametrize("kind, blocker", [(PREY, PREY), (PREDATOR, PREDATOR), (PREDATOR, PLANT)])
+def test_blocked_by_the_same_species_and_predators_by_plants(kind, blocker):
+    grid = np.zeros((5, 5), dtype=np.int8)
+    grid[1, 2] = blocker
+    moves = _resolve(grid, [(kind, 1, 1, RIGHT, FORWARD)])
+    assert _moved(moves) == {}
+    assert _eaten(moves) == {}
+
+
+def test_prey_eats_plants_and_anyone_walks_onto_food():
+    grid = np.zeros((5, 5), dtype=np.int8)
+    grid[1, 2] = PLANT
+    grid[3, 2] = FOOD
+    moves = _resolve(grid, [(PREY, 1, 1, RIGHT, FORWARD), (PREDATOR, 1, 3, RIGHT, FORWARD)])
+    assert _moved(moves) == {0: (2, 1), 1: (2, 3)}
+    assert moves.ate_plant.tolist() == [True, False]
+
+
+def test_a_prey_caught_before_its_turn_does_not_claim_a_cell():
+    moves = _resolve(np.zeros((5, 5), dtype=np.int8),
+                     [(PREDATOR, 1, 1, RIGHT, FORWARD), (PREY, 2, 1, DOWN, FORWARD), (PREY, 1, 2, RIGHT, FORWARD)])
+    assert _moved(moves) == {0: (2, 1), 2: (2, 2)}
+    assert _eaten(moves) == {1: 0}
+
+
+def test_a_predator_whose_hunt_failed_is_still_there():
+    creatures = [
+        (PREY, 2, 1, RIGHT, FORWARD),    # walks into the predator at (3, 1)
+        (PREDATOR, 2, 2, UP, FORWARD),   # hunts that prey, too late: stays put
+        (PREY, 2, 3, UP, FORWARD),       # so this one walks into it
+        (PREDATOR, 3, 1, UP, STAY),
+    ]
+    moves = _resolve(np.zeros((5, 5), dtype=np.int8), creatures)
+    assert _moved(moves) == {}
+    assert _eaten(moves) == {0: 3, 2: 1}
+
+
+def test_only_forward_moves_and_never_off_the_grid():
+    moves = _resolve(np.zeros((5, 5), dtype=np.int8),
+                     [(PREY, 0, 0, UP, FORWARD), (PREY, 4, 4, RIGHT, FORWARD), (PREY, 2, 2, UP, TURN_LEFT)])
+    assert _moved(moves) == {}
+
+
+def _sequential(grid: np.ndarray, kinds, xs, ys, directions, actions):
+    """
+    Reference: the creatures act one at a time in priority order, against the grid
+    of the start of the phase; a cell emptied during the phase stays taken.
+    """
+    height, width = grid.shape
+    occupant = {(x, y): i for i, (x, y) in enumerate(zip(xs, ys))}
+    alive = [True] * len(kinds)
+    claimed, moved, eaten = set(), {}, {}
+    for i, kind in enumerate(kinds):
+        if not alive[i] or actions[i] != FORWARD:
+            continue
+        dx, dy = DIRECTION_VECTORS[directions[i]]
+        cell = (xs[i] + dx, ys[i] + dy)
+        if not (0 <= cell[0] < width and 0 <= cell[1] < height) or cell in claimed:
+            continue
+        target = grid[cell[1], cell[0]]
+        if target in (EMPTY, FOOD) or (target == PLANT and kind == PREY):
+            claimed.add(cell)
+            moved[i] = cell
+        elif target == PREY and kind == PREDATOR:
+            claimed.add(cell)
+            prey = occupant[cell]
+            if alive[prey] and prey not in moved:
+                alive[prey] = False
+                eaten[prey] = i
+                moved[i] = cell
+        elif target == PREDATOR and kind == PREY:
+            host = occupant[cell]
+            if host not in moved:
+                alive[i] = False
+                eaten[i] = host
+    return moved, eaten
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_a_sequential_update_in_priority_order(seed):
+    rng = np.random.default_rng(seed)
+    size = 6
+    grid = rng.choice([EMPTY, PLANT, FOOD], size=(size, size), p=[0.7, 0.2, 0.1]).astype(np.int8)
+    n = int(rng.integers(2, 30))
+    cells = rng.choice(size * size, n, replace=False)
+    ys, xs = np.divmod(cells, size)
+    kinds = rng.choice([PREY, PREDATOR], n)
+    directions = rng.integers(0, 4, n)
+    actions = np.where(rng.random(n) < 0.8, FORWARD, STAY)
+    grid[ys, xs] = kinds
+
+    moves = resolve_moves(grid, kinds, xs, ys, directions, actions)
+    moved, eaten = _sequential(grid, kinds.tolist(), xs.tolist(), ys.tolist(), directions.tolist(), actions.tolist())
+    assert _moved(moves) == moved
+    assert _eaten(moves) == eaten
+    assert moves.ate_plant.tolist() == [grid[y, x] == PLANT for x, y in zip(moves.new_x, moves.new_y)]
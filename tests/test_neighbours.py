@@ -0,0 +1,80 @@
+import dataclasses
+import numpy as np
+import pytest
+from src.config import Settings
+from src.entities import EMPTY, PLANT, PREY, FOOD
+from src.growth import NEIGHBOUR_OFFSETS
+from src.neighbours import FreeNeighbours
+from src.rng import RandomService
+from src.simulation import Simulation
+
+
+def _rebuilt(grid: np.ndarray) -> np.ndarray:
+    reference = FreeNeighbours(grid.shape[1], grid.shape[0])
+    reference.rebuild(grid)
+    return reference.mask
+
+
+def test_rebuild_sets_a_bit_per_free_neighbour_inside_the_grid():
+    grid = np.zeros((3, 4), dtype=np.int8)
+    grid[1, 1] = PLANT
+    grid[0, 2] = FOOD
+    mask = _rebuilt(grid)
+    for y in range(3):
+        for x in range(4):
+            expected = 0
+            for i, (dx, dy) in enumerate(NEIGHBOUR_OFFSETS):
+                if 0 <= x + dx < 4 and 0 <= y + dy < 3 and grid[y + dy, x + dx] == EMPTY:
+                    expected |= 1 << i
+            assert mask[y, x] == expected
+
+
+def test_updates_match_a_rebuild():
+    rng = np.random.default_rng(5)
+    height, width = 9, 13
+    grid = np.zeros((height, width), dtype=np.int8)
+    masks = FreeNeighbours(width, height)
+    for step in range(300):
+        if step % 10 == 0:
+            # A batch of distinct cells changing state at once
+            cells = rng.choice(width * height, 12, replace=False)
+            ys, xs = np.divmod(cells, width)
+            free = grid[ys, xs] == EMPTY
+            masks.occupy_many(xs[free], ys[free])
+            masks.release_many(xs[~free], ys[~free])
+            grid[ys[free], xs[free]] = PREY
+            grid[ys[~free], xs[~free]] = EMPTY
+        else:
+            x, y = int(rng.integers(width)), int(rng.integers(height))
+            if grid[y, x] == EMPTY:
+                masks.occupy(x, y)
+                grid[y, x] = PLANT
+            else:
+                masks.release(x, y)
+                grid[y, x] = EMPTY
+        assert np.array_equal(masks.mask, _rebuilt(grid)), step
+
+
+def test_pick_returns_a_free_neighbour_or_none():
+    grid = np.full((5, 5), PREY, dtype=np.int8)
+    grid[1, 3] = EMPTY
+    grid[3, 1] = EMPTY
+    masks = FreeNeighbours(5, 5)
+    masks.rebuild(grid)
+    rng = RandomService(1).reproduction
+    assert masks.count(2, 2) == 2
+    assert {masks.pick(2, 2, rng) for _ in range(50)} == {(3, 1), (1, 3)}
+    assert masks.pick(0, 0, rng) is None
+    assert masks.count(0, 0) == 0
+
+
+@pytest.mark.parametrize("engine", ["object", "soa"])
+def test_worlds_keep_their_masks_current(engine):
+    settings = dataclasses.replace(Settings(), world_engine=engine, grid_width=40, grid_height=30,
+                                   initial_plants=300, initial_preys=150, initial_predators=30,
+                                   autosave_ticks=0, telemetry_path="", profile=0)
+    simulation = Simulation(settings, seed=3)
+    for _ in range(40):
+        simulation.step()
+        world = simulation.world
+        assert np.array_equal(world.free_neighbours.mask, _rebuilt(world.occupancy))
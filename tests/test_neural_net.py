@@ -0,0 +1,71 @@
+import numpy as np
+from src.neural_net import GenomeArena, NeuralNet, arena_actions, batch_actions, forward_batch, stack_parameters
+
+
+def _nets(arena: GenomeArena, n: int, rng) -> list:
+    return [NeuralNet(8, 10, 4, rng=rng, arena=arena) for _ in range(n)]
+
+
+def _expected(nets, inputs) -> np.ndarray:
+    return np.array([np.argmax(net.forward(row)) for net, row in zip(nets, inputs)])
+
+
+def test_forward_batch_matches_forward():
+    rng = np.random.default_rng(1)
+    nets = _nets(GenomeArena(8, 10, 4), 50, rng)
+    inputs = rng.random((50, 8)).astype(np.float32)
+    outputs = forward_batch(*stack_parameters(nets), inputs)
+    for net, row, output in zip(nets, inputs, outputs):
+        assert np.allclose(output, net.forward(row), rtol=1e-5, atol=1e-6)
+
+
+def test_batched_actions_match_forward_argmax():
+    rng = np.random.default_rng(2)
+    arena = GenomeArena(8, 10, 4)
+    nets = _nets(arena, 64, rng)
+    inputs = rng.random((64, 8)).astype(np.float32)
+    expected = _expected(nets, inputs)
+    slots = np.array([net.slot for net in nets])
+    assert np.array_equal(arena_actions(arena, slots, inputs), expected)
+    assert np.array_equal(batch_actions(nets, inputs), expected)
+
+
+def test_batch_actions_over_several_arenas():
+    rng = np.random.default_rng(3)
+    nets = _nets(GenomeArena(8, 10, 4), 5, rng) + [NeuralNet(8, 10, 4, rng=rng) for _ in range(5)]
+    inputs = rng.random((10, 8)).astype(np.float32)
+    assert np.array_equal(batch_actions(nets, inputs), _expected(nets, inputs))
+
+
+def test_recycled_rows_map_to_their_new_nets():
+    rng = np.random.default_rng(4)
+    arena = GenomeArena(8, 10, 4, capacity=4)
+    nets = _nets(arena, 40, rng)
+    # Free every other row, then fill them (and a few fresh ones) with new networks
+    for net in nets[::2]:
+        net.release()
+    survivors = nets[1::2]
+    newcomers = _nets(arena, 25, rng)
+    assert {net.slot for net in newcomers[:20]} == {net.slot for net in nets[::2]}
+    clones = [net.clone() for net in survivors[:5]]
+    nets = survivors + newcomers + clones
+    assert len({net.slot for net in nets}) == len(nets) == len(arena)
+
+    inputs = rng.random((len(nets), 8)).astype(np.float32)
+    expected = _expected(nets, inputs)
+    slots = np.array([net.slot for net in nets])
+    assert np.array_equal(arena_actions(arena, slots, inputs), expected)
+    assert np.array_equal(batch_actions(nets, inputs), expected)
+    for clone, parent in zip(clones, survivors):
+        assert np.array_equal(clone.forward(inputs[0]), parent.forward(inputs[0]))
+
+
+def test_free_many_and_allocate_many_recycle_rows():
+    arena = GenomeArena(8, 10, 4, capacity=2)
+    slots = arena.allocate_many(10)
+    assert sorted(slots.tolist()) == list(range(10))
+    arena.free_many(slots[[2, 5, 7]])
+    reused = arena.allocate_many(5)
+    assert set(reused[:3].tolist()) == {2, 5, 7}
+    assert len(set(reused.tolist())) == 5
+    assert len(arena) == 12